@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Per-frame cost of a full desktop redraw.
+
+Builds a headless desktop with a stack of cascaded windows on top of a
+`DisplayBuffer` and a display adapter that discards output, then times
+
+* compositing: redrawing every view into the screen buffer, and
+* flushing: diffing the screen buffer and emitting the changed cells.
+
+Run from the repository root::
+
+    python benchmarks/redraw.py --width 200 --height 60 --windows 12
+"""
+import argparse
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from vindauga.constants.state_flags import sfVisible, sfExposed
+from vindauga.types.group import Group
+from vindauga.types.palette import Palette
+from vindauga.types.point import Point
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.utilities.platform.adapters.display_adapter import DisplayAdapter
+from vindauga.utilities.platform.ansi.quirks import TerminalQuirks
+from vindauga.utilities.platform.ansi.screen_writer import ScreenWriter
+from vindauga.utilities.platform.ansi.termcap import TermCap
+from vindauga.utilities.platform.ansi.termcap_colours import TermCapColours
+from vindauga.utilities.platform.display_buffer import DisplayBuffer
+from vindauga.utilities.platform.flush_screen_algorithm import flush_screen_algorithm
+from vindauga.utilities.platform.system_interface import systemInterface
+from vindauga.widgets.desktop import Desktop
+from vindauga.widgets.program import Program
+from vindauga.widgets.static_text import StaticText
+from vindauga.widgets.window import Window
+
+LOREM = ('Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor '
+         'incididunt ut labore et dolore magna aliqua. ') * 40
+
+
+class NullDisplay(DisplayAdapter):
+    """
+    Display adapter that only counts what it is asked to write
+    """
+    def __init__(self, width: int, height: int):
+        self.size = Point(width, height)
+        self.cells = 0
+        self.writes = 0
+
+    def reload_screen_info(self):
+        return self.size
+
+    def write_cell(self, pos, text, attr, double_width=False):
+        self.cells += 1
+        self.writes += 1
+
+    def write_run(self, pos, text, attr, width):
+        self.cells += len(text)
+        self.writes += 1
+
+
+class NullConsole:
+    """
+    Console that only counts the bytes it is asked to write
+    """
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data: str):
+        self.bytes += len(data.encode())
+
+
+class AnsiDisplay(NullDisplay):
+    """
+    Display adapter that renders through the ANSI `ScreenWriter`
+    """
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self.console = NullConsole()
+        self.writer = ScreenWriter(self.console, TermCap(TermCapColours.Indexed256, TerminalQuirks.NONE))
+
+    def write_cell(self, pos, text, attr, double_width=False):
+        super().write_cell(pos, text, attr, double_width)
+        self.writer.write_cell(pos, text, attr, double_width)
+
+    def write_run(self, pos, text, attr, width):
+        super().write_run(pos, text, attr, width)
+        self.writer.write_run(pos, text, attr, width)
+
+    def flush(self):
+        self.writer.flush()
+
+
+class Root(Group):
+    """
+    Stands in for `Program`: owns the screen buffer and the application palette
+    """
+    def __init__(self, bounds: Rect, buffer):
+        super().__init__(bounds)
+        self.state = sfVisible | sfExposed
+        self.buffer = buffer
+        self.palette = Palette(Program.cpAppColor)
+
+    def getPalette(self) -> Palette:
+        return self.palette
+
+
+def build(width: int, height: int, windows: int, ansi: bool):
+    display = (AnsiDisplay if ansi else NullDisplay)(width, height)
+    screen = DisplayBuffer(display)
+    buffer = screen.reload_screen_info(display)
+    root = Root(Rect(0, 0, width, height), buffer)
+    desktop = Desktop(root.getExtent())
+    root.insert(desktop)
+    for i in range(windows):
+        r = Rect(i * 2, i, min(width, i * 2 + width // 2), min(height, i + height // 2))
+        window = Window(r, f'Window {i + 1}', i + 1)
+        interior = window.getExtent()
+        interior.grow(-1, -1)
+        window.insert(StaticText(interior, LOREM))
+        desktop.insert(window)
+    return root, screen, display
+
+
+def run(width: int, height: int, windows: int, frames: int, ansi: bool):
+    # Flushing is timed separately, so per-write refreshes are no-ops
+    fake = SimpleNamespace(screenWidth=width, screenHeight=height, screenBuffer=None, refresh=lambda: None)
+    with patch.object(Screen, 'screen', fake):
+        root, screen, display = build(width, height, windows, ansi)
+        fake.screenBuffer = root.buffer
+        with patch.object(systemInterface, 'screenWrite', screen.screen_write):
+            compose = flush = 0.0
+            for frame in range(frames):
+                start = time.perf_counter()
+                root.redraw()
+                compose += time.perf_counter() - start
+
+                if frame % 2:
+                    # Force every cell to be re-emitted on alternate frames
+                    screen._flush_buffer.invalidate()
+                start = time.perf_counter()
+                flush_screen_algorithm(screen, display)
+                display.flush()
+                flush += time.perf_counter() - start
+
+    cells = width * height
+    print(f'{width}x{height} ({cells} cells), {windows} windows, {frames} frames')
+    print(f'  compose: {compose / frames * 1000:8.3f} ms/frame')
+    print(f'  flush:   {flush / frames * 1000:8.3f} ms/frame')
+    print(f'  cells written: {display.cells} in {display.writes} writes')
+    if ansi:
+        print(f'  bytes written: {display.console.bytes}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--width', type=int, default=160)
+    parser.add_argument('--height', type=int, default=50)
+    parser.add_argument('--windows', type=int, default=8)
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--ansi', action='store_true', help='Render through the ANSI ScreenWriter')
+    args = parser.parse_args()
+    run(args.width, args.height, args.windows, args.frames, args.ansi)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 import math
-import time
 
-from vindauga.constants.command_codes import cmQuit, hcNoContext
+from vindauga.constants.command_codes import cmQuit, cmTimerExpired, hcNoContext
+from vindauga.constants.event_codes import evBroadcast
 from vindauga.constants.window_flags import wfClose
 from vindauga.constants.keys import kbAltF, kbAltX
 from vindauga.constants.option_flags import ofCentered
+from vindauga.events.event import Event
 from vindauga.menus.menu_bar import MenuBar
 from vindauga.menus.menu_item import MenuItem
 from vindauga.menus.sub_menu import SubMenu
@@ -76,7 +77,7 @@ class GaugeDialog(Dialog):
 class GaugeApp(Application):
     def __init__(self):
         super().__init__()
-        self.lastUpdate = time.time()
+        self.updateTimer = self.setTimer(40, 40)
         self.gaugeDialog = None
         self.showDialog()
 
@@ -90,12 +91,11 @@ class GaugeApp(Application):
                        SubMenu('~F~ile', kbAltF) +
                        MenuItem('E~x~it', cmQuit, kbAltX, hcNoContext, 'Alt+X'))
 
-    def idle(self):
-        super().idle()
-        now = time.time()
-        if now - self.lastUpdate >= .04:
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        if (event.what == evBroadcast and event.message.command == cmTimerExpired and
+                event.message.infoPtr is self.updateTimer):
             self.gaugeDialog.update()
-            self.lastUpdate = now
 
     def showDialog(self):
         self.gaugeDialog = GaugeDialog(Rect(15, 4, 65, 18), 'Some gauges')
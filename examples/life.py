@@ -24,7 +24,7 @@ from typing import Tuple
 
 from vindauga.constants.buttons import bfDefault
 from vindauga.constants.command_codes import cmMenu, cmQuit, cmClose, hcNoContext, \
-    cmNext, cmZoom, cmOK, cmTile, cmCascade, cmResize, cmPrev
+    cmNext, cmZoom, cmOK, cmTile, cmCascade, cmResize, cmPrev, cmTimerExpired
 from vindauga.constants.grow_flags import gfGrowHiX, gfGrowHiY
 from vindauga.constants.event_codes import evMouseDown, evMouseMove, evKeyDown, evCommand, evBroadcast, mbLeftButton, \
     mbRightButton
@@ -57,7 +57,7 @@ class CommandCodes(IntEnum):
     cmAbout = 101  # about box
     cmCreate = auto()  # creates a new life window
     cmOneStep = auto()  # advance     one    step
-    cmUpdate = auto()  # issued     when    idle
+    cmUpdate = auto()  # issued     every   generation
     cmStartStop = auto()  # starts or stops a life window
     cmClearBoard = auto()  # clears     the    life    board    
     cmRandom = auto()  # randomly     fills    the    life    board
@@ -591,9 +591,12 @@ class LifeWindow(Window):
 
 
 class LifeApp(Application):
+    generationMs = 50
+
     def __init__(self):
         super().__init__()
         self.windowCommands = self.__getCommands()
+        self.generationTimer = self.setTimer(self.generationMs, self.generationMs)
 
     def aboutBox(self):
         box = Dialog(Rect(0, 0, 32, 10), 'About')
@@ -613,7 +616,10 @@ class LifeApp(Application):
     def handleEvent(self, event: Event):
         super().handleEvent(event)
 
-        if event.what == evCommand:
+        if event.what == evBroadcast and event.message.command == cmTimerExpired:
+            if event.message.infoPtr is self.generationTimer:
+                message(self.desktop, evBroadcast, CommandCodes.cmUpdate, 0)
+        elif event.what == evCommand:
             emc = event.message.command
             if emc == CommandCodes.cmAbout:
                 self.aboutBox()
@@ -637,7 +643,6 @@ class LifeApp(Application):
             View.enableCommands(self.windowCommands)
         else:
             View.disableCommands(self.windowCommands)
-        message(self.desktop, evBroadcast, CommandCodes.cmUpdate, 0)
 
     def initMenuBar(self, bounds: Rect) -> MenuBar:
         sub1 = (SubMenu('~≡~', 0, hcNoContext) +
@@ -3,10 +3,10 @@ import logging
 import time
 
 from vindauga.constants.buttons import bfDefault
-from vindauga.constants.command_codes import hcNoContext, cmOK, cmCancel, cmYes, cmQuit, cmMenu, cmClose
+from vindauga.constants.command_codes import hcNoContext, cmOK, cmCancel, cmYes, cmQuit, cmMenu, cmClose, cmTimerExpired
 from vindauga.constants.message_flags import mfConfirmation, mfYesButton, mfNoButton
 from vindauga.constants.window_flags import wfClose
-from vindauga.constants.event_codes import evCommand, evNothing
+from vindauga.constants.event_codes import evBroadcast, evCommand, evNothing
 from vindauga.constants.keys import kbAltA, kbAltL, kbF10, kbAltX, kbAltF3, kbNoKey
 from vindauga.constants.option_flags import ofCentered
 from vindauga.dialogs.message_box import messageBox
@@ -43,6 +43,7 @@ class ProgressBarApplication(Application):
         r.topLeft.y = r.bottomRight.y - 1
         self.clock = ClockView(r)
         self.insert(self.clock)
+        self.clockTimer = self.setTimer(500, 500)
 
     def initStatusLine(self, bounds: Rect) -> StatusLine:
         bounds.topLeft.y = bounds.bottomRight.y - 1
@@ -62,7 +63,10 @@ class ProgressBarApplication(Application):
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
-        if event.what == evCommand:
+        if event.what == evBroadcast and event.message.command == cmTimerExpired:
+            if event.message.infoPtr is self.clockTimer:
+                self.clock.update()
+        elif event.what == evCommand:
             if event.message.command == cmAboutCmd:
                 logger.error('About Box')
                 self.aboutDialog()
@@ -82,11 +86,6 @@ class ProgressBarApplication(Application):
         if self.validView(pd):
             self.desktop.execView(pd)
 
-    def idle(self):
-        super().idle()
-        self.clock.update()
-        # logger.error('Widget Tree:\n' + drawWidgetTree(self))
-
     @staticmethod
     def isCancel(pd: Dialog):
         event = Event(evNothing)
@@ -2,12 +2,13 @@
 import logging
 import math
 import random
-import time
 from collections import deque
-from vindauga.constants.command_codes import cmQuit, hcNoContext
+from vindauga.constants.command_codes import cmQuit, cmTimerExpired, hcNoContext
+from vindauga.constants.event_codes import evBroadcast
 from vindauga.constants.window_flags import wfClose
 from vindauga.constants.keys import kbAltF, kbAltX
 from vindauga.constants.option_flags import ofCentered
+from vindauga.events.event import Event
 from vindauga.menus.menu_bar import MenuBar
 from vindauga.menus.menu_item import MenuItem
 from vindauga.menus.sub_menu import SubMenu
@@ -112,7 +113,7 @@ class SparklineDialog(Dialog):
 class SparklineApp(Application):
     def __init__(self):
         super().__init__()
-        self.lastUpdate = time.time()
+        self.updateTimer = self.setTimer(100, 100)
         self.sparklineDialog = None
         self.showDialog()
 
@@ -126,12 +127,11 @@ class SparklineApp(Application):
                        SubMenu('~F~ile', kbAltF) +
                        MenuItem('E~x~it', cmQuit, kbAltX, hcNoContext, 'Alt+X'))
 
-    def idle(self):
-        super().idle()
-        now = time.time()
-        if now - self.lastUpdate >= 0.1:
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        if (event.what == evBroadcast and event.message.command == cmTimerExpired and
+                event.message.infoPtr is self.updateTimer):
             self.sparklineDialog.update()
-            self.lastUpdate = now
 
     def showDialog(self):
         self.sparklineDialog = SparklineDialog(Rect(10, 2, 62, 24), 'Sparkline Demo')
@@ -26,3 +26,15 @@ class Test_Palette(TestCase):
 
         for i in range(1, 11):
             assert p[i] == i - 1
+
+    def test_shared(self):
+        data = '\x01\x02\x03'
+        p = Palette.shared(data)
+        assert Palette.shared(data) is p
+        assert p[2] == 2
+
+        # Copies of a shared palette can be edited
+        p2 = Palette(p)
+        p2.palette[0] = p2.palette[1]
+        assert p2[1] == 2
+        assert p[1] == 1
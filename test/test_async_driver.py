@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from vindauga.constants.event_codes import evCommand, evNothing
+from vindauga.events.async_driver import AsyncDriver
+from vindauga.events.event import Event
+from vindauga.events.event_queue import event_queue
+from vindauga.types.group import Group
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.types.timer_queue import TimerQueue
+from vindauga.types.view import View
+from vindauga.utilities.platform.system_interface import systemInterface
+from vindauga.widgets.program import Program
+
+
+class TestAsyncDriver(unittest.TestCase):
+    """
+    Test `Program.run_async()` on a bare Program whose console is a pipe
+    """
+
+    def setUp(self):
+        self.read, self.write = os.pipe()
+        os.set_blocking(self.read, False)
+        self.addCleanup(os.close, self.read)
+        self.addCleanup(os.close, self.write)
+
+        self.program = Program.__new__(Program)
+        self.program.statusLine = None
+        self.program.valid = lambda command: True
+        self.program.handleEvent = self.handleEvent
+        self.handled = []
+        self.idle_calls = 0
+        self.modalOpen = threading.Event()
+        self.program.idle = self.idle
+        self.timerQueue = TimerQueue()
+
+        Program.postedEvents.clear()
+        self.addCleanup(Program.postedEvents.clear)
+        for patcher in (patch.object(event_queue, 'waitForEvents'),
+                        patch.object(event_queue, 'getMouseEvent'),
+                        patch.object(event_queue, 'getKeyEvent'),
+                        patch.object(event_queue, 'hasPendingEvents', lambda: False),
+                        patch.object(Screen, 'screen', Mock(screenWidth=80, screenHeight=25)),
+                        patch.object(View, 'damaged', {}),
+                        patch.object(Program, 'timerQueue', self.timerQueue),
+                        patch.object(Program.postedEvents, 'wakeUp', self.wakeUp),
+                        patch.object(systemInterface, 'getWaitableHandles', lambda: [self.read]),
+                        patch.object(systemInterface, 'timeUntilPendingFlushMs', lambda: -1)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def wakeUp(self):
+        os.write(self.write, b'\x00')
+
+    def handleEvent(self, event: Event):
+        if event.what == evNothing:
+            return
+        self.handled.append(event.message.command)
+        if event.message.command == 99:
+            self.program.endState = 99
+        elif event.message.command == 5:
+            self.handled.append(('modal', self.runModal()))
+        event.what = evNothing
+
+    def runModal(self) -> int:
+        """
+        What `execView()` does: a loop of the modal view's own, which gets
+        its events through the program
+        """
+        modal = Group(Rect(0, 0, 10, 5))
+        modal.owner = self.program
+
+        def handleEvent(event: Event):
+            if event.what == evCommand:
+                self.handled.append(event.message.command)
+                if event.message.command == 6:
+                    modal.endState = 6
+            event.what = evNothing
+
+        modal.handleEvent = handleEvent
+        modal.valid = lambda command: True
+        self.modalOpen.set()
+        return modal.execute()
+
+    def idle(self):
+        self.idle_calls += 1
+        # Stands in for the console reading the wake-up byte
+        try:
+            os.read(self.read, 64)
+        except BlockingIOError:
+            pass
+        self.timerQueue.collectExpiredTimers(lambda id, args: self.handled.append('timer'), None)
+
+    @staticmethod
+    def command(cmd: int) -> Event:
+        event = Event(evCommand)
+        event.message.command = cmd
+        return event
+
+    def test_post_from_thread_while_other_coroutines_run(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        def producer():
+            time.sleep(0.05)
+            for cmd in (1, 2, 99):
+                Program.postEvent(self.command(cmd))
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            threading.Thread(target=producer).start()
+            result = await asyncio.wait_for(self.program.run_async(), 5)
+            task.cancel()
+            return result
+
+        self.assertEqual(asyncio.run(main()), 99)
+        self.assertEqual(self.handled, [1, 2, 99])
+        # The program awaited the thread instead of blocking the loop
+        self.assertGreater(len(ticks), 3)
+
+    def test_coroutines_run_while_modal_view_is_open(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        def producer():
+            Program.postEvent(self.command(5))
+            self.modalOpen.wait(5)
+            opened = len(ticks)
+            time.sleep(0.05)
+            self.ticksWhileModal = len(ticks) - opened
+            for cmd in (7, 6, 99):
+                Program.postEvent(self.command(cmd))
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            threading.Thread(target=producer).start()
+            result = await asyncio.wait_for(self.program.run_async(), 5)
+            task.cancel()
+            return result
+
+        self.assertEqual(asyncio.run(main()), 99)
+        self.assertEqual(self.handled, [5, 7, 6, ('modal', 6), 99])
+        # The dialog's loop awaited input too instead of blocking the loop
+        self.assertGreater(self.ticksWhileModal, 3)
+        self.assertIsNone(AsyncDriver.active)
+
+    def test_cancelling_unwinds_the_program(self):
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.02, Program.postEvent, self.command(5))
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.program.run_async(), 0.2)
+
+        asyncio.run(main())
+        self.assertEqual(self.handled, [5])
+        self.assertIsNone(AsyncDriver.active)
+
+    def test_call_on_loop_thread(self):
+        threads = []
+
+        def handleEvent(event: Event):
+            threads.append(AsyncDriver.callOnLoopThread(threading.current_thread))
+            self.program.endState = 1
+            event.what = evNothing
+
+        self.program.handleEvent = handleEvent
+
+        async def main():
+            asyncio.get_running_loop().call_later(0.02, Program.postEvent, self.command(1))
+            return await asyncio.wait_for(self.program.run_async(), 5)
+
+        asyncio.run(main())
+        self.assertEqual(threads, [threading.main_thread()])
+
+    def test_timer_wakes_the_program(self):
+        async def main():
+            loop = asyncio.get_running_loop()
+            self.timerQueue.setTimer(30, 0)
+            loop.call_later(0.2, Program.postEvent, self.command(99))
+            return await asyncio.wait_for(self.program.run_async(), 5)
+
+        start = time.monotonic()
+        asyncio.run(main())
+        self.assertEqual(self.handled, ['timer', 99])
+        self.assertLess(time.monotonic() - start, 1)
+        # Woken for the timer and the post, not polled
+        self.assertLess(self.idle_calls, 10)
+
+    def test_readers_removed_on_exit(self):
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.02, Program.postEvent, self.command(99))
+            await asyncio.wait_for(self.program.run_async(), 5)
+            return loop.remove_reader(self.read)
+
+        self.assertFalse(asyncio.run(main()))
+
+
+if __name__ == '__main__':
+    unittest.main()
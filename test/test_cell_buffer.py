@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import copy
+import unittest
+
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+from vindauga.utilities.screen.screen_cell import ScreenCell
+
+
+class TestCellBuffer(unittest.TestCase):
+    """
+    Test the array backed CellBuffer
+    """
+
+    def setUp(self):
+        self.attr = ColourAttribute.from_bios(0x1F)
+        self.other = ColourAttribute.from_bios(0x70)
+
+    def test_fill_and_read_back(self):
+        cells = CellBuffer(10)
+        cells.fill(2, 3, 'x', self.attr)
+        self.assertEqual(cells.to_string(0, 10), '  xxx     ')
+        self.assertEqual(cells[3].char, 'x')
+        self.assertEqual(cells.get_attr(3), self.attr)
+
+    def test_fill_without_attr_keeps_attributes(self):
+        cells = CellBuffer(4)
+        cells.fill_attr(0, 4, self.attr)
+        cells.fill(0, 4, '#', None)
+        self.assertEqual(cells.get_attr(1), self.attr)
+
+    def test_slice_is_a_view(self):
+        cells = CellBuffer(8)
+        view = cells[4:]
+        self.assertEqual(len(view), 4)
+        view.set_cell(0, 'A', self.attr)
+        self.assertEqual(cells.get_char(4), 'A')
+
+    def test_slice_with_step_is_rejected(self):
+        with self.assertRaises(ValueError):
+            _ = CellBuffer(4)[::2]
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(IndexError):
+            _ = CellBuffer(4)[4]
+
+    def test_copy_from_moves_extended_text(self):
+        src = CellBuffer(3)
+        src.set_cell(0, 'e', self.attr)
+        src.append_text(0, '́')
+        dst = CellBuffer(5)
+        dst.copy_from(1, src, 0, 3)
+        self.assertEqual(dst.get_text(1), 'é')
+        self.assertTrue(dst.cell_equal(1, src, 0))
+
+    def test_overwrite_extended_text(self):
+        cells = CellBuffer(2)
+        cells.set_cell(0, 'a', self.attr)
+        cells.append_text(0, '̈')
+        cells.set_cell(0, 'b', self.attr)
+        self.assertEqual(cells.get_text(0), 'b')
+
+    def test_cell_ref_snapshot(self):
+        cells = CellBuffer(2)
+        cells.set_cell(0, 'z', self.attr)
+        snapshot = copy.deepcopy(cells[0])
+        self.assertIsInstance(snapshot, ScreenCell)
+        cells.set_cell(0, 'q', self.other)
+        self.assertEqual(snapshot.char, 'z')
+        self.assertEqual(snapshot.attr, self.attr)
+
+    def test_wide_flags(self):
+        cells = CellBuffer(3)
+        cells.set_cell(0, '中', self.attr)
+        cells.set_wide(0)
+        cells.set_trail(1)
+        self.assertTrue(cells.is_wide(0))
+        self.assertTrue(cells.is_trail(1))
+        cells.set_text(0, 'a')
+        self.assertFalse(cells.is_wide(0))
+
+    def test_invalidate_never_equals(self):
+        a = CellBuffer(2)
+        b = CellBuffer(2)
+        self.assertTrue(a.cell_equal(0, b, 0))
+        b.invalidate()
+        self.assertFalse(a.cell_equal(0, b, 0))
+
+    def test_resize_preserves_prefix(self):
+        cells = CellBuffer(2)
+        cells.set_cell(1, 'k', self.attr)
+        cells.resize(6)
+        self.assertEqual(len(cells), 6)
+        self.assertEqual(cells.get_char(1), 'k')
+        self.assertEqual(cells.get_text(5), '')
+
+    def test_write_text_is_clipped(self):
+        cells = CellBuffer(4)
+        cells.set_cell(1, 'e\u0301')
+        self.assertEqual(cells.write_text(1, 'abcdef', self.attr), 3)
+        self.assertEqual(cells.to_string(), ' abc')
+        self.assertEqual(cells.get_attr(3), self.attr)
+        self.assertEqual(cells.write_text(4, 'x'), 0)
+
+    def test_snapshot_round_trip(self):
+        cells = CellBuffer(6)
+        cells.fill(0, 6, ' ', self.attr)
+        cells.write_text(0, 'ab', self.other)
+        snapshot = cells.snapshot()
+        self.assertEqual(snapshot[0], 'ab    ')
+        self.assertEqual(len(snapshot[2]), 2)
+
+        cells.set_cell(2, 'é')
+        cells.set_cell(3, '中')
+        cells.set_wide(3)
+        cells.set_trail(4)
+        restored = CellBuffer(6)
+        restored.restore(0, cells.snapshot())
+        self.assertTrue(all(restored.cell_equal(i, cells, i) for i in range(6)))
+
+        short = CellBuffer(3)
+        self.assertEqual(short.restore(0, snapshot), 3)
+        self.assertEqual(short.to_string(), 'ab ')
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import wcwidth
+
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+from vindauga.utilities.text.char_width import char_width, char_widths, str_width
+from vindauga.utilities.text.text import Text
+
+
+class TestCharWidth(unittest.TestCase):
+    """
+    Test the cached width engine against wcwidth
+    """
+    SAMPLES = ['plain ascii', 'tab\there', 'Größe', '日本語 text', 'é', '\x1b[0m',
+               '\U0001F600 grin', '❤️ heart', 'family \U0001F468‍\U0001F469', '']
+
+    def test_matches_wcwidth(self):
+        for text in self.SAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(str_width(text), wcwidth.wcswidth(text))
+                self.assertEqual(char_widths(text), [wcwidth.wcwidth(c) for c in text])
+        self.assertEqual(char_width('日'), 2)
+
+    def test_scroll(self):
+        self.assertEqual(Text.scroll_with_metrics('日本語', 3, False), (1, 2))
+        self.assertEqual(Text.scroll_with_metrics('日本語', 3, True), (2, 4))
+        self.assertEqual(Text.scroll('abcdef', 4), 4)
+
+    def test_draw_str_mixed_runs(self):
+        attr = ColourAttribute.from_bios(0x1F)
+        cells = CellBuffer(10)
+        self.assertEqual(Text.draw_str(cells, 'ab日éxyz', 0, 0, attr), 8)
+        self.assertEqual([cells.get_text(i) for i in range(7)], ['a', 'b', '日', '', 'é', 'x', 'y'])
+        self.assertTrue(cells.is_wide(2))
+        self.assertTrue(cells.is_trail(3))
+        self.assertEqual(cells.get_attr(6), attr)
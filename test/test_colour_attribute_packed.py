@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from vindauga.utilities.colours.colour_attribute import (ColourAttribute, get_back, get_fore, get_style, reverse_attribute,
+                                                         set_back, set_fore, set_style)
+from vindauga.utilities.colours.desired_colour import DesiredColour
+from vindauga.utilities.colours.colour_rgb import ColourRGB
+from vindauga.utilities.colours.style_mask import StyleMask
+from vindauga.utilities.platform.display_buffer import negate_attribute
+from vindauga.utilities.screen.cell_buffer import pack_attr, unpack_attr
+
+
+class TestColourAttributePacked(unittest.TestCase):
+    """
+    Test the packed integer form of ColourAttribute and its interning
+    """
+
+    def test_from_bios_is_interned(self):
+        self.assertIs(ColourAttribute.from_bios(0x1F), ColourAttribute.from_bios(0x1F))
+        self.assertEqual(ColourAttribute.from_bios(0x1F).as_bios(), 0x1F)
+
+    def test_fields_round_trip(self):
+        attr = ColourAttribute.from_desired_colors(DesiredColour.from_rgb(ColourRGB(1, 2, 3)),
+                                                   DesiredColour.from_bios(4), StyleMask.Bold)
+        copy = ColourAttribute.from_packed(attr.packed)
+        self.assertEqual(copy, attr)
+        self.assertEqual(hash(copy), hash(attr))
+        self.assertEqual(get_style(copy), StyleMask.Bold)
+        self.assertIs(unpack_attr(*pack_attr(attr)), copy)
+
+    def test_shared_attributes_are_not_changed(self):
+        attr = ColourAttribute.from_bios(0x1F)
+        reversed_attr = reverse_attribute(attr)
+        self.assertEqual(attr.as_bios(), 0x1F)
+        self.assertEqual(reversed_attr.as_bios(), 0xF1)
+        self.assertEqual(negate_attribute(attr), reversed_attr)
+
+        other = attr
+        other |= 0x70
+        self.assertEqual(attr.as_bios(), 0x1F)
+        self.assertEqual(other.as_bios(), 0x70)
+
+    def test_shared_attributes_refuse_setters(self):
+        attr = ColourAttribute.from_bios(0x1F)
+        packed = ColourAttribute.from_packed(attr.packed ^ 1)
+        for shared in (attr, packed):
+            with self.subTest(attr=shared):
+                value = shared.packed
+                with self.assertRaises(TypeError):
+                    set_fore(shared, DesiredColour.from_bios(2))
+                with self.assertRaises(TypeError):
+                    set_back(shared, DesiredColour.from_bios(2))
+                with self.assertRaises(TypeError):
+                    set_style(shared, StyleMask.Bold)
+                self.assertEqual(shared.packed, value)
+                self.assertIs(ColourAttribute.from_packed(value), shared)
+        self.assertEqual(ColourAttribute.from_bios(0x1F).as_bios(), 0x1F)
+
+    def test_private_attributes_can_be_changed(self):
+        attr = ColourAttribute.from_colour_attribute(ColourAttribute.from_bios(0x1F))
+        set_fore(attr, DesiredColour.from_bios(2))
+        set_back(attr, DesiredColour.from_bios(4))
+        self.assertEqual((int(get_fore(attr).as_bios()), int(get_back(attr).as_bios())), (2, 4))
+        self.assertEqual(ColourAttribute.from_bios(0x1F).as_bios(), 0x1F)
+
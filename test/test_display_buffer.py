@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+from vindauga.types.point import Point
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.platform import display_buffer
+from vindauga.utilities.platform.adapters.display_adapter import DisplayAdapter
+from vindauga.utilities.platform.display_buffer import DisplayBuffer
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+
+
+class Recorder(DisplayAdapter):
+    def __init__(self, width: int, height: int, fps: int):
+        self.size = Point(width, height)
+        self.fps = fps
+        self.pending = 0
+
+    def reload_screen_info(self):
+        return self.size
+
+    def default_max_fps(self) -> int:
+        return self.fps
+
+    def write_run(self, pos, text, attr, width):
+        self.pending += len(text)
+
+    def flush(self) -> int:
+        written, self.pending = self.pending, 0
+        return written
+
+
+class TestDisplayBufferPacing(unittest.TestCase):
+    """
+    Test that flushes are limited to the adapter's frame rate
+    """
+
+    def setUp(self):
+        self.now = 100.0
+        patcher = patch.object(display_buffer.time, 'monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.adapter = Recorder(10, 2, 10)
+        self.display = DisplayBuffer(self.adapter)
+        self.display.reload_screen_info(self.adapter)
+        self.display.flush_screen(self.adapter)
+
+    def write(self, text: str):
+        cells = CellBuffer(len(text))
+        cells.fill(0, len(text), ' ', ColourAttribute.from_bios(0x1F))
+        cells.write_text(0, text)
+        self.display.screen_write(0, 0, cells, len(cells))
+
+    def test_updates_within_a_frame_are_held_back(self):
+        stats = self.display.stats
+        self.assertEqual(stats.frames_flushed, 1)
+
+        self.now += 0.05
+        self.write('ab')
+        self.display.flush_screen(self.adapter)
+        self.write('cd')
+        self.display.flush_screen(self.adapter)
+        self.assertEqual((stats.frames_flushed, stats.frames_skipped), (1, 1))
+        self.assertEqual(self.display.time_until_pending_flush_ms(), 50)
+
+        self.now += 0.05
+        self.assertEqual(self.display.time_until_pending_flush_ms(), 0)
+        written = stats.bytes_written
+        self.display.flush_screen(self.adapter)
+        self.assertEqual(stats.frames_flushed, 2)
+        self.assertEqual(stats.bytes_written - written, 2)
+        self.assertEqual(self.display.time_until_pending_flush_ms(), -1)
+
+    def test_nothing_to_flush(self):
+        self.now += 1
+        self.display.flush_screen(self.adapter)
+        self.assertEqual(self.display.stats.frames_flushed, 1)
+        self.assertEqual(self.display.time_until_pending_flush_ms(), -1)
+
+    def test_unlimited(self):
+        self.display.set_max_fps(0)
+        self.write('ab')
+        self.display.flush_screen(self.adapter)
+        self.assertEqual(self.display.stats.frames_flushed, 2)
+
+    def test_environment_overrides_adapter(self):
+        with patch.dict('os.environ', {'VINDAUGA_MAX_FPS': '25'}):
+            self.assertEqual(self.adapter.get_max_fps(), 25)
+        with patch.dict('os.environ', {'VINDAUGA_MAX_FPS': 'fast'}):
+            self.assertEqual(self.adapter.get_max_fps(), 10)
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import Mock, patch
+
+from vindauga.constants.edit_command_codes import efCaseSensitive
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.utilities.text.edit_buffer import EditBuffer
+from vindauga.widgets.editor import Editor
+
+
+class TestEditBuffer(unittest.TestCase):
+    """
+    Test the code point storage behind the editor
+    """
+
+    def test_slices_decode_to_str(self):
+        buffer = EditBuffer('héllo 中文')
+        self.assertEqual(len(buffer), 8)
+        self.assertEqual(buffer[1], 'é')
+        self.assertEqual(buffer[6:8], '中文')
+        self.assertEqual(str(buffer), 'héllo 中文')
+
+    def test_assignment_keeps_size(self):
+        buffer = EditBuffer(4)
+        buffer[1:3] = 'ab'
+        self.assertEqual(buffer.text(1, 3), 'ab')
+        with self.assertRaises(ValueError):
+            buffer[0:1] = 'xyz'
+
+    def test_move_and_grow(self):
+        buffer = EditBuffer('abcdef')
+        buffer.move(2, 0, 3)
+        self.assertEqual(str(buffer), 'ababcf')
+        buffer.grow(2, 3)
+        self.assertEqual(len(buffer), 9)
+        self.assertEqual(buffer.text(5, 9), 'abcf')
+        self.assertEqual(buffer.count('b', 0, 9), 2)
+
+
+class TestEditorBuffer(unittest.TestCase):
+    """
+    Test editing operations across the gap
+    """
+
+    def setUp(self):
+        screen = Mock(screenWidth=80, screenHeight=25)
+        patcher = patch.object(Screen, 'screen', screen)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.editor = Editor(Rect(0, 0, 40, 10), None, None, None, 0)
+
+    def text(self) -> str:
+        return self.editor.bufText(0, self.editor.bufLen)
+
+    def test_insert_and_move(self):
+        e = self.editor
+        e.insertText('hello\nworld\n', 12, False)
+        self.assertEqual(self.text(), 'hello\nworld\n')
+        self.assertEqual(e.limit.y, 3)
+        e.setCurPtr(2, 0)
+        e.insertText('XY', 2, False)
+        self.assertEqual(self.text(), 'heXYllo\nworld\n')
+        self.assertEqual((e.curPos.x, e.curPos.y), (4, 0))
+
+    def test_delete_and_undo(self):
+        e = self.editor
+        e.insertText('hello world', 11, False)
+        e.setCurPtr(5, 0)
+        e.deleteRange(e.curPtr, e.nextChar(e.curPtr), True)
+        e.deleteRange(e.prevChar(e.curPtr), e.curPtr, True)
+        self.assertEqual(self.text(), 'hellworld')
+        e.undo()
+        self.assertEqual(self.text(), 'hello world')
+
+    def test_growth_keeps_text(self):
+        e = self.editor
+        e.insertText('start\n', 6, False)
+        e.insertText('a' * 10000, 10000, False)
+        self.assertGreaterEqual(e.bufSize, e.bufLen)
+        self.assertEqual(self.text(), 'start\n' + 'a' * 10000)
+
+    def test_search_spans_chunks(self):
+        e = self.editor
+        e.insertText('one\ntwo\nthree world\nfour', 24, False)
+        e.searchChunk = 7
+        e.setCurPtr(0, 0)
+        self.assertTrue(e.search('WORLD', 0))
+        self.assertEqual(e.bufText(e.selStart, e.selEnd), 'world')
+        e.setCurPtr(0, 0)
+        self.assertFalse(e.search('WORLD', efCaseSensitive))
+
+    def test_line_navigation(self):
+        e = self.editor
+        e.insertText('first\n\tsecond\nthird line\n', 26, False)
+        self.assertEqual(e.limit.y, 4)
+        self.assertEqual((e.curPos.x, e.curPos.y), (0, 3))
+        e.setCurPtr(e.lineMove(e.curPtr, -2), 0)
+        self.assertEqual(e.curPtr, 6)
+        self.assertEqual(e.lineEnd(e.curPtr), 13)
+        e.setCurPtr(9, 0)
+        self.assertEqual((e.curPos.x, e.curPos.y), (10, 1))
+        # Moving up keeps the column, clamped to the shorter line
+        self.assertEqual(e.lineMove(e.curPtr, -1), 5)
+        self.assertEqual(e.lineMove(e.curPtr, -5), 0)
+        self.assertEqual(e.lineMove(e.curPtr, 5), e.bufLen)
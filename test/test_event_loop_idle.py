@@ -6,6 +6,8 @@ from vindauga.events.event import Event
 from vindauga.events.event_queue import event_queue
 from vindauga.constants.event_codes import evNothing, evKeyDown, evMouseDown
 from vindauga.constants.keys import kbEnter
+from vindauga.types.timer_queue import TimerQueue
+from vindauga.types.view import View
 from vindauga.widgets.program import Program
 
 
@@ -23,7 +25,8 @@ class TestEventLoopIdle(unittest.TestCase):
         # give it just enough state for getEvent() to run standalone.
         self.program = Program.__new__(Program)
         self.program.statusLine = None
-        Program.pending = Event(evNothing)
+        Program.postedEvents.clear()
+        self.addCleanup(Program.postedEvents.clear)
 
         self.idle_calls = 0
         self.program.idle = lambda: setattr(self, 'idle_calls', self.idle_calls + 1)
@@ -69,7 +72,7 @@ class TestEventLoopIdle(unittest.TestCase):
     def test_pending_event_short_circuits_wait_and_idle(self):
         pending = Event(evKeyDown)
         pending.keyDown.keyCode = kbEnter
-        Program.pending = pending
+        self.program.putEvent(pending)
 
         with patch.object(event_queue, 'waitForEvents') as mockWait, \
                 patch.object(event_queue, 'getMouseEvent') as mockMouse, \
@@ -83,7 +86,35 @@ class TestEventLoopIdle(unittest.TestCase):
         self.assertEqual(self.idle_calls, 0)
         self.assertEqual(event.what, evKeyDown)
         # Consuming the pending event clears it for the next call
-        self.assertEqual(Program.pending.what, evNothing)
+        self.assertEqual(len(Program.postedEvents), 0)
+
+    def test_idle_then_sleep_without_timeout(self):
+        def fakeGetKeyEvent(event):
+            if keys:
+                event.what = evKeyDown
+                event.keyDown.keyCode = keys.pop()
+
+        keys = [kbEnter]
+        with patch.object(event_queue, 'waitForEvents') as mockWait, \
+                patch.object(event_queue, 'getMouseEvent'), \
+                patch.object(event_queue, 'getKeyEvent', side_effect=fakeGetKeyEvent), \
+                patch.object(Program, 'timerQueue', TimerQueue()), \
+                patch.object(View, 'commandSetChanged', False):
+            for _ in range(3):
+                self.program.getEvent(Event(evNothing))
+        # The key, then a look for more input before idle(), then sleeping
+        # until input with no timer to wake up for
+        self.assertEqual([c.args[0] for c in mockWait.call_args_list], [0, 0, -1])
+        self.assertEqual(self.idle_calls, 2)
+
+    def test_timer_bounds_the_wait(self):
+        timerQueue = TimerQueue()
+        timerQueue.setTimer(500, 0)
+        self.program._idleDue = False
+        with patch.object(Program, 'timerQueue', timerQueue):
+            self.assertTrue(0 < self.program.eventWaitTimeout() <= 500)
+            self.program.eventTimeoutMs = 50
+            self.assertEqual(self.program.eventWaitTimeout(), 50)
 
 
 if __name__ == '__main__':
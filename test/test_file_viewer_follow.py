@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from vindauga.constants.scrollbar_codes import sbHandleKeyboard, sbVertical
+from vindauga.types.group import Group
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.types.view import View
+from vindauga.utilities.text.mapped_text import MappedText
+from vindauga.widgets.file_viewer import FileViewer
+from vindauga.widgets.scroll_bar import ScrollBar
+
+
+class TestFileViewerFollow(unittest.TestCase):
+    """
+    Test that a following FileViewer only reads what was appended
+    """
+
+    def setUp(self):
+        View.damaged = {}
+        self.addCleanup(setattr, View, 'damaged', {})
+        patcher = patch.object(Screen, 'screen', Mock(screenWidth=80, screenHeight=25))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def append(self, data: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+
+    def viewer(self, wrap: bool = False) -> FileViewer:
+        group = Group(Rect(0, 0, 12, 5))
+        vScrollBar = ScrollBar(Rect(11, 0, 12, 4))
+        vScrollBar.options |= sbVertical | sbHandleKeyboard
+        group.insert(vScrollBar)
+        viewer = FileViewer(Rect(0, 0, 11, 4), None, vScrollBar, self.path, wrap=wrap, follow=True)
+        group.insert(viewer)
+        self.addCleanup(viewer.closeFile)
+        return viewer
+
+    def test_appended_lines(self):
+        self.append('one\ntw')
+        viewer = self.viewer()
+        self.assertEqual(list(viewer.fileLines), ['one\n', 'tw'])
+        self.append('o\nthree\n')
+        viewer.followFile()
+        self.assertEqual(list(viewer.fileLines), ['one\n', 'two\n', 'three\n'])
+        self.assertEqual(viewer._limit.y, 3)
+
+    def test_wrapped_partial_line(self):
+        self.append('a' * 12)
+        viewer = self.viewer(wrap=True)
+        self.assertEqual(list(viewer.fileLines), ['a' * 10, 'aa'])
+        self.append('b\nc\n')
+        viewer.followFile()
+        self.assertEqual(list(viewer.fileLines), ['a' * 10, 'aab', 'c'])
+
+    def test_line_longer_than_chunk(self):
+        self.append('start\n')
+        viewer = self.viewer()
+        FileViewer.followChunk, old = 16, FileViewer.followChunk
+        self.addCleanup(setattr, FileViewer, 'followChunk', old)
+        self.append('x' * 40 + '\nafter\n')
+        for _ in range(5):
+            viewer.followFile()
+        self.assertEqual(list(viewer.fileLines), ['start\n', 'x' * 40 + '\n', 'after\n'])
+
+    def test_truncation_reads_again(self):
+        self.append('one\ntwo\n')
+        viewer = self.viewer()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('new\n')
+        viewer.followFile()
+        self.assertEqual(list(viewer.fileLines), ['new\n'])
+
+    def test_pinned_view_scrolls(self):
+        self.append(''.join(f'{i}\n' for i in range(6)))
+        viewer = self.viewer()
+        viewer.setLimit(viewer._limit.x, viewer._limit.y)
+        viewer.scrollTo(0, 2)
+        self.append('6\n7\n')
+        viewer.followFile()
+        self.assertEqual(viewer.delta.y, 4)
+
+    def test_mapped_refresh(self):
+        self.append('one\n')
+        text = MappedText(self.path)
+        self.addCleanup(text.close)
+        self.assertEqual(len(text), 1)
+        self.append('two\nthree')
+        self.assertTrue(text.refresh())
+        text.waitIndexed(5)
+        self.assertEqual([text[i] for i in range(len(text))], ['one\n', 'two\n', 'three'])
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('x\n')
+        self.assertFalse(text.refresh())
+
+    def test_follow_file_only_open_while_following(self):
+        self.append('one\n')
+        viewer = self.viewer()
+        self.assertIsNotNone(viewer._followFile)
+        viewer.setFollow(False)
+        self.assertIsNone(viewer._followFile)
+        self.append('two\n')
+        viewer.setFollow(True)
+        self.assertEqual(viewer._followFile.tell(), 4)
+        viewer.followFile()
+        self.assertEqual(list(viewer.fileLines), ['one\n', 'two\n'])
+        unfollowed = FileViewer(Rect(0, 0, 11, 4), None, None, self.path)
+        self.addCleanup(unfollowed.closeFile)
+        self.assertIsNone(unfollowed._followFile)
+
+    def mappedViewer(self) -> FileViewer:
+        FileViewer.mapThreshold, old = 0, FileViewer.mapThreshold
+        self.addCleanup(setattr, FileViewer, 'mapThreshold', old)
+        viewer = self.viewer(wrap=True)
+        self.assertIsInstance(viewer.fileLines, MappedText)
+        viewer.fileLines.waitIndexed(5)
+        viewer.setLimit(viewer.mappedWidth(), viewer.mappedRows())
+        return viewer
+
+    def test_pinned_mapped_wrapped_view_scrolls(self):
+        lines = [f'L{i}' + 'x' * 15 for i in range(8)]
+        self.append(''.join(line + '\n' for line in lines[:6]))
+        viewer = self.mappedViewer()
+        viewer.scrollTo(0, viewer._limit.y - viewer.size.y)
+        self.assertEqual(viewer.visibleLines(), ['L4' + 'x' * 8, 'x' * 7, 'L5' + 'x' * 8, 'x' * 7])
+        self.append(''.join(line + '\n' for line in lines[6:]))
+        viewer.followFile()
+        viewer.fileLines.waitIndexed(5)
+        viewer.followFile()
+        self.assertEqual(viewer.visibleLines(), ['L6' + 'x' * 8, 'x' * 7, 'L7' + 'x' * 8, 'x' * 7])
+
+    def test_mapped_truncation_seen_by_read(self):
+        self.append('one\ntwo\n')
+        viewer = self.mappedViewer()
+        old = viewer.fileLines
+        # Shrunk and grown back to the same size between two polls
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('')
+        self.assertEqual(old[1], '')
+        self.append('ONE\nTWO\n')
+        viewer.followFile()
+        self.assertIsNot(viewer.fileLines, old)
+        viewer.fileLines.waitIndexed(5)
+        self.assertEqual(viewer.visibleLines(), ['ONE', 'TWO'])
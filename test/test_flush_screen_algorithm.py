@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from vindauga.types.point import Point
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.platform.adapters.display_adapter import DisplayAdapter
+from vindauga.utilities.platform.display_buffer import DisplayBuffer
+from vindauga.utilities.platform.flush_screen_algorithm import flush_screen_algorithm
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+from vindauga.utilities.text.text import Text
+
+
+class Recorder(DisplayAdapter):
+    def __init__(self, width: int, height: int):
+        self.size = Point(width, height)
+        self.runs = []
+        self.cells = []
+
+    def reload_screen_info(self):
+        return self.size
+
+    def write_cell(self, pos, text, attr, double_width=False):
+        self.cells.append((pos.x, pos.y, text))
+
+    def write_run(self, pos, text, attr, width):
+        self.runs.append((pos.x, pos.y, text, width, attr))
+
+
+class ScrollingRecorder(Recorder):
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        self.scrolls = []
+
+    def scroll_rows(self, top: int, bottom: int, count: int) -> bool:
+        self.scrolls.append((top, bottom, count))
+        return True
+
+
+class MarginRecorder(ScrollingRecorder):
+    def scroll_rect(self, top: int, bottom: int, left: int, right: int, count: int) -> bool:
+        self.scrolls.append((top, bottom, left, right, count))
+        return True
+
+
+class TestFlushScreenAlgorithm(unittest.TestCase):
+    """
+    Test that dirty cells are flushed as runs of one attribute
+    """
+
+    def setUp(self):
+        self.adapter = Recorder(20, 3)
+        self.display = DisplayBuffer(self.adapter)
+        self.display.reload_screen_info(self.adapter)
+        self.blue = ColourAttribute.from_bios(0x1F)
+        self.red = ColourAttribute.from_bios(0x4F)
+
+    def write(self, x: int, y: int, text: str, attr: ColourAttribute):
+        cells = CellBuffer(Text.width(text))
+        Text.draw_str(cells, text, 0, 0, attr)
+        self.display.screen_write(x, y, cells, len(cells))
+
+    def flush(self):
+        self.adapter.runs.clear()
+        flush_screen_algorithm(self.display, self.adapter)
+        return [run[:4] for run in self.adapter.runs]
+
+    def test_same_attribute_is_one_run(self):
+        self.flush()
+        self.write(2, 1, 'hello', self.blue)
+        self.assertEqual(self.flush(), [(2, 1, 'hello', 5)])
+
+    def test_attribute_change_splits_run(self):
+        self.flush()
+        self.write(0, 0, 'ab', self.blue)
+        self.write(2, 0, 'cd', self.red)
+        runs = self.flush()
+        self.assertEqual(runs, [(0, 0, 'ab', 2), (2, 0, 'cd', 2)])
+        self.assertEqual(self.adapter.runs[1][4], self.red)
+
+    def test_clean_cells_split_run(self):
+        self.flush()
+        self.write(0, 2, 'abcdef', self.blue)
+        self.flush()
+        self.write(0, 2, 'xbcdey', self.blue)
+        self.assertEqual(self.flush(), [(0, 2, 'x', 1), (5, 2, 'y', 1)])
+
+    def test_wide_characters_cover_two_columns(self):
+        self.flush()
+        self.write(0, 0, 'a中b', self.blue)
+        self.assertEqual(self.flush(), [(0, 0, 'a中b', 4)])
+
+    def test_combining_sequences_are_written_alone(self):
+        self.flush()
+        self.write(0, 0, 'aéz', self.blue)
+        runs = self.flush()
+        self.assertEqual(runs, [(0, 0, 'a', 1), (2, 0, 'z', 1)])
+        self.assertEqual(self.adapter.cells, [(1, 0, 'é')])
+
+    def test_unchanged_screen_writes_nothing(self):
+        self.flush()
+        self.write(0, 0, 'abc', self.blue)
+        self.flush()
+        self.write(0, 0, 'abc', self.blue)
+        self.assertEqual(self.flush(), [])
+
+
+class TestFlushScreenScrolling(unittest.TestCase):
+    """
+    Test that rows moved up or down are scrolled by the terminal
+    """
+
+    def setUp(self):
+        self.adapter = ScrollingRecorder(10, 8)
+        self.display = DisplayBuffer(self.adapter)
+        self.display.reload_screen_info(self.adapter)
+        self.blue = ColourAttribute.from_bios(0x1F)
+        self.lines = [f'line {i}' for i in range(20)]
+
+    def show(self, first: int):
+        for y in range(1, 7):
+            cells = CellBuffer(10)
+            cells.fill(0, 10, ' ', self.blue)
+            Text.draw_str(cells, self.lines[first + y], 0, 0, self.blue)
+            self.display.screen_write(0, y, cells, len(cells))
+        self.adapter.runs.clear()
+        self.adapter.scrolls.clear()
+        flush_screen_algorithm(self.display, self.adapter)
+        # The terminal's view of the screen matches the buffer
+        for y in range(1, 7):
+            self.assertEqual(self.display._flush_buffer.fingerprint(y * 10, 10),
+                             self.display._buffer.fingerprint(y * 10, 10))
+        return [run[1:3] for run in self.adapter.runs]
+
+    def test_scroll_up(self):
+        self.show(0)
+        self.assertEqual(self.show(2), [(5, 'line 7    '), (6, 'line 8    ')])
+        self.assertEqual(self.adapter.scrolls, [(1, 6, 2)])
+
+    def test_scroll_down(self):
+        self.show(5)
+        self.assertEqual(self.show(4), [(1, 'line 5    ')])
+        self.assertEqual(self.adapter.scrolls, [(1, 6, -1)])
+
+    def test_unrelated_rows_are_rewritten(self):
+        self.show(0)
+        self.lines = [f'other {i}' for i in range(20)]
+        self.assertEqual({y for y, _text in self.show(0)}, set(range(1, 7)))
+        self.assertEqual(self.adapter.scrolls, [])
+
+
+class TestFlushScreenMarginScrolling(unittest.TestCase):
+    """
+    Test that rows moved in part of the screen are scrolled within margins
+    """
+
+    def setUp(self):
+        self.blue = ColourAttribute.from_bios(0x1F)
+        self.lines = [f'line {i}' for i in range(20)]
+
+    def attach(self, adapter: Recorder):
+        self.adapter = adapter
+        self.display = DisplayBuffer(adapter)
+        self.display.reload_screen_info(adapter)
+        # Fixed content either side of the scrolling view
+        for y in range(8):
+            cells = CellBuffer(20)
+            Text.draw_str(cells, f'{y:<4}|{" " * 10}|{y:>4}', 0, 0, self.blue)
+            self.display.screen_write(0, y, cells, len(cells))
+        flush_screen_algorithm(self.display, adapter)
+
+    def show(self, first: int):
+        for y in range(1, 7):
+            cells = CellBuffer(10)
+            cells.fill(0, 10, ' ', self.blue)
+            Text.draw_str(cells, self.lines[first + y], 0, 0, self.blue)
+            self.display.screen_write(5, y, cells, len(cells))
+        self.adapter.runs.clear()
+        self.adapter.scrolls.clear()
+        flush_screen_algorithm(self.display, self.adapter)
+        for y in range(8):
+            self.assertEqual(self.display._flush_buffer.fingerprint(y * 20, 20),
+                             self.display._buffer.fingerprint(y * 20, 20))
+        return [run[:3] for run in self.adapter.runs]
+
+    def test_scroll_within_margins(self):
+        self.attach(MarginRecorder(20, 8))
+        self.show(0)
+        self.assertEqual(self.show(2), [(5, 5, 'line 7    '), (5, 6, 'line 8    ')])
+        self.assertEqual(self.adapter.scrolls, [(1, 6, 5, 14, 2)])
+
+    def test_scroll_down_within_margins(self):
+        self.attach(MarginRecorder(20, 8))
+        self.show(5)
+        self.assertEqual(self.show(4), [(5, 1, 'line 5    ')])
+        self.assertEqual(self.adapter.scrolls, [(1, 6, 5, 14, -1)])
+
+    def test_without_margins_rows_are_rewritten(self):
+        self.attach(ScrollingRecorder(20, 8))
+        self.show(0)
+        self.assertEqual({y for _x, y, _text in self.show(2)}, set(range(1, 7)))
+        self.assertEqual(self.adapter.scrolls, [])
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from vindauga.utilities.text.line_index import LineIndex
+
+
+class TestLineIndex(unittest.TestCase):
+    """
+    Test the incrementally maintained line break index
+    """
+
+    def assertIndexes(self, index: LineIndex, text: str):
+        breaks = [i for i, c in enumerate(text) if c == '\n']
+        self.assertEqual(index.line_count, len(breaks) + 1)
+        for pos in range(len(text) + 1):
+            self.assertEqual(index.line_of(pos), text.count('\n', 0, pos))
+        for line in range(len(breaks) + 1):
+            self.assertEqual(index.line_break(line), breaks[line] if line < len(breaks) else len(text))
+            self.assertEqual(index.line_start(line), breaks[line - 1] + 1 if line else 0)
+
+    def test_reset(self):
+        text = 'one\ntwo\n\nthree\n'
+        self.assertIndexes(LineIndex(text), text)
+        self.assertIndexes(LineIndex(''), '')
+
+    def test_edits_match_rescan(self):
+        rng = random.Random(7)
+        text = 'ab\ncd\n\nefg\n'
+        index = LineIndex(text)
+        for _ in range(500):
+            pos = rng.randint(0, len(text))
+            if rng.random() < 0.5:
+                new = ''.join(rng.choice('x\n') for _ in range(rng.randint(0, 5)))
+                text = text[:pos] + new + text[pos:]
+                index.insert(pos, new)
+            else:
+                count = rng.randint(0, min(5, len(text) - pos))
+                text = text[:pos] + text[pos + count:]
+                index.delete(pos, count)
+            # Queries on both sides of the gap
+            index.line_of(rng.randint(0, len(text)))
+        self.assertEqual(len(index), len(text))
+        self.assertIndexes(index, text)
+
+    def test_past_last_line(self):
+        index = LineIndex('a\nb')
+        self.assertEqual(index.line_break(5), 3)
+        self.assertEqual(index.line_start(5), 3)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import unittest
+
+from vindauga.types.rect import Rect
+from vindauga.utilities.text.mapped_text import MappedText
+from vindauga.widgets.file_viewer import FileViewer
+
+
+class TestMappedText(unittest.TestCase):
+    """
+    Test the memory-mapped line index against `readlines()`
+    """
+
+    def write(self, data: bytes) -> str:
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def mapped(self, path: str, chunkSize: int = MappedText.CHUNK_SIZE) -> MappedText:
+        MappedText.CHUNK_SIZE, old = chunkSize, MappedText.CHUNK_SIZE
+        try:
+            text = MappedText(path)
+        finally:
+            MappedText.CHUNK_SIZE = old
+        self.addCleanup(text.close)
+        self.assertTrue(text.waitIndexed(5))
+        return text
+
+    def test_lines_match_readlines(self):
+        for data in (b'', b'one', b'one\ntwo', b'one\ntwo\n', b'\n\n', 'caf\xe9\r\nna\xefve\n'.encode()):
+            with self.subTest(data=data):
+                path = self.write(data)
+                text = self.mapped(path)
+                with open(path, newline='', encoding='utf-8') as f:
+                    self.assertEqual([text[i] for i in range(len(text))], f.readlines())
+
+    def test_small_chunks(self):
+        lines = [f'line {i}' + 'x' * (i % 17) + '\n' for i in range(500)]
+        text = self.mapped(self.write(''.join(lines).encode()), chunkSize=64)
+        self.assertEqual(len(text), 500)
+        self.assertEqual(text[-1], lines[-1])
+        self.assertEqual(text[250], lines[250])
+        self.assertEqual(text.width, max(len(line) - 1 for line in lines))
+        with self.assertRaises(IndexError):
+            text[500]
+
+    def test_truncated_file_reads_short(self):
+        lines = [f'line {i}\n' for i in range(20000)]
+        path = self.write(''.join(lines).encode())
+        text = self.mapped(path)
+        self.assertEqual(text[15000], lines[15000])
+        os.truncate(path, 0)
+        # A read past the end through a memory map would be SIGBUS
+        self.assertEqual(text[16000], '')
+        self.assertFalse(text.refresh())
+
+    def test_truncated_while_indexing(self):
+        lines = [f'line {i}\n' for i in range(2000)]
+        path = self.write(''.join(lines).encode())
+        MappedText.CHUNK_SIZE, old = 64, MappedText.CHUNK_SIZE
+        try:
+            text = MappedText(path)
+            self.addCleanup(text.close)
+            os.truncate(path, 640)
+        finally:
+            MappedText.CHUNK_SIZE = old
+        self.assertTrue(text.waitIndexed(5))
+        self.assertLessEqual(len(text), len(lines))
+        self.assertEqual(text[0], lines[0])
+        self.assertFalse(text.refresh())
+
+    def viewer(self, data: bytes, bounds: Rect) -> FileViewer:
+        path = self.write(data)
+        FileViewer.mapThreshold, old = 0, FileViewer.mapThreshold
+        self.addCleanup(setattr, FileViewer, 'mapThreshold', old)
+        viewer = FileViewer(bounds, None, None, path)
+        self.addCleanup(viewer.closeFile)
+        self.assertIsInstance(viewer.fileLines, MappedText)
+        viewer.fileLines.waitIndexed(5)
+        viewer.updateLimit()
+        return viewer
+
+    def test_file_viewer_wraps_visible_lines(self):
+        viewer = self.viewer(b'short\n' + b'a' * 25 + b'\nlast\n', Rect(0, 0, 11, 4))
+        self.assertEqual(viewer.visibleLines(), ['short', 'a' * 10, 'a' * 10, 'a' * 5])
+        # Any line can be scrolled to the top
+        self.assertEqual((viewer._limit.x, viewer._limit.y), (10, 6))
+        viewer.delta.y = 2
+        self.assertEqual(viewer.visibleLines(), ['a' * 10, 'a' * 10, 'a' * 5, 'last'])
+
+    def test_file_viewer_reaches_end_of_wrapped_file(self):
+        lines = [f'L{i}' + 'x' * 27 for i in range(10)]
+        viewer = self.viewer('\n'.join(lines).encode() + b'\n', Rect(0, 0, 11, 4))
+        seen = []
+        for delta in range(viewer._limit.y - viewer.size.y + 1):
+            viewer.delta.y = delta
+            seen.extend(viewer.visibleLines())
+        for line in lines:
+            self.assertIn(line[:10], seen)
+        self.assertEqual(viewer.visibleLines(), ['x' * 9, 'L9' + 'x' * 8, 'x' * 10, 'x' * 9])
+
+    def test_file_viewer_limit_follows_resize(self):
+        viewer = self.viewer(b'one\ntwo\nthree\n', Rect(0, 0, 11, 4))
+        self.assertEqual(viewer._limit.y, 6)
+        viewer.changeBounds(Rect(0, 0, 11, 2))
+        self.assertEqual(viewer._limit.y, 4)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import Mock, patch
+
+from vindauga.constants.event_codes import evKeyDown, evNothing
+from vindauga.constants.keys import kbPaste, kbEnter, kbLeft
+from vindauga.constants.state_flags import sfSelected
+from vindauga.events.event import Event
+from vindauga.events.event_queue import EventQueue
+from vindauga.events.key_down_event import KeyDownEvent
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.widgets.editor import Editor
+from vindauga.widgets.input_line import InputLine
+
+
+def paste_event(text: str) -> Event:
+    event = Event(evKeyDown)
+    event.keyDown.controlKeyState = kbPaste
+    event.keyDown.text = bytearray(text.encode())
+    event.keyDown.textLength = len(event.keyDown.text)
+    return event
+
+
+def key_event(keyCode: int, text: str = '') -> Event:
+    event = Event(evKeyDown)
+    event.keyDown = KeyDownEvent.create(keyCode, 0, text)
+    return event
+
+
+class TestPasteEventQueue(unittest.TestCase):
+    """
+    Test that pasted text reaches views as one event
+    """
+
+    def setUp(self):
+        with patch('vindauga.events.event_queue.Mouse'):
+            self.queue = EventQueue()
+
+    def feed(self, *events: Event):
+        pending = list(events)
+
+        def readKeyPress(event):
+            if not pending:
+                event.what = evNothing
+                return False
+            event.setFrom(pending.pop(0))
+            return True
+
+        self.queue.readKeyPress = readKeyPress
+
+    def next(self) -> Event:
+        event = Event(evNothing)
+        self.queue.getKeyEvent(event)
+        return event
+
+    def test_paste_text_is_one_event(self):
+        self.queue.setPasteText('line one\r\nline two\rthree')
+        event = self.next()
+        self.assertEqual(event.what, evKeyDown)
+        self.assertTrue(event.keyDown.controlKeyState & kbPaste)
+        self.assertEqual(event.keyDown.getText(), 'line one\nline two\nthree')
+        self.feed()
+        self.assertEqual(self.next().what, evNothing)
+
+    def test_paste_events_are_gathered(self):
+        self.feed(paste_event('ab'), paste_event('c\r'), paste_event('\nd'), key_event(kbLeft))
+        event = self.next()
+        self.assertEqual(event.keyDown.getText(), 'abc\nd')
+        event = self.next()
+        self.assertEqual(event.keyDown.keyCode, kbLeft)
+        self.assertFalse(event.keyDown.controlKeyState & kbPaste)
+
+    def test_crlf_split_between_pastes(self):
+        self.queue.maxPasteLength = 2
+        self.feed(paste_event('a\r'), paste_event('\nb'))
+        self.assertEqual(self.next().keyDown.getText(), 'a\n')
+        self.assertEqual(self.next().keyDown.getText(), 'b')
+
+    def test_heuristic_paste_of_typed_keys(self):
+        self.feed(*(key_event(ord(c), c) for c in 'abcd'), key_event(kbEnter), key_event(kbLeft))
+        self.assertEqual(self.next().keyDown.getText(), 'abcd\n')
+        self.assertEqual(self.next().keyDown.keyCode, kbLeft)
+
+
+class TestPasteIntoViews(unittest.TestCase):
+    def setUp(self):
+        screen = Mock(screenWidth=80, screenHeight=25)
+        patcher = patch.object(Screen, 'screen', screen)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_editor_inserts_paste_once(self):
+        editor = Editor(Rect(0, 0, 40, 10), None, None, None, 0)
+        editor.insertText('[]', 2, False)
+        editor.setCurPtr(1, 0)
+        text = 'x = 1\n' * 1000
+        with patch.object(editor, 'insertBuffer', wraps=editor.insertBuffer) as insertBuffer:
+            event = paste_event(text)
+            editor.handleEvent(event)
+        self.assertEqual(insertBuffer.call_count, 1)
+        self.assertEqual(event.what, evNothing)
+        self.assertEqual(editor.bufText(0, editor.bufLen), '[' + text + ']')
+        self.assertEqual(editor.curPos.y, 1000)
+
+    def test_input_line_drops_line_breaks(self):
+        inputLine = InputLine(Rect(0, 0, 20, 1), 10)
+        inputLine.state |= sfSelected
+        inputLine.handleEvent(paste_event('one\ntwo three four'))
+        self.assertEqual(inputLine.getDataString(), 'onetwo th')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from vindauga.constants.event_codes import evBroadcast, evCommand, evNothing
+from vindauga.events.event import Event
+from vindauga.events.event_queue import event_queue
+from vindauga.events.posted_event_queue import PostedEventQueue, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from vindauga.widgets.program import Program
+
+
+def command(cmd: int, what: int = evCommand) -> Event:
+    event = Event(what)
+    event.message.command = cmd
+    return event
+
+
+class TestPostedEventQueue(unittest.TestCase):
+    def setUp(self):
+        self.wakeUp = Mock()
+        self.queue = PostedEventQueue(maxSize=8, wakeUp=self.wakeUp)
+
+    def commands(self) -> list[int]:
+        result = []
+        event = Event(evNothing)
+        while self.queue.get(event):
+            result.append(event.message.command)
+        return result
+
+    def test_events_are_not_overwritten(self):
+        for cmd in (1, 2, 3):
+            self.queue.post(command(cmd), PRIORITY_HIGH)
+        self.assertEqual(self.commands(), [1, 2, 3])
+
+    def test_posted_event_is_a_copy(self):
+        event = command(1)
+        self.queue.post(event)
+        event.message.command = 2
+        self.assertEqual(self.commands(), [1])
+
+    def test_priority_order(self):
+        self.queue.post(command(1), PRIORITY_LOW)
+        self.queue.post(command(2), PRIORITY_NORMAL)
+        self.queue.post(command(3), PRIORITY_HIGH)
+        self.queue.unget(command(4))
+        self.assertEqual(self.commands(), [4, 3, 2, 1])
+
+    def test_high_priority_overtakes_batch(self):
+        for cmd in (1, 2, 3):
+            self.queue.post(command(cmd))
+        event = Event(evNothing)
+        self.queue.get(event)
+        self.queue.post(command(9), PRIORITY_HIGH)
+        self.assertEqual(self.commands(), [9, 2, 3])
+
+    def test_bounded(self):
+        results = [self.queue.post(command(cmd)) for cmd in range(10)]
+        self.assertEqual(results, [True] * 8 + [False] * 2)
+        # High priority events are never dropped
+        self.assertTrue(self.queue.post(command(99), PRIORITY_HIGH))
+        self.assertEqual(self.commands(), [99] + list(range(8)))
+
+    def test_wakes_up_only_when_empty(self):
+        self.queue.post(command(1))
+        self.queue.post(command(2))
+        self.assertEqual(self.wakeUp.call_count, 1)
+        self.commands()
+        self.queue.post(command(3), PRIORITY_HIGH)
+        self.assertEqual(self.wakeUp.call_count, 2)
+
+    def test_drains_in_batches(self):
+        self.queue.maxSize = 1000
+        for cmd in range(100):
+            self.queue.post(command(cmd))
+        with patch.object(self.queue, 'drain', wraps=self.queue.drain) as drain:
+            self.assertEqual(self.commands(), list(range(100)))
+        # Two batches of events and one finding the queue empty
+        self.assertEqual(drain.call_count, 2)
+
+    def test_many_producers(self):
+        self.queue.maxSize = 4000
+
+        def produce(base):
+            for n in range(1000):
+                self.queue.post(command(base + n))
+
+        threads = [threading.Thread(target=produce, args=(base,)) for base in range(0, 4000, 1000)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        received = self.commands()
+        self.assertEqual(sorted(received), list(range(4000)))
+        # Each producer's events stay in order
+        for base in range(0, 4000, 1000):
+            mine = [cmd for cmd in received if base <= cmd < base + 1000]
+            self.assertEqual(mine, list(range(base, base + 1000)))
+
+
+class TestProgramPostEvent(unittest.TestCase):
+    def setUp(self):
+        self.program = Program.__new__(Program)
+        self.program.statusLine = None
+        self.program.idle = Mock()
+        Program.postedEvents.clear()
+        self.addCleanup(Program.postedEvents.clear)
+
+    def test_post_from_thread_reaches_get_event(self):
+        with patch.object(Program.postedEvents, 'wakeUp') as wakeUp:
+            thread = threading.Thread(target=Program.postEvent, args=(command(7, evBroadcast),))
+            thread.start()
+            thread.join()
+            wakeUp.assert_called_once()
+
+        self.program.putEvent(command(5))
+        with patch.object(event_queue, 'waitForEvents') as wait:
+            first, second = Event(evNothing), Event(evNothing)
+            self.program.getEvent(first)
+            self.program.getEvent(second)
+        wait.assert_not_called()
+        self.assertEqual((first.what, first.message.command), (evCommand, 5))
+        self.assertEqual((second.what, second.message.command), (evBroadcast, 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
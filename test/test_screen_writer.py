@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from vindauga.types.point import Point
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.platform.ansi.attribute import TermAttribute
+from vindauga.utilities.platform.ansi.colour import TermColour
+from vindauga.utilities.platform.ansi.conversions import SGRCache, convert_attributes
+from vindauga.utilities.platform.ansi.quirks import TerminalQuirks
+from vindauga.utilities.platform.ansi.screen_writer import ScreenWriter
+from vindauga.utilities.platform.ansi.termcap import TermCap
+from vindauga.utilities.platform.ansi.termcap_colours import TermCapColours
+
+
+class Console:
+    def __init__(self):
+        self.written = []
+
+    def write(self, data: str):
+        self.written.append(data)
+
+
+class TestScreenWriter(unittest.TestCase):
+    """
+    Test ANSI output of the ScreenWriter
+    """
+
+    def setUp(self):
+        self.console = Console()
+        self.writer = ScreenWriter(self.console, TermCap(TermCapColours.Indexed16, TerminalQuirks.NONE))
+        self.attr = ColourAttribute.from_bios(0x1F)
+
+    def test_cells_are_buffered_until_flush(self):
+        self.writer.write_cell(Point(0, 0), 'a', self.attr, False)
+        self.writer.write_cell(Point(1, 0), 'b', self.attr, False)
+        self.assertEqual(self.console.written, [])
+        self.writer.flush()
+        self.assertEqual(len(self.console.written), 1)
+        out = self.console.written[0]
+        self.assertTrue(out.startswith('\x1b[1;1H'))
+        self.assertTrue(out.endswith('ab'))
+        # The attribute only changes once
+        self.assertEqual(out.count('m'), 1)
+
+    def test_write_run_matches_write_cell(self):
+        for x, ch in enumerate('hello'):
+            self.writer.write_cell(Point(x + 3, 2), ch, self.attr, False)
+        self.writer.flush()
+
+        other = Console()
+        writer = ScreenWriter(other, TermCap(TermCapColours.Indexed16, TerminalQuirks.NONE))
+        writer.write_run(Point(3, 2), 'hello', self.attr, 5)
+        writer.flush()
+        self.assertEqual(other.written, self.console.written)
+
+    def test_write_run_advances_by_width(self):
+        self.writer.write_run(Point(0, 0), '中a', self.attr, 3)
+        self.writer.write_cell(Point(3, 0), 'b', self.attr, False)
+        self.writer.flush()
+        # No cursor movement is needed for the cell following the run
+        self.assertTrue(self.console.written[0].endswith('中ab'))
+
+    def test_empty_flush_writes_nothing(self):
+        self.writer.flush()
+        self.assertEqual(self.console.written, [])
+
+    def test_scroll_rows_uses_a_scroll_region(self):
+        self.writer.scroll_rows(2, 9, 3)
+        self.writer.scroll_rows(2, 9, -1)
+        self.writer.flush()
+        self.assertEqual(self.console.written, ['\x1b[3;10r\x1b[3;1H\x1b[3M\x1b[r\x1b[3;10r\x1b[3;1H\x1b[1L\x1b[r'])
+
+    def test_scroll_rect_uses_left_and_right_margins(self):
+        writer = ScreenWriter(self.console, TermCap(TermCapColours.Indexed16, TerminalQuirks.NONE, lr_margins=True))
+        self.assertTrue(writer.scroll_rect(2, 9, 4, 19, 3))
+        writer.flush()
+        self.assertEqual(self.console.written, ['\x1b[?69h\x1b[3;10r\x1b[5;20s\x1b[3;5H\x1b[3M\x1b[r\x1b[?69l'])
+
+    def test_scroll_rect_needs_margins(self):
+        self.assertFalse(self.writer.scroll_rect(2, 9, 4, 19, 3))
+        self.writer.flush()
+        self.assertEqual(self.console.written, [])
+
+    def test_synchronized_output(self):
+        writer = ScreenWriter(self.console, TermCap(TermCapColours.Indexed16, TerminalQuirks.NONE, True))
+        writer.write_cell(Point(0, 0), 'a', self.attr, False)
+        writer.flush()
+        out = self.console.written[0]
+        self.assertTrue(out.startswith('\x1b[?2026h'))
+        self.assertTrue(out.endswith('a\x1b[?2026l'))
+
+
+class TestSGRCache(unittest.TestCase):
+    """
+    Test the memoized attribute conversion
+    """
+
+    def setUp(self):
+        self.termcap = TermCap(TermCapColours.Indexed16, TerminalQuirks.NONE)
+        self.attrs = [ColourAttribute.from_bios(b) for b in (0x07, 0x1F, 0x4E, 0x70, 0x8F)]
+
+    def uncached(self, sequence):
+        last = TermAttribute(TermColour.default(), TermColour.default())
+        out = []
+        for attr in sequence:
+            sgr, last = convert_attributes(attr, last, self.termcap, '')
+            out.append(sgr)
+        return out
+
+    def cached(self, cache, sequence):
+        last = SGRCache.DEFAULT
+        out = []
+        for attr in sequence:
+            sgr, last = cache.convert(attr, last)
+            out.append(sgr)
+        return out
+
+    def test_matches_uncached_conversion(self):
+        sequence = self.attrs + self.attrs[::-1] + self.attrs
+        self.assertEqual(self.cached(SGRCache(self.termcap), sequence), self.uncached(sequence))
+
+    def test_eviction_keeps_results_correct(self):
+        sequence = self.attrs * 3
+        self.assertEqual(self.cached(SGRCache(self.termcap, max_size=2), sequence), self.uncached(sequence))
+
+    def test_termcap_change_invalidates(self):
+        cache = SGRCache(self.termcap)
+        attr = ColourAttribute.from_bios(0x9F)
+        bright, _ = cache.convert(attr, SGRCache.DEFAULT)
+        self.termcap.colours = TermCapColours.Indexed8
+        self.termcap.quirks = TerminalQuirks.BoldIsBright
+        dim, _ = cache.convert(attr, SGRCache.DEFAULT)
+        self.assertNotEqual(bright, dim)
+        self.assertEqual([dim], self.uncached([attr]))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+
+from vindauga.types.collections.file_collection import FileCollection
+from vindauga.types.collections.sorted_collection import SortedCollection
+from vindauga.types.collections.string_collection import StringCollection
+from vindauga.types.records.search_record import SearchRecord, FA_DIREC
+
+
+class ReverseCollection(SortedCollection):
+    """
+    Only provides `_compare()`, so ordering goes through `cmp_to_key`
+    """
+    def _compare(self, key1, key2) -> int:
+        return (key2 > key1) - (key2 < key1)
+
+
+class Test_SortedCollection(TestCase):
+    """
+    Test SortedCollection
+    """
+    def test_items_are_inserted_in_order(self):
+        t = StringCollection(['pear', 'apple'])
+        t.append('fig')
+        t.insert(0, 'zucchini')
+        t.extend(['banana', 'cherry'])
+        t += ['date']
+        assert t == ['apple', 'banana', 'cherry', 'date', 'fig', 'pear', 'zucchini']
+
+    def test_setitem_keeps_order(self):
+        t = StringCollection(['a', 'b', 'c'])
+        t[0] = 'd'
+        assert t == ['b', 'c', 'd']
+
+    def test_search(self):
+        t = StringCollection(['b', 'd', 'f'])
+        assert t.search('d') == 1
+        assert t.search('c') == len(t) + 1
+        assert t.lookup('c') == (False, 1)
+        assert t.lookup('b') == (True, 0)
+        assert t.lookup('z') == (False, 3)
+
+    def test_index_of_duplicates(self):
+        t = StringCollection(['a', 'b', 'b', 'c'])
+        assert t.indexOf('b') == 1
+        assert t.indexOf('x') == -1
+
+    def test_compare_only(self):
+        t = ReverseCollection([1, 3, 2])
+        t.append(5)
+        assert t == [5, 3, 2, 1]
+        assert t.search(2) == 2
+
+
+class Test_FileCollection(TestCase):
+    """
+    Test FileCollection ordering
+    """
+    @staticmethod
+    def record(name: str, attr: int = 0) -> SearchRecord:
+        return SearchRecord(attr=attr, name=name)
+
+    def test_directories_first(self):
+        t = FileCollection()
+        t.extend([self.record('b.txt'), self.record('Src', FA_DIREC), self.record('A.txt'),
+                  self.record('docs', FA_DIREC)])
+        t.append(self.record('..', FA_DIREC))
+        assert [r.name for r in t] == ['..', 'docs', 'Src', 'A.txt', 'b.txt']
+
+    def test_prefix_lookup(self):
+        t = FileCollection([self.record('alpha.py'), self.record('beta.py'), self.record('gamma.py')])
+        found, index = t.lookup(self.record('BE'))
+        assert not found
+        assert t[index].name == 'beta.py'
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from vindauga.constants.command_codes import cmTaskDone, cmTaskProgress
+from vindauga.constants.event_codes import evBroadcast, evNothing
+from vindauga.events.event import Event
+from vindauga.events.posted_event_queue import PostedEventQueue
+from vindauga.types.group import Group
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.types.task_executor import TaskCancelled, TaskExecutor
+from vindauga.types.view import View
+from vindauga.widgets.dir_list_box import DirListBox
+from vindauga.widgets.file_list import FileList
+from vindauga.widgets.gauge import Gauge
+from vindauga.widgets.program import Program
+from vindauga.widgets.scroll_bar import ScrollBar
+
+
+class Receiver(View):
+    def __init__(self):
+        super().__init__(Rect(0, 0, 1, 1))
+        self.received = []
+
+    def handleEvent(self, event: Event):
+        if event.what == evBroadcast:
+            task = event.message.infoPtr
+            self.received.append((event.message.command, task.done))
+            self.clearEvent(event)
+
+
+class TaskTestCase(unittest.TestCase):
+    def setUp(self):
+        View.damaged = {}
+        self.addCleanup(setattr, View, 'damaged', {})
+        patcher = patch.object(Screen, 'screen', Mock(screenWidth=80, screenHeight=25))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.wakeUp = Mock()
+        self.queue = PostedEventQueue(wakeUp=self.wakeUp)
+        self.executor = TaskExecutor(self.queue.post, maxWorkers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def deliver(self, task=None) -> int:
+        """
+        What the event loop does: wait for the task, then dispatch its events
+        """
+        if task is not None:
+            task.future.exception(5)
+            # The done callback runs just after the result is set
+            for _ in range(100):
+                if len(self.queue) or task.cancelled:
+                    break
+                threading.Event().wait(0.01)
+        count = 0
+        event = Event(evNothing)
+        while self.queue.get(event):
+            self.executor.dispatch(event)
+            count += 1
+        return count
+
+
+class TestTaskExecutor(TaskTestCase):
+    def test_result_is_sent_to_receiver(self):
+        receiver = Receiver()
+        task = self.executor.submit(lambda task, a, b: a + b, 2, 3, receiver=receiver)
+        self.assertEqual(self.deliver(task), 1)
+        self.assertEqual(receiver.received, [(cmTaskDone, 0)])
+        self.assertEqual(task.result(), 5)
+        self.wakeUp.assert_called()
+        self.assertEqual(len(self.executor), 0)
+
+    def test_progress_is_coalesced(self):
+        receiver = Receiver()
+        reported = threading.Event()
+        release = threading.Event()
+
+        def work(task):
+            for n in range(1, 101):
+                task.setProgress(n, 100)
+            reported.set()
+            release.wait(5)
+            task.setProgress(101)
+
+        task = self.executor.submit(work, receiver=receiver)
+        reported.wait(5)
+        self.assertEqual(self.deliver(), 1)
+        release.set()
+        self.deliver(task)
+        # One progress event carried the last of the updates, and progress
+        # overtaken by the task finishing is dropped
+        self.assertEqual(receiver.received, [(cmTaskProgress, 100), (cmTaskDone, 101)])
+
+    def test_progress_goes_to_gauge(self):
+        receiver = Receiver()
+        gauge = Gauge(Rect(0, 0, 10, 1))
+        release = threading.Event()
+
+        def work(task):
+            task.setProgress(5, 10)
+            release.wait(5)
+
+        task = self.executor.submit(work, receiver=receiver, progressView=gauge)
+        for _ in range(100):
+            if len(self.queue):
+                break
+            threading.Event().wait(0.01)
+        self.deliver()
+        self.assertEqual((gauge.getValue(), gauge.maxValue), (5, 10))
+        release.set()
+        self.deliver(task)
+        self.assertEqual(receiver.received, [(cmTaskDone, 5)])
+
+    def test_cancelled_task_delivers_nothing(self):
+        receiver = Receiver()
+        running = threading.Event()
+        stopped = []
+
+        def work(task):
+            running.set()
+            while True:
+                try:
+                    task.checkCancelled()
+                except TaskCancelled:
+                    stopped.append(True)
+                    raise
+                threading.Event().wait(0.001)
+
+        task = self.executor.submit(work, receiver=receiver)
+        running.wait(5)
+        task.cancel()
+        self.assertIsInstance(task.future.exception(5), TaskCancelled)
+        self.assertEqual(self.deliver(), 0)
+        self.assertEqual(receiver.received, [])
+        self.assertEqual(stopped, [True])
+
+    def test_exception_is_raised_by_result(self):
+        receiver = Receiver()
+        task = self.executor.submit(lambda task: 1 / 0, receiver=receiver)
+        self.deliver(task)
+        self.assertEqual(receiver.received, [(cmTaskDone, 0)])
+        with self.assertRaises(ZeroDivisionError):
+            task.result()
+
+    def test_without_receiver_event_is_broadcast(self):
+        task = self.executor.submit(lambda task: None)
+        task.future.result(5)
+        event = Event(evNothing)
+        for _ in range(100):
+            if self.queue.get(event):
+                break
+            threading.Event().wait(0.01)
+        self.executor.dispatch(event)
+        self.assertEqual((event.what, event.message.command, event.message.infoPtr), (evBroadcast, cmTaskDone, task))
+
+    def test_process_task(self):
+        receiver = Receiver()
+        task = self.executor.submitProcess(pow, 2, 10, receiver=receiver)
+        self.deliver(task)
+        self.assertEqual(receiver.received, [(cmTaskDone, 0)])
+        self.assertEqual(task.result(), 1024)
+
+
+class TestDialogScans(TaskTestCase):
+    """
+    Test that the file and directory lists read directories on a worker
+    """
+
+    def setUp(self):
+        super().setUp()
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        self.directory = temporary.name
+        for name in ('b.txt', 'a.txt', 'c.py'):
+            open(os.path.join(self.directory, name), 'w').close()
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        self.application = Mock(runTask=self.executor.submit)
+        patcher = patch.object(Program, 'application', self.application)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def names(listBox: FileList) -> list[str]:
+        return [record.name for record in listBox.getList()]
+
+    def test_file_list(self):
+        group = Group(Rect(0, 0, 40, 20))
+        fileList = FileList(Rect(0, 0, 30, 10), ScrollBar(Rect(0, 10, 30, 11)))
+        group.insert(fileList)
+        fileList.readDirectory(self.directory, '*.txt')
+        task = fileList.task
+        self.assertIsNotNone(task)
+        self.deliver(task)
+        self.assertIsNone(fileList.task)
+        self.assertEqual(self.names(fileList), ['..', 'sub', 'a.txt', 'b.txt'])
+
+    def test_new_scan_cancels_old(self):
+        fileList = FileList(Rect(0, 0, 30, 10), ScrollBar(Rect(0, 10, 30, 11)))
+        fileList.readDirectory(self.directory, '*.txt')
+        first = fileList.task
+        fileList.readDirectory(self.directory, '*.py')
+        self.assertTrue(first.cancelled)
+        self.deliver(fileList.task)
+        self.assertEqual(self.names(fileList), ['..', 'sub', 'c.py'])
+
+    def test_dir_list_box(self):
+        dirList = DirListBox(Rect(0, 0, 30, 10), ScrollBar(Rect(0, 10, 30, 11)))
+        dirList.newDirectory(os.path.join(self.directory, ''))
+        self.assertEqual(len(dirList.dirList), 0)
+        self.deliver(dirList.task)
+        self.assertEqual(dirList.dirList[-1].dir(), os.path.join(os.path.realpath(self.directory), 'sub'))
+
+    def test_without_application_reads_at_once(self):
+        with patch.object(Program, 'application', None):
+            fileList = FileList(Rect(0, 0, 30, 10), ScrollBar(Rect(0, 10, 30, 11)))
+            fileList.readDirectory(self.directory, '*.py')
+        self.assertIsNone(fileList.task)
+        self.assertEqual(self.names(fileList), ['..', 'sub', 'c.py'])
+
+
+if __name__ == '__main__':
+    unittest.main()
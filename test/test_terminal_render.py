@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+import vindauga.terminal.terminal as terminal_module
+from vindauga.terminal.terminal import Terminal
+
+
+class TestTerminalRender(unittest.TestCase):
+    """
+    Test writing printable runs, control characters and escapes into the rows
+    """
+
+    def setUp(self):
+        with patch.object(Terminal, 'executeCommand'), \
+                patch.object(terminal_module.atexit, 'register'), \
+                patch.object(terminal_module, 'signal'):
+            self.terminal = Terminal(8, 3, 0, '/bin/sh')
+
+    def row(self, y: int) -> str:
+        return self.terminal.cells[y].to_string()
+
+    def test_runs_wrap_and_scroll(self):
+        self.terminal.render('abcdefghijklmnopqrstuvwxyz')
+        self.assertEqual([self.row(y) for y in range(3)], ['ijklmnop', 'qrstuvwx', 'yz      '])
+        self.assertEqual(self.terminal.history[-1].snapshot[0], 'abcdefgh')
+        self.assertEqual((self.terminal.currRow, self.terminal.currCol), (2, 2))
+
+    def test_controls_between_runs(self):
+        self.terminal.render('ab\tc\r\nx\x00y\bz')
+        # The tab runs to the end of the row, so 'c' wraps
+        self.assertEqual([self.row(y) for y in range(3)], ['ab      ', 'c       ', 'xz      '])
+
+    def test_escape_sequences_split_runs(self):
+        self.terminal.render('one\x1b[31mtwo\x1b[2;3Hthree')
+        self.assertEqual(self.row(0), 'onetwo  ')
+        self.assertEqual(self.row(1), '  three ')
+        cells = self.terminal.cells[0]
+        self.assertFalse(cells.same_attr(0, cells, 3))
+        self.assertTrue(cells.same_attr(3, self.terminal.cells[1], 2))
+
+    def test_wide_and_combining(self):
+        self.terminal.render('a中éb')
+        cells = self.terminal.cells[0]
+        self.assertTrue(cells.is_wide(1))
+        self.assertTrue(cells.is_trail(2))
+        self.assertEqual(cells.get_text(3), 'é')
+        self.assertEqual(self.terminal.currCol, 5)
+
+        # Overwriting half of the wide character blanks the other half
+        self.terminal.render('\rxx')
+        self.assertFalse(cells.is_trail(2))
+        self.assertEqual(cells.to_string(0, 3), 'xx ')
+
+    def test_wide_character_wraps_whole(self):
+        self.terminal.render('abcdefg中')
+        self.assertEqual(self.row(0), 'abcdefg ')
+        self.assertTrue(self.terminal.cells[1].is_wide(0))
+
+    def test_split_utf8_is_decoded_across_reads(self):
+        data = '中é'.encode('utf-8')
+        text = self.terminal._decoder.decode(data[:2]) + self.terminal._decoder.decode(data[2:])
+        self.assertEqual(text, '中é')
+
+    def test_delete_and_insert_chars(self):
+        self.terminal.render('abcdef\r\x1b[2P')
+        self.assertEqual(self.row(0), 'cdef    ')
+        self.terminal.render('\x1b[3@')
+        self.assertEqual(self.row(0), '   cdef ')
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest.mock import patch
+
+import vindauga.terminal.terminal as terminal_module
+from vindauga.terminal.scrollback import Scrollback, ScrollbackLine
+from vindauga.terminal.terminal import Terminal
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+
+
+def make_cells(text, attrs) -> CellBuffer:
+    cells = CellBuffer(len(attrs))
+    for x, (char, attr) in enumerate(zip(text, attrs)):
+        cells.set_cell(x, char, attr)
+    return cells
+
+
+class TestScrollback(unittest.TestCase):
+    """
+    Test the compact scrollback ring
+    """
+
+    def setUp(self):
+        self.blue = ColourAttribute.from_bios(0x1F)
+        self.red = ColourAttribute.from_bios(0x4F)
+
+    def test_line_packs_runs(self):
+        line = ScrollbackLine.from_cells(make_cells('abcd', [self.blue, self.blue, self.red, self.red]))
+        chars, texts, runs = line.snapshot
+        self.assertEqual(chars, 'abcd')
+        self.assertEqual([start for start, _, _ in runs], [0, 2])
+        self.assertEqual(list(line), [('a', self.blue), ('b', self.blue), ('c', self.red), ('d', self.red)])
+
+    def test_restore_pads_wider_rows(self):
+        line = ScrollbackLine.from_cells(make_cells('ab', [self.blue, self.red]))
+        cells = CellBuffer(4)
+        self.assertEqual(line.restore(cells), 2)
+        self.assertEqual(cells.to_string(), 'ab  ')
+        self.assertEqual(cells.get_attr(3), self.red)
+
+    def test_combining_cells(self):
+        line = ScrollbackLine.from_cells(make_cells(['é', 'x'], [self.blue, self.blue]))
+        self.assertEqual(len(line), 2)
+        self.assertEqual([char for char, _ in line], ['é', 'x'])
+
+    def test_ring_drops_oldest(self):
+        history = Scrollback(3)
+        for ch in 'abcde':
+            history.append(make_cells(ch, [self.blue]))
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.added, 5)
+        self.assertEqual([history[i].snapshot[0] for i in range(3)], ['c', 'd', 'e'])
+
+    def test_zero_limit_keeps_nothing(self):
+        history = Scrollback(0)
+        history.append(make_cells('a', [self.blue]))
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.added, 1)
+
+
+class TestTerminalScrolling(unittest.TestCase):
+    """
+    Test that the terminal feeds rows scrolled off the top into its history
+    """
+
+    def setUp(self):
+        with patch.object(Terminal, 'executeCommand'), \
+                patch.object(terminal_module.atexit, 'register'), \
+                patch.object(terminal_module, 'signal'):
+            self.terminal = Terminal(20, 5, 0, '/bin/sh')
+
+    def row(self, y: int) -> str:
+        return ''.join(cell.char for cell in self.terminal.cells[y]).rstrip()
+
+    def history(self) -> list:
+        history = self.terminal.history
+        return [''.join(char for char, _ in history[i]).rstrip() for i in range(len(history))]
+
+    def test_newlines_scroll_into_history(self):
+        self.terminal.render(''.join(f'line {i}\r\n' for i in range(7)))
+        self.assertEqual(self.history(), ['line 0', 'line 1', 'line 2'])
+        self.assertEqual([self.row(y) for y in range(5)], ['line 3', 'line 4', 'line 5', 'line 6', ''])
+
+    def test_scroll_region_keeps_history(self):
+        self.terminal.render('top\r\n\x1b[2;4r\x1b[4;1H')
+        self.terminal.render('a\r\nb\r\nc\r\n')
+        self.assertEqual(self.history(), [])
+        self.assertEqual([self.row(y) for y in range(5)], ['top', 'b', 'c', '', ''])
+
+    def test_reverse_index(self):
+        self.terminal.render('one\r\ntwo\x1b[1;1H\x1bM')
+        self.assertEqual([self.row(y) for y in range(3)], ['', 'one', 'two'])
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from vindauga.types.timer_queue import TimerQueue
+
+
+class TestTimerQueue(unittest.TestCase):
+    """
+    Test TimerQueue ordering, periodic rescheduling and killing
+    """
+
+    def setUp(self):
+        self.now = 0
+        self.queue = TimerQueue(lambda: self.now)
+        self.fired = []
+
+    def collect(self):
+        self.queue.collectExpiredTimers(lambda timer: self.fired.append(timer))
+
+    def test_next_timeout(self):
+        self.assertEqual(self.queue.timeUntilNextTimeout(), -1)
+        late = self.queue.setTimer(50, 0)
+        self.queue.setTimer(30, 0)
+        self.assertEqual(self.queue.timeUntilNextTimeout(), 30)
+        self.now = 40
+        self.collect()
+        self.assertEqual(self.queue.timeUntilNextTimeout(), 10)
+        self.queue.killTimer(late)
+        self.assertEqual(self.queue.timeUntilNextTimeout(), -1)
+
+    def test_one_shot_fires_once_in_order(self):
+        second = self.queue.setTimer(20, 0)
+        first = self.queue.setTimer(10, 0)
+        self.now = 25
+        self.collect()
+        self.collect()
+        self.assertEqual(self.fired, [first, second])
+        self.assertEqual(len(self.queue), 0)
+
+    def test_periodic_fires_once_per_pass(self):
+        timer = self.queue.setTimer(10, 10)
+        self.now = 35
+        self.collect()
+        self.assertEqual(self.fired, [timer])
+        # Stays on its 10ms grid
+        self.assertEqual(timer.expiresAt, 40)
+        self.now = 40
+        self.collect()
+        self.assertEqual(self.fired, [timer, timer])
+
+    def test_kill_from_callback(self):
+        first = self.queue.setTimer(10, 10)
+        second = self.queue.setTimer(10, 10)
+
+        def callback(timer):
+            self.fired.append(timer)
+            self.queue.killTimer(second if timer is first else first)
+
+        self.now = 10
+        self.queue.collectExpiredTimers(callback)
+        self.assertEqual(self.fired, [first])
+        self.assertEqual(self.queue.timers, [first])
+        self.assertEqual(len(self.queue), 1)
+
+    def test_kill_many(self):
+        timers = [self.queue.setTimer(i, 0) for i in range(100)]
+        for timer in timers[:90]:
+            self.queue.killTimer(timer)
+        self.queue.killTimer(timers[0])
+        self.assertEqual(len(self.queue), 10)
+        self.assertEqual(self.queue.timers, timers[90:])
+        self.assertEqual(self.queue.timeUntilNextTimeout(), 90)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import unittest
+from unittest.mock import Mock
+
+from vindauga.constants.event_codes import evKeyDown, evMouse, evNothing, mbLeftButton
+import vindauga.constants.keys as Keys
+from vindauga.events.event import Event
+from vindauga.utilities.platform.adapters.unix_console.input_adapter import UnixConsoleInputAdapter
+from vindauga.utilities.platform.events.input_state import InputState
+from vindauga.utilities.platform.events.raw_input_getter import RawInputGetter
+
+
+class TestRawInputGetter(unittest.TestCase):
+    def setUp(self):
+        self.read, self.write = os.pipe()
+        self.addCleanup(os.close, self.read)
+        self.addCleanup(os.close, self.write)
+        self.getter = RawInputGetter(self.read)
+
+    def test_drains_in_one_read(self):
+        os.write(self.write, b'x' * 5000)
+        self.assertEqual(self.getter.fill(), 5000)
+        self.assertEqual(len(self.getter), 5000)
+
+    def test_get_reads_when_empty(self):
+        self.assertEqual(self.getter.get(), -1)
+        os.write(self.write, b'ab')
+        self.assertEqual(self.getter.get(), ord('a'))
+        self.assertEqual(self.getter.get(), ord('b'))
+        self.assertEqual(self.getter.get(), -1)
+
+    def test_unget(self):
+        self.getter.feed(b'abc')
+        a, b = self.getter.get(), self.getter.get()
+        self.getter.unget(b)
+        self.getter.unget(a)
+        self.assertEqual(self.getter.take(3), b'abc')
+
+    def test_unget_after_buffer_reset(self):
+        self.getter.feed(b'ab')
+        a, b = self.getter.get(), self.getter.get()
+        self.getter.feed(b'c')
+        self.getter.unget(b)
+        self.getter.unget(a)
+        self.assertEqual(self.getter.take(3), b'abc')
+
+
+class TestUnixConsoleInputAdapter(unittest.TestCase):
+    def setUp(self):
+        console_ctl = Mock()
+        console_ctl.get_input_fd.return_value = -1
+        self.state = InputState()
+        self.adapter = UnixConsoleInputAdapter(console_ctl, None, self.state)
+
+    def events(self, data: bytes) -> list[Event]:
+        self.adapter._input_getter.feed(data)
+        events = []
+        event = Event(evNothing)
+        while self.adapter.get_event(event):
+            events.append(event)
+            event = Event(evNothing)
+        return events
+
+    def test_text_is_one_batch(self):
+        self.adapter._input_getter.feed('añ€x'.encode())
+        self.assertEqual(self.adapter.read_events(), 4)
+        events = self.events(b'')
+        self.assertEqual([e.keyDown.getText() for e in events], ['a', 'ñ', '€', 'x'])
+        self.assertTrue(all(e.what == evKeyDown for e in events))
+
+    def test_control_keys(self):
+        events = self.events(b'\r\t\x7f\x01')
+        self.assertEqual([e.keyDown.keyCode for e in events],
+                         [Keys.kbEnter, Keys.kbTab, Keys.kbBackSpace, Keys.kbCtrlA])
+
+    def test_csi_and_ss3_keys(self):
+        events = self.events(b'\x1b[A\x1b[1;5C\x1bOP\x1b[3~')
+        self.assertEqual([e.keyDown.keyCode for e in events],
+                         [Keys.kbUp, Keys.kbCtrlRight, Keys.kbF1, Keys.kbDel])
+
+    def test_lone_escape(self):
+        events = self.events(b'\x1b')
+        self.assertEqual([e.keyDown.keyCode for e in events], [Keys.kbEsc])
+
+    def test_alt_key(self):
+        events = self.events(b'\x1bx')
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0].keyDown.controlKeyState & Keys.kbLeftAlt)
+
+    def test_sgr_mouse_drag(self):
+        events = self.events(b'\x1b[<0;10;5M\x1b[<32;11;5M\x1b[<0;11;5m')
+        self.assertEqual([e.what for e in events], [evMouse] * 3)
+        self.assertEqual((events[1].mouse.where.x, events[1].mouse.where.y), (10, 4))
+        self.assertEqual(events[1].mouse.buttons, mbLeftButton)
+        self.assertEqual(events[2].mouse.buttons, 0)
+
+    def test_osc_is_ignored(self):
+        events = self.events(b'\x1b]11;rgb:0000/0000/0000\x07a')
+        self.assertEqual([e.keyDown.getText() for e in events], ['a'])
+
+    def test_bracketed_paste(self):
+        events = self.events(b'\x1b[200~one\r\ntwo\x1b[201~z')
+        self.assertEqual([e.keyDown.getText() for e in events], ['one\r\ntwo', 'z'])
+        self.assertTrue(events[0].keyDown.controlKeyState & Keys.kbPaste)
+        self.assertFalse(events[1].keyDown.controlKeyState & Keys.kbPaste)
+        self.assertFalse(self.state.bracketed_paste)
+
+    def test_character_split_across_reads(self):
+        data = '€'.encode()
+        events = self.events(data[:2])
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].keyDown.getText(), '�')
+
+    def test_flush_input(self):
+        self.adapter._input_getter.feed(b'abc')
+        self.adapter.read_events()
+        self.adapter.flush_input()
+        self.assertFalse(self.adapter.has_pending_events())
+
+
+if __name__ == '__main__':
+    unittest.main()
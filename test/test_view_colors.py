@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from vindauga.constants.state_flags import sfActive
+from vindauga.types.group import Group
+from vindauga.types.palette import Palette
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.types.view import View
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+
+
+class PaletteView(View):
+    def __init__(self, bounds: Rect, palette: str):
+        super().__init__(bounds)
+        self.palette = palette
+        self.lookups = 0
+
+    def getPalette(self) -> Palette:
+        self.lookups += 1
+        return Palette.shared(self.palette)
+
+
+class PaletteGroup(Group):
+    def __init__(self, bounds: Rect, palette: str):
+        super().__init__(bounds)
+        self.palette = palette
+
+    def getPalette(self) -> Palette:
+        return Palette.shared(self.palette)
+
+
+class TestViewColors(unittest.TestCase):
+    """
+    Test resolving palette indices through the owner chain
+    """
+
+    def setUp(self):
+        screen = SimpleNamespace(screenWidth=20, screenHeight=5, screenBuffer=None)
+        patcher = patch.object(Screen, 'screen', screen)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.blue = PaletteGroup(Rect(0, 0, 20, 5), '\x1f\x1e')
+        self.red = PaletteGroup(Rect(0, 0, 20, 5), '\x4f\x4e')
+        self.view = PaletteView(Rect(0, 0, 5, 1), '\x02\x01')
+        self.blue.insert(self.view)
+
+    def test_resolved_colours_are_cached(self):
+        self.assertEqual(self.view.mapColor(1), ColourAttribute.from_bios(0x1E))
+        self.assertIs(self.view.mapColor(1), self.view.mapColor(1))
+        self.assertIs(self.view.getColor(0x0201), self.view.getColor(0x0201))
+        self.assertEqual(self.view.getColor(0x0201)[1], ColourAttribute.from_bios(0x1F))
+        self.assertEqual(self.view.lookups, 2)
+
+    def test_owner_change_invalidates(self):
+        self.assertEqual(self.view.mapColor(1), ColourAttribute.from_bios(0x1E))
+        self.blue.remove(self.view)
+        self.red.insert(self.view)
+        self.assertEqual(self.view.mapColor(1), ColourAttribute.from_bios(0x4E))
+
+    def test_palette_change_invalidates(self):
+        self.assertEqual(self.view.mapColor(2), ColourAttribute.from_bios(0x1F))
+        self.blue.palette = '\x2f\x2e'
+        self.blue.setState(sfActive, True)
+        self.assertEqual(self.view.mapColor(2), ColourAttribute.from_bios(0x2F))
+        self.blue.palette = '\x3f\x3e'
+        View.resetColorCache()
+        self.assertEqual(self.view.mapColor(2), ColourAttribute.from_bios(0x3F))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from vindauga.constants.state_flags import sfVisible, sfExposed, sfShadow
+from vindauga.types.draw_buffer import DrawBuffer
+from vindauga.types.group import Group
+from vindauga.types.rect import Rect
+from vindauga.types.screen import Screen
+from vindauga.types.view import View
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.platform.system_interface import systemInterface
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+
+WIDTH = 20
+HEIGHT = 6
+
+
+class Filler(View):
+    def __init__(self, bounds: Rect, char: str, bios: int):
+        super().__init__(bounds)
+        self.char = char
+        self.bios = bios
+
+    def draw(self):
+        b = DrawBuffer()
+        b.moveChar(0, self.char, ColourAttribute.from_bios(self.bios), self.size.x)
+        self.writeLine(0, 0, self.size.x, self.size.y, b)
+
+
+class TestViewCompositing(unittest.TestCase):
+    """
+    Test that views are composited into the owner (screen) buffer
+    """
+
+    def setUp(self):
+        self.buffer = CellBuffer(WIDTH * HEIGHT)
+        self.writes = []
+        screen = SimpleNamespace(screenWidth=WIDTH, screenHeight=HEIGHT, screenBuffer=self.buffer,
+                                 refresh=lambda: None)
+        for patcher in (patch.object(Screen, 'screen', screen),
+                        patch.object(systemInterface, 'screenWrite', self._screenWrite)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.root = Group(Rect(0, 0, WIDTH, HEIGHT))
+        self.root.state = sfVisible | sfExposed
+        self.root.buffer = self.buffer
+
+    def _screenWrite(self, x, y, buf, count):
+        self.writes.append((x, y, buf.to_string(0, count)))
+
+    def row(self, y: int) -> str:
+        return self.buffer.to_string(y * WIDTH, WIDTH)
+
+    def test_write_line_fills_owner_buffer(self):
+        self.root.insert(Filler(Rect(2, 1, 6, 3), '#', 0x1F))
+        self.root.redraw()
+        self.assertEqual(self.row(1)[:8], '  ####  ')
+        self.assertEqual(self.row(2)[:8], '  ####  ')
+        self.assertEqual(self.buffer.get_attr(1 * WIDTH + 2), ColourAttribute.from_bios(0x1F))
+        self.assertIn((2, 1, '####'), self.writes)
+
+    def test_shadow_keeps_chars_and_replaces_wallpaper(self):
+        self.root.insert(Filler(Rect(0, 0, WIDTH, HEIGHT), '▄', 0x17))
+        window = Filler(Rect(2, 1, 8, 3), 'x', 0x1F)
+        window.state |= sfShadow
+        self.root.insert(window)
+        self.root.redraw()
+        shadow = 2 * WIDTH + 8
+        self.assertEqual(self.buffer.get_char(shadow), '▒')
+        self.assertEqual(self.buffer.get_attr(shadow), ColourAttribute.from_bios(0x08))
+        # Outside the shadow the wallpaper is untouched
+        self.assertEqual(self.buffer.get_char(shadow + 2), '▄')
+        self.assertEqual(self.buffer.get_attr(shadow + 2), ColourAttribute.from_bios(0x17))
+
+    def test_write_str(self):
+        view = View(Rect(0, 0, WIDTH, 1))
+        self.root.insert(view)
+        view.writeStr(3, 0, 'abc', 1)
+        self.assertEqual(self.row(0)[3:6], 'abc')
+
+    def test_row_spans(self):
+        back = Filler(Rect(0, 0, 10, 4), 'b', 0x17)
+        front = Filler(Rect(4, 1, 8, 3), 'f', 0x1F)
+        front.state |= sfShadow
+        self.root.insert(back)
+        self.root.insert(front)
+        self.assertEqual(self.root.rowSpans(2)[1:-1], [(0, 4, back, False), (4, 8, front, False),
+                                                       (8, 10, back, True)])
+        self.assertEqual(self.root.rowSpans(3)[1:3], [(0, 6, back, False), (6, 10, back, True)])
+
+        front.hide()
+        self.assertEqual(self.root.rowSpans(2)[1], (0, 10, back, False))
+
+    def test_occluded_writes_are_clipped(self):
+        back = Filler(Rect(0, 0, 10, 1), 'b', 0x17)
+        self.root.insert(back)
+        self.root.insert(Filler(Rect(3, 0, 5, 1), 'f', 0x1F))
+        self.writes.clear()
+        back.drawView()
+        self.assertEqual(self.row(0)[:10], 'bbbffbbbbb')
+        self.assertEqual(self.writes, [(0, 0, 'bbb'), (5, 0, 'bbbbb')])
+        self.assertTrue(back.exposed())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from vindauga.types.group import Group
+from vindauga.types.rect import Rect
+from vindauga.types.view import View
+
+
+class CountingView(View):
+    def __init__(self, bounds: Rect):
+        super().__init__(bounds)
+        self.draws = 0
+
+    def drawView(self):
+        self.draws += 1
+
+
+class CountingGroup(Group):
+    def __init__(self, bounds: Rect):
+        super().__init__(bounds)
+        self.draws = 0
+
+    def drawView(self):
+        self.draws += 1
+
+
+class TestViewInvalidate(unittest.TestCase):
+    """
+    Test that invalidated views are drawn once per paint pass
+    """
+
+    def setUp(self):
+        View.damaged = {}
+        self.addCleanup(setattr, View, 'damaged', {})
+        self.group = CountingGroup(Rect(0, 0, 20, 10))
+        self.view = CountingView(Rect(2, 2, 8, 4))
+        self.group.insert(self.view)
+        self.view.draws = 0
+
+    def test_repeated_invalidations_draw_once(self):
+        for _ in range(5):
+            self.view.invalidate()
+        self.assertEqual(self.view.draws, 0)
+        View.drawInvalidated()
+        self.assertEqual(self.view.draws, 1)
+        View.drawInvalidated()
+        self.assertEqual(self.view.draws, 1)
+
+    def test_regions_are_merged(self):
+        self.view.invalidate(Rect(0, 0, 2, 1))
+        self.view.invalidate(Rect(4, 1, 5, 2))
+        self.view.invalidate(Rect(10, 10, 12, 12))
+        self.assertEqual(View.damaged[id(self.view)][1], Rect(0, 0, 5, 2))
+
+    def test_owner_damage_covers_children(self):
+        self.view.invalidate()
+        self.group.invalidate(Rect(0, 0, 10, 5))
+        View.drawInvalidated()
+        self.assertEqual((self.group.draws, self.view.draws), (1, 0))
+
+    def test_partial_owner_damage_draws_children(self):
+        self.view.invalidate()
+        self.group.invalidate(Rect(0, 0, 4, 4))
+        View.drawInvalidated()
+        self.assertEqual((self.group.draws, self.view.draws), (1, 1))
@@ -67,6 +67,10 @@ cmListItemFocused = 62
 cmGrabDefault = 63
 cmReleaseDefault = 64
 
+# Background task messages
+cmTaskProgress = 65
+cmTaskDone = 66
+
 # No context specified.
 # @see View::helpCtx
 hcNoContext = 0
@@ -26,7 +26,7 @@ class ClickTester(StaticText):
         self.clicked = False
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpMousePalette)
+        return Palette.shared(self.cpMousePalette)
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import sys
+import threading
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from vindauga.utilities.platform.system_interface import systemInterface
+
+if TYPE_CHECKING:
+    from vindauga.widgets.program import Program
+
+logger = logging.getLogger(__name__)
+
+_WAIT = 'wait'
+_CALL = 'call'
+_DONE = 'done'
+
+
+class _Abandoned(BaseException):
+    """
+    Unwinds the program's thread once `run_async()` has been cancelled
+    """
+
+
+class AsyncDriver:
+    """
+    Runs a `Program`'s event loop as a coroutine on a running asyncio loop.
+
+    The program runs its usual `execute()` on a thread of its own, in
+    lockstep with the asyncio loop: only one of them runs at a time. Each
+    time `Program.getEvent()` would sleep, in the main loop or in a modal
+    view run by `execView()` alike, it hands the wait to the driver and
+    stops until the driver has done it. The driver registers the console's
+    waitable handles (terminal input, the wake-up pipe signalled by
+    `postEvent()` and the resize signal pipe) and the ptys of any
+    `TerminalView` with `loop.add_reader()`, and arms a single
+    `loop.call_at()` for whichever comes first of the next `TimerQueue`
+    expiry and a held back frame. When one of them fires, the program
+    carries on until it next waits.
+
+    So coroutines run while the program waits and never while it handles
+    events, just as if it ran on the loop's thread, and they may use views
+    directly. Code in the program that has to run on the loop's thread,
+    such as changing signal handlers, goes through `callOnLoopThread()`.
+    """
+    # The driver of the program running under `run_async()`, if any
+    active: Optional[AsyncDriver] = None
+
+    def __init__(self, program: Program, loop: asyncio.AbstractEventLoop):
+        self.program = program
+        self.loop = loop
+        self._ready = asyncio.Event()
+        self._readers: dict[int, object] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        # Requests from the program's thread and the answers to them
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._replies: queue.SimpleQueue = queue.SimpleQueue()
+        self._abandoned = False
+        self._endState = 0
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def execute(self) -> int:
+        """
+        `Group.execute()`, awaiting input instead of blocking for it
+        """
+        if AsyncDriver.active is not None:
+            raise RuntimeError('A program is already running with run_async()')
+        AsyncDriver.active = self
+        self._thread = threading.Thread(target=self._runProgram, name='vindauga-program', daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                # Blocks the loop while the program handles events
+                request = self._requests.get()
+                if request[0] == _DONE:
+                    break
+                if request[0] == _CALL:
+                    self._replies.put(self._call(*request[1:]))
+                    continue
+                await self._wait(request[1])
+                self._replies.put(None)
+        except BaseException:
+            self._abandon()
+            raise
+        finally:
+            AsyncDriver.active = None
+            self.close()
+        if self._error is not None:
+            raise self._error
+        return self._endState
+
+    def waitForEvents(self, timeoutMs: int):
+        """
+        `EventQueue.waitForEvents()` for the program's thread: flushes the
+        screen, then lets the asyncio loop run until there is input, the
+        timeout passes or (for a timeout of 0) other coroutines have had a
+        turn.
+        """
+        from .event_queue import event_queue
+
+        event_queue.waitForEvents(0)
+        if event_queue.hasPendingEvents():
+            timeoutMs = 0
+        self._requests.put((_WAIT, timeoutMs))
+        self._answer()
+
+    @classmethod
+    def callOnLoopThread(cls, fn: Callable, *args) -> Any:
+        """
+        Call `fn(*args)` on the asyncio loop's thread, which is the main
+        thread, while the program waits for it. Without a driver, or on that
+        thread already, it is simply called.
+        """
+        driver = cls.active
+        if driver is None or threading.current_thread() is not driver._thread:
+            return fn(*args)
+        driver._requests.put((_CALL, fn, args))
+        result, error = driver._answer()
+        if error is not None:
+            raise error
+        return result
+
+    def close(self):
+        """
+        Remove the readers and the pending wake-up from the loop
+        """
+        for fd in self._readers:
+            self.loop.remove_reader(fd)
+        self._readers.clear()
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    def wakeUp(self):
+        self._ready.set()
+
+    def _runProgram(self):
+        try:
+            self._endState = self.program.execute()
+        except _Abandoned:
+            pass
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._requests.put((_DONE,))
+
+    def _answer(self) -> Any:
+        reply = self._replies.get()
+        if self._abandoned:
+            raise _Abandoned
+        return reply
+
+    @staticmethod
+    def _call(fn: Callable, args: tuple) -> tuple[Any, Optional[BaseException]]:
+        try:
+            return fn(*args), None
+        except Exception as e:
+            return None, e
+
+    def _abandon(self):
+        # Every wait now raises in the program's thread until it has unwound
+        self._abandoned = True
+        self._replies.put(None)
+        while self._requests.get()[0] != _DONE:
+            self._replies.put(None)
+
+    async def _wait(self, timeoutMs: int):
+        if timeoutMs == 0:
+            await asyncio.sleep(0)
+            return
+        self._syncReaders()
+        self._scheduleWakeUp(timeoutMs)
+        await self._ready.wait()
+        self._ready.clear()
+
+    def _scheduleWakeUp(self, timeoutMs: int):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        flushMs = systemInterface.timeUntilPendingFlushMs()
+        if timeoutMs < 0 or 0 <= flushMs < timeoutMs:
+            timeoutMs = flushMs
+        if timeoutMs >= 0:
+            self._timer = self.loop.call_at(self.loop.time() + timeoutMs / 1000, self.wakeUp)
+
+    def _syncReaders(self):
+        # Console handles map to None, pty handles to their TerminalView
+        readers = dict.fromkeys(systemInterface.getWaitableHandles())
+        for view in self._terminals():
+            if (fd := view.terminal.ptyFd) is not None:
+                readers[fd] = view
+        for fd, view in self._readers.items():
+            if readers.get(fd, self) is not view:
+                self.loop.remove_reader(fd)
+        for fd, view in readers.items():
+            if self._readers.get(fd, self) is not view:
+                if view is None:
+                    self.loop.add_reader(fd, self.wakeUp)
+                else:
+                    self.loop.add_reader(fd, self._readTerminal, view)
+        self._readers = readers
+
+    def _readTerminal(self, view):
+        # Read where the sync loop would in `TerminalView.updateTerminals()`;
+        # the program is waiting, so its views are free to use
+        view.handleTerminal(view)
+        self.wakeUp()
+
+    @staticmethod
+    def _terminals() -> list:
+        # Only an application that opened a terminal has imported the module
+        if module := sys.modules.get('vindauga.terminal.terminal_view'):
+            return list(module.TerminalView.ActiveTerminals)
+        return []
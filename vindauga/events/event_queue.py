@@ -7,7 +7,6 @@ import vindauga.constants.event_codes as event_codes
 from vindauga.constants.keys import kbPaste, kbEnter, kbTab
 from vindauga.mouse.mouse import Mouse
 from vindauga.utilities.platform.system_interface import systemInterface
-from vindauga.utilities.text.text import Text
 from vindauga.types.screen import Screen
 
 logger = logging.getLogger(__name__)
@@ -47,6 +46,8 @@ class EventQueue:
         self.pasteTextLength = 0
         self.pasteTextIndex = 0
         self._shouldSkipLf: bool = False
+        self._heldKeyEvent = None
+        self.maxPasteLength = 1 << 20  # Most characters gathered into one paste event
 
         self.resume()
 
@@ -146,36 +147,71 @@ class EventQueue:
     def getKeyEvent(self, event) -> None:
         """
         Get keyboard event with paste handling and line ending conversion.
+
+        Pasted text that is already waiting is gathered into a single
+        `evKeyDown` with `kbPaste` set, whose `text` holds all of it (up to
+        `maxPasteLength` characters), so that a view can insert a paste in
+        one go rather than a character at a time.
         """
-        self.getKeyOrPasteEvent(event)
+        if self._heldKeyEvent is not None:
+            event.setFrom(self._heldKeyEvent)
+            self._heldKeyEvent = None
+        else:
+            self.getKeyOrPasteEvent(event)
 
-        if self._shouldSkipLf:
+        if not self.isPasteEvent(event):
             self._shouldSkipLf = False
-            # Skip a LF, since we had previously read a CR
-            if (event.what == event_codes.evKeyDown and
-                    (event.keyDown.controlKeyState & kbPaste) != 0 and
-                    ((event.keyDown.textLength == 0 and event.keyDown.charScan.charCode == '\n') or
-                     (event.keyDown.textLength == 1 and event.keyDown.text and event.keyDown.text[0] == ord('\n')))):
-                self.getKeyOrPasteEvent(event)
-
-        if event.what == event_codes.evKeyDown and (event.keyDown.controlKeyState & kbPaste) != 0:
-            if event.keyDown.textLength == 0:
-                event.keyDown.text[0] = ord(event.keyDown.charScan.charCode)
-                event.keyDown.textLength = 1
-            # Convert CR and CRLF into LF
-            if event.keyDown.textLength and event.keyDown.text[0] == ord('\r'):
-                event.keyDown.text[0] = ord('\n')
-                self._shouldSkipLf = True
-            event.keyDown.keyCode = 0
+            return
+
+        parts = []
+        length = 0
+        nextEvent = event
+        while True:
+            keyDown = nextEvent.keyDown
+            text = keyDown.getText() if keyDown.textLength else keyDown.charScan.charCode
+            parts.append(text)
+            length += len(text)
+            if length >= self.maxPasteLength:
+                break
+            nextEvent = self.__createEvent()
+            self.getKeyOrPasteEvent(nextEvent)
+            if not self.isPasteEvent(nextEvent):
+                if nextEvent.what != event_codes.evNothing:
+                    self._heldKeyEvent = nextEvent
+                break
+        text = ''.join(parts)
+
+        # Skip a LF, since we had previously read a CR
+        if self._shouldSkipLf and text.startswith('\n'):
+            text = text[1:]
+        self._shouldSkipLf = text.endswith('\r')
+        # Convert CR and CRLF into LF
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if not text:
+            self.getKeyEvent(event)
+            return
+        event.what = event_codes.evKeyDown
+        event.keyDown.keyCode = 0
+        event.keyDown.controlKeyState = kbPaste
+        event.keyDown.text = bytearray(text.encode('utf-8'))
+        event.keyDown.textLength = len(event.keyDown.text)
 
     def waitForEvents(self, timeoutMs: int) -> None:
         """
         Wait for events with timeout.
         """
         # Only wait if no paste text and no queued key events
-        if self.pasteText is None and self.keyEventCount == 0:
+        if self.pasteText is None and self.keyEventCount == 0 and self._heldKeyEvent is None:
             systemInterface.waitForEvents(timeoutMs)
 
+    def hasPendingEvents(self) -> bool:
+        """
+        True if input has already been read that `waitForEvents()` would not
+        wait for.
+        """
+        return (self.pasteText is not None or self.keyEventCount != 0 or self._heldKeyEvent is not None or
+                systemInterface.hasPendingEvents())
+
     def suspend(self) -> None:
         """
         Suspend event processing.
@@ -220,33 +256,33 @@ class EventQueue:
                  event.keyDown.keyCode == kbEnter or
                  event.keyDown.keyCode == kbTab))
 
+    def isPasteEvent(self, event) -> bool:
+        """
+        Check if event is a key event carrying pasted text.
+        """
+        return (event.what == event_codes.evKeyDown and
+                (event.keyDown.controlKeyState & kbPaste) != 0)
+
     def getPasteEvent(self, event) -> bool:
         """
-        Get next event from paste text buffer.
+        Get next event from paste text buffer: as much of the remaining
+        text as fits in one paste event.
         """
         if self.pasteText and self.pasteTextIndex < self.pasteTextLength:
-            # Get remaining text from current index
-            remaining_text = self.pasteText[self.pasteTextIndex:]
-            if remaining_text:
-                # Use Text.next() to properly handle unicode characters
-                success, next_index = Text.next(remaining_text, 0)
-                if success:
-                    # Extract the character sequence
-                    char_sequence = remaining_text[:next_index]
-                    event.what = event_codes.evKeyDown
-                    event.keyDown.keyCode = 0
-                    event.keyDown.controlKeyState = kbPaste
-                    char_bytes = char_sequence.encode('utf-8')
-                    text_len = min(len(char_bytes), len(event.keyDown.text))
-                    event.keyDown.text[:text_len] = char_bytes[:text_len]
-                    event.keyDown.textLength = text_len
-                    self.pasteTextIndex += next_index
-                    return True
-
-            # End of paste text
-            self.pasteText = None
-            self.pasteTextLength = 0
-            self.pasteTextIndex = 0
+            end = min(self.pasteTextIndex + self.maxPasteLength, self.pasteTextLength)
+            chunk = self.pasteText[self.pasteTextIndex:end]
+            event.what = event_codes.evKeyDown
+            event.keyDown.keyCode = 0
+            event.keyDown.controlKeyState = kbPaste
+            event.keyDown.text = bytearray(chunk.encode('utf-8'))
+            event.keyDown.textLength = len(event.keyDown.text)
+            self.pasteTextIndex = end
+            if end == self.pasteTextLength:
+                # End of paste text
+                self.pasteText = None
+                self.pasteTextLength = 0
+                self.pasteTextIndex = 0
+            return True
         return False
 
     def setPasteText(self, text: str) -> None:
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from collections import deque
+import logging
+import threading
+from typing import Callable
+
+from vindauga.constants.event_codes import evNothing
+
+from .event import Event
+
+logger = logging.getLogger(__name__)
+
+# Event priorities, highest first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class PostedEventQueue:
+    """
+    Events put by views or posted from other threads, waiting for the event
+    loop.
+
+    High priority events (what `putEvent()` puts) are handed out one at a
+    time, ahead of everything else.  Normal and low priority events are
+    taken off the shared queue a batch at a time, so a thread posting a
+    stream of updates costs the event loop one lock per batch rather than
+    one per event.
+
+    Normal and low priority events are bounded by `maxSize`; past that
+    `post()` drops the event and returns False.  Posting to an empty queue
+    calls `wakeUp`, so an event loop asleep in `waitForEvents()` notices.
+    """
+    BATCH_SIZE = 64
+
+    def __init__(self, maxSize: int = 4096, wakeUp: Callable[[], None] | None = None):
+        self.maxSize = maxSize
+        self.wakeUp = wakeUp
+        self._lock = threading.Lock()
+        self._queues: tuple[deque[Event], ...] = (deque(), deque(), deque())
+        # Taken from the shared queues, only touched by the event loop
+        self._batch: deque[Event] = deque()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._queues[PRIORITY_HIGH]) + len(self._batch) + self._size
+
+    def post(self, event: Event, priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Queue a copy of `event`.  Safe to call from any thread.
+
+        :return: False if the queue is full and the event was dropped
+        """
+        e = Event(evNothing)
+        e.setFrom(event)
+        with self._lock:
+            wasEmpty = not (self._size or self._queues[PRIORITY_HIGH])
+            if priority == PRIORITY_HIGH:
+                self._queues[PRIORITY_HIGH].append(e)
+            elif self._size >= self.maxSize:
+                logger.debug('Posted event queue full, dropping %s', e)
+                return False
+            else:
+                self._queues[priority].append(e)
+                self._size += 1
+        if wasEmpty and self.wakeUp:
+            self.wakeUp()
+        return True
+
+    def unget(self, event: Event):
+        """
+        Put a copy of `event` in front of everything else
+        """
+        e = Event(evNothing)
+        e.setFrom(event)
+        with self._lock:
+            self._queues[PRIORITY_HIGH].appendleft(e)
+
+    def get(self, event: Event) -> bool:
+        """
+        Take the next event.  Only the event loop's thread may call this.
+
+        :return: False if there was none
+        """
+        high = self._queues[PRIORITY_HIGH]
+        if high:
+            with self._lock:
+                e = high.popleft()
+        else:
+            if not self._batch and self._size:
+                self._batch.extend(self.drain(self.BATCH_SIZE))
+            if not self._batch:
+                return False
+            e = self._batch.popleft()
+        event.setFrom(e)
+        return True
+
+    def drain(self, limit: int) -> list[Event]:
+        """
+        Take up to `limit` normal and low priority events, in order
+        """
+        events = []
+        with self._lock:
+            for queue in self._queues[PRIORITY_NORMAL:]:
+                while queue and len(events) < limit:
+                    events.append(queue.popleft())
+            self._size -= len(events)
+        return events
+
+    def clear(self):
+        with self._lock:
+            for queue in self._queues:
+                queue.clear()
+            self._batch.clear()
+            self._size = 0
@@ -32,7 +32,7 @@ class Calculator(View):
         self.clear()
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpCalcPalette)
+        return Palette.shared(self.cpCalcPalette)
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
@@ -59,7 +59,7 @@ class PuzzleView(View):
             self.writeLine(0, i, 18, 1, buf)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpPuzzlePalette)
+        return Palette.shared(self.cpPuzzlePalette)
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
@@ -19,9 +19,12 @@ class RefTable(SortedCollection):
             return -1
         return 0
 
+    def sortKey(self, key: str) -> str:
+        return key
+
     def getReference(self, topic: str) -> Reference:
-        index = self.search(topic)
-        if index >= 0:
+        found, index = self.lookup(topic)
+        if found:
             ref = self[index]
         else:
             ref = Reference(topic=topic, resolved=False)
@@ -173,7 +173,7 @@ class MenuView(View):
         return hcNoContext
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpMenuView)
+        palette = Palette.shared(self.cpMenuView)
         return palette
 
     def updateMenu(self, menu: Menu) -> bool:
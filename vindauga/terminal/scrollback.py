@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+from collections import deque
+from typing import Iterator
+
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+from vindauga.utilities.screen.cell_buffer import CellBuffer, unpack_attr
+
+
+class ScrollbackLine:
+    """
+    A terminal row that has scrolled off the screen.
+
+    The row is kept as a `CellBuffer.snapshot()`: the characters packed into
+    a single string (one code point per cell) and the attributes as runs of
+    `(start column, colours, style)`, so a line costs a string and a handful
+    of tuples rather than a cell object per column.
+    """
+    __slots__ = ('snapshot',)
+
+    def __init__(self, snapshot: tuple):
+        self.snapshot = snapshot
+
+    @classmethod
+    def from_cells(cls, cells: CellBuffer) -> ScrollbackLine:
+        return cls(cells.snapshot())
+
+    def __len__(self) -> int:
+        return len(self.snapshot[0])
+
+    def restore(self, cells: CellBuffer) -> int:
+        """
+        Write the line into `cells`, padding with blanks in the line's last
+        attribute when `cells` is wider than the line.
+
+        :return: Number of cells taken from the line
+        """
+        count = cells.restore(0, self.snapshot)
+        runs = self.snapshot[2]
+        if count < len(cells) and runs:
+            cells.fill(count, len(cells) - count, ' ', unpack_attr(*runs[-1][1:]))
+        return count
+
+    def __iter__(self) -> Iterator[tuple[str, ColourAttribute]]:
+        """
+        Yield `(char, attribute)` for each cell
+        """
+        cells = CellBuffer(len(self))
+        self.restore(cells)
+        for x in range(len(cells)):
+            yield cells.get_char(x), cells.get_attr(x)
+
+
+class Scrollback:
+    """
+    Ring of the most recent `limit` lines scrolled off the top of a terminal.
+
+    Adding a line is O(1); once the ring is full the oldest line is dropped.
+    Lines are indexed oldest first, so `scrollback[-1]` is the line that was
+    most recently scrolled off.
+    """
+
+    def __init__(self, limit: int):
+        self._lines = deque(maxlen=max(limit, 0))
+        # Lines ever added, so that a viewer can tell how far the ring has moved
+        self.added = 0
+
+    @property
+    def limit(self) -> int:
+        return self._lines.maxlen
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __getitem__(self, index: int) -> ScrollbackLine:
+        return self._lines[index]
+
+    def append(self, cells: CellBuffer):
+        self.added += 1
+        if self._lines.maxlen:
+            self._lines.append(ScrollbackLine.from_cells(cells))
+
+    def clear(self):
+        self._lines.clear()
@@ -2,7 +2,8 @@
 import functools
 
 import atexit
-from copy import copy
+import codecs
+from collections import deque
 import curses
 from functools import lru_cache
 import itertools
@@ -10,15 +11,17 @@ import logging
 import os
 from os import kill, execvpe, waitpid
 import platform
+import re
 import select
 from signal import *
 import struct
 from typing import Tuple, Union
 
-from vindauga.utilities.text.text import Text
-from vindauga.utilities.screen.screen_cell import ScreenCell
+from vindauga.utilities.text.char_width import char_width as charWidth, char_widths
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
-from vindauga.utilities.platform.events.utf8_handler import UTF8CharacterAssembler
+
+from .scrollback import Scrollback
 
 
 TERMINAL_KEY_TRANSLATION = {
@@ -78,8 +81,15 @@ STATE_SCROLL_SHORT = (1 << 6)
 STATE_MOUSE = (1 << 7)
 STATE_TITLE_CHANGED = (1 << 8)
 
+# Everything that interrupts a run of printable text
+CONTROL_CHARS = re.compile('[\x00-\x1f]')
+
 
 class Terminal:
+    # Lines kept in the scrollback history
+    historyLimit = 1000
+    # Bytes rendered per readPipe() call, so a flood of output still lets the UI draw
+    readLimit = 1 << 16
 
     def __init__(self, width: int, height: int, flags: int, command=None, shell_type='pwsh', *commandArgs):
         self.rows = height
@@ -93,7 +103,8 @@ class Terminal:
         self.savedY = 0
         self.scrollMin = 0
         self.scrollMax = height - 1
-        self._utf8_assembler = UTF8CharacterAssembler()  # Handles UTF-8 character assembly
+        # Keeps multibyte sequences split across reads
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
         self.flags = flags
         self.state = 0
         self.fg = defaultFg
@@ -117,16 +128,9 @@ class Terminal:
         # Initialize colors after initColors() is called
         self.colors = self._create_colour_attribute(defaultFg, defaultBg)
         self.title = ''
-        # Initialize cells with ScreenCell objects containing space characters
-        self.cells = []
-        for _y in range(height):
-            row = []
-            for _x in range(width):
-                cell = ScreenCell()
-                cell.char = ' '  # Use string instead of int
-                cell.attr = self._create_colour_attribute()  # Use proper ColourAttribute
-                row.append(cell)
-            self.cells.append(row)
+        # One CellBuffer per row; a deque so full screen scrolls rotate in O(1)
+        self.cells = deque(self._blankRow() for _y in range(height))
+        self.history = Scrollback(self.historyLimit)
         self.executeCommand()
         atexit.register(self._destroy, self.__childPid)
 
@@ -381,15 +385,10 @@ class Terminal:
         """
         Delete Chars
         """
-        n = self.getNumber()
+        n = min(self.getNumber(), self.cols - self.currCol)
         columns = self.cells[self.currRow]
-        for i in range(self.currCol, self.cols):
-            if i + n < self.cols:
-                columns[i] = columns[i + n]
-            else:
-                cell = columns[i]
-                cell.char = ' '
-                cell.attr = self._create_colour_attribute()
+        columns.copy_from(self.currCol, columns, self.currCol + n)
+        self._eraseCells(columns, self.cols - n, n)
 
     def do_DECSTBM(self):
         """
@@ -440,9 +439,7 @@ class Terminal:
         """
         n = self.getNumber()
 
-        columns = self.cells[self.currRow]
-        for i in range(self.currCol, min(self.cols, self.currCol + n)):
-            self._resetCell(columns[i])
+        self._eraseCells(self.cells[self.currRow], self.currCol, n)
 
     def do_ED(self):
         """
@@ -464,9 +461,7 @@ class Terminal:
             endCol = self.cols - 1
 
         for r in range(startRow, endRow + 1):
-            columns = self.cells[r]
-            for c in range(startCol, endCol + 1):
-                self._resetCell(columns[c])
+            self._eraseCells(self.cells[r], startCol, endCol - startCol + 1)
 
     def do_EL(self):
         """
@@ -486,22 +481,17 @@ class Terminal:
             eraseStart = self.currCol
             eraseEnd = self.cols - 1
 
-        columns = self.cells[self.currRow]
-        for i in range(eraseStart, eraseEnd + 1):
-            self._resetCell(columns[i])
+        self._eraseCells(self.cells[self.currRow], eraseStart, eraseEnd - eraseStart + 1)
 
     def do_ICH(self):
         """
         Insert Blank Chars
         """
-        n = self.getNumber()
+        n = min(self.getNumber(), self.cols - self.currCol)
 
         columns = self.cells[self.currRow]
-        for i in range(self.cols - 1, self.currCol + n - 1, -1):
-            columns[i] = columns[i - n]
-
-        for i in range(self.currCol, self.currCol + n):
-            self._resetCell(columns[i])
+        columns.copy_from(self.currCol + n, columns, self.currCol)
+        self._eraseCells(columns, self.currCol, n)
 
     def do_IL(self):
         """
@@ -509,7 +499,7 @@ class Terminal:
         """
         n = self.getNumber()
         for i in range(self.scrollMax, self.currRow + n - 1, -1):
-            self.cells[i] = copy(self.cells[i - n])
+            self.cells[i] = self.cells[i - n].copy()
         for i in range(self.currRow, min(self.scrollMax + 1, self.currRow + n)):
             self._resetRow(i)
 
@@ -673,7 +663,7 @@ class Terminal:
             col = self.currCol
 
         for i in range(self.rows):
-            self._resetCell(self.cells[i][col])
+            self._eraseCells(self.cells[i], col, 1)
 
     def eraseCols(self, startCol: int):
         if startCol < 0:
@@ -747,29 +737,69 @@ class Terminal:
 
     def putChar(self, c: str):
         """
-        Put a UTF-8 character, handling combining characters properly
+        Put a single character, handling combining and wide characters properly
         """
-        if self.currCol >= self.cols:
+        char_width = charWidth(c)
+        if char_width == 0 and self.currCol > 0:
+            # Combining character - add to previous cell, don't advance the cursor
+            columns = self.cells[self.currRow]
+            col = min(self.currCol, self.cols) - 1
+            if col > 0 and columns.is_trail(col):
+                col -= 1
+            columns.append_text(col, c)
+            return
+
+        char_width = 2 if char_width > 1 and self.cols > 1 else 1
+        if self.currCol + char_width > self.cols:
             self.currCol = 0
             self.scrollDown()
 
-        cell = self.cells[self.currRow][self.currCol]
-        
-        # Check if this is a combining character (width = 0)
-        char_width = Text.width(c)
-        if char_width == 0 and self.currCol > 0:
-            # Combining character - add to previous cell
-            prev_cell = self.cells[self.currRow][self.currCol - 1]
-            if prev_cell.char:
-                prev_cell.char += c
-            return  # Don't advance cursor for combining characters
-        
-        # Normal character
-        cell.char = c
-        cell.attr = self._create_colour_attribute(attr=self.currAttr)
-        
+        columns = self.cells[self.currRow]
+        col = self.currCol
+        attr = self._create_colour_attribute(attr=self.currAttr)
+        self._splitWide(columns, col, col + char_width)
+        columns.set_cell(col, c, attr)
+        if char_width == 2:
+            columns.set_wide(col)
+            columns.set_trail(col + 1)
+            columns.set_attr(col + 1, attr)
+
         # Advance cursor by character width (1 for normal chars, 2 for wide chars)
-        self.currCol += max(1, char_width)
+        self.currCol += char_width
+
+    def putText(self, text: str):
+        """
+        Put a run of printable characters.  Single-column characters are
+        written a row at a time; anything else goes through `putChar()` for
+        its width.
+        """
+        if text.isascii():
+            self._putRun(text)
+            return
+
+        start = 0
+        for i, width in enumerate(char_widths(text)):
+            if width != 1:
+                if start < i:
+                    self._putRun(text[start:i])
+                self.putChar(text[i])
+                start = i + 1
+        if start < len(text):
+            self._putRun(text[start:])
+
+    def _putRun(self, text: str):
+        attr = self._create_colour_attribute(attr=self.currAttr)
+        pos = 0
+        while pos < len(text):
+            if self.currCol >= self.cols:
+                self.currCol = 0
+                self.scrollDown()
+            columns = self.cells[self.currRow]
+            count = min(len(text) - pos, self.cols - self.currCol)
+            self._splitWide(columns, self.currCol, self.currCol + count)
+            columns.write_text(self.currCol, text[pos:pos + count], attr)
+            self.currCol += count
+            pos += count
 
     def renderCtrlChar(self, c: str):
         if c == '\r':
@@ -817,35 +847,32 @@ class Terminal:
 
     def render(self, data: str):
         """
-        Render UTF-8 text properly, handling combining characters and escape sequences
+        Render decoded text, handling combining characters and escape sequences.
+        Escape sequences are consumed a character at a time; everything up to
+        the next control character is written as a single run.
         """
-        text_pos = 0
-        
-        while text_pos < len(data):
-            # Get next character with proper UTF-8 handling
-            success, new_text_pos, char_width = Text.next_with_width(data, text_pos)
-            if not success:
-                break
-                
-            char = data[text_pos:new_text_pos]
-            
-            # Skip null characters
-            if char == '\x00':
-                text_pos = new_text_pos
+        pos = 0
+        end = len(data)
+
+        while pos < end:
+            if self.state & STATE_ESCAPE_MODE and len(self.escBuf) < ESC_SEQ_BUF_SIZE:
+                char = data[pos]
+                pos += 1
+                # Skip null characters
+                if char != '\x00':
+                    self.escBuf += char
+                    self.tryEscapeSequence()
                 continue
-                
-            if self.isModeEscaped() and len(self.escBuf) < ESC_SEQ_BUF_SIZE:
-                self.escBuf += char
-                self.tryEscapeSequence()
-            else:
-                # Check if it's a control character
-                if len(char) == 1 and 1 <= ord(char) <= 31:
+
+            match = CONTROL_CHARS.search(data, pos)
+            stop = match.start() if match else end
+            if stop > pos:
+                self.putText(data[pos:stop])
+            if match:
+                char = data[stop]
+                if char != '\x00':
                     self.renderCtrlChar(char)
-                else:
-                    # Normal character (including combining characters)
-                    self.putChar(char)
-            
-            text_pos = new_text_pos
+            pos = stop + 1
 
     def resize(self, width: int, height: int):
         if not (width and height):
@@ -856,32 +883,22 @@ class Terminal:
         startX = self.cols
         startY = self.rows
 
+        cells = list(self.cells)
         if deltaY < 0:
-            cells = self.cells[-deltaY:]
+            # Rows pushed off the top are kept in the history
+            for row in cells[:-deltaY]:
+                self.history.append(row)
+            cells = cells[-deltaY:]
             self.currRow += deltaY
-        else:
-            cells = self.cells[:]
-
-        # Initialize cells with ScreenCell objects
-        self.cells = []
-        for _y in range(height):
-            row = []
-            for _x in range(width):
-                cell = ScreenCell()
-                cell.char = ' '
-                cell.attr = self._create_colour_attribute()
-                row.append(cell)
-            self.cells.append(row)
-
-        for i, c in enumerate(cells):
-            if i < len(self.cells):
-                self.cells[i][:width] = c[:width]
-                if deltaX > 0:
-                    for _ in range(deltaX):
-                        cell = ScreenCell()
-                        cell.char = ' '
-                        cell.attr = self._create_colour_attribute()
-                        self.cells[i].append(cell)
+
+        self.cells = deque(self._blankRow(width) for _y in range(height))
+
+        for i, c in enumerate(cells[:height]):
+            columns = self.cells[i]
+            columns.copy_from(0, c)
+            if width < len(c) and c.is_trail(width):
+                # Don't keep half of a wide character
+                columns.set_text(width - 1, ' ')
 
         self.cols = width
         self.rows = height
@@ -912,15 +929,18 @@ class Terminal:
             return
 
         self.currRow = self.scrollMax
-        self.cells[self.scrollMin: self.scrollMax] = self.cells[self.scrollMin + 1: self.scrollMax + 1]
-        # Create new row of ScreenCells
-        new_row = []
-        for _ in range(self.cols):
-            cell = ScreenCell()
-            cell.char = ' '
-            cell.attr = self._create_colour_attribute()
-            new_row.append(cell)
-        self.cells[self.scrollMax] = new_row
+        if self.scrollMin == 0 and self.scrollMax == self.rows - 1:
+            # The top row becomes the new bottom row
+            self.cells.rotate(-1)
+            row = self.cells[-1]
+        else:
+            row = self.cells[self.scrollMin]
+            del self.cells[self.scrollMin]
+            self.cells.insert(self.scrollMax, row)
+
+        if self.scrollMin == 0:
+            self.history.append(row)
+        self._clearRow(row)
 
     def scrollUp(self):
         self.currRow -= 1
@@ -928,15 +948,15 @@ class Terminal:
             return
 
         self.currRow = self.scrollMin
-        self.cells[self.scrollMin + 1:self.scrollMax] = self.cells[self.scrollMin:self.scrollMax - 1]
-        # Create new row of ScreenCells
-        new_row = []
-        for _ in range(self.cols):
-            cell = ScreenCell()
-            cell.char = ' '
-            cell.attr = self._create_colour_attribute()
-            new_row.append(cell)
-        self.cells[self.scrollMin] = new_row
+        if self.scrollMin == 0 and self.scrollMax == self.rows - 1:
+            # The bottom row becomes the new top row
+            self.cells.rotate(1)
+            row = self.cells[0]
+        else:
+            row = self.cells[self.scrollMax]
+            del self.cells[self.scrollMax]
+            self.cells.insert(self.scrollMin, row)
+        self._clearRow(row)
 
     def write(self, keyCode):
         if buffer := TERMINAL_KEY_TRANSLATION.get(keyCode):
@@ -963,18 +983,14 @@ class Terminal:
             poller = select.poll()
             poller.register(self.__ptyFd, select.POLLIN)
             count = 0
-            while poller.poll(5):
+            received = 0
+            # Stop after readLimit bytes so the caller can draw; the rest waits for the next call
+            while received < self.readLimit and poller.poll(5):
                 try:
-                    # Read raw bytes and let Text class handle UTF-8 decoding
                     buffer = os.read(self.__ptyFd, 16380)
                     if buffer:
-                        # Process each byte through UTF8 assembler
-                        decoded_text = ""
-                        for byte_val in buffer:
-                            char = self._utf8_assembler.add_byte(byte_val)
-                            if char is not None:
-                                decoded_text += char
-
+                        received += len(buffer)
+                        decoded_text = self._decoder.decode(buffer)
                         if decoded_text:
                             try:
                                 self.render(decoded_text)
@@ -997,13 +1013,7 @@ class Terminal:
                 return -1
 
             if buffer:
-                # Process each byte through UTF8 assembler
-                decoded_text = ""
-                for byte_val in buffer:
-                    char = self._utf8_assembler.add_byte(byte_val)
-                    if char is not None:
-                        decoded_text += char
-
+                decoded_text = self._decoder.decode(buffer)
                 if decoded_text:
                     count = len(decoded_text)
                     try:
@@ -1027,15 +1037,27 @@ class Terminal:
             else:
                 self.__childPid.write(keyCode)
 
-    def _resetCell(self, cell: ScreenCell):
-        cell.char = ' '
-        cell.attr = self._create_colour_attribute()
+    def _eraseCells(self, row: CellBuffer, start: int, count: int):
+        self._splitWide(row, start, start + count)
+        row.fill(start, count, ' ', self._create_colour_attribute())
+
+    @staticmethod
+    def _splitWide(row: CellBuffer, start: int, end: int):
+        """
+        Blank the halves of wide characters left behind when `start:end` is overwritten
+        """
+        if 0 < start < len(row) and row.is_trail(start):
+            row.set_text(start - 1, ' ')
+        if 0 < end < len(row) and row.is_trail(end):
+            row.set_text(end, ' ')
 
     def _resetRow(self, rowNum: int):
-        new_row = []
-        for _ in range(self.cols):
-            cell = ScreenCell()
-            cell.char = ' '
-            cell.attr = self._create_colour_attribute()
-            new_row.append(cell)
-        self.cells[rowNum] = new_row
+        self.cells[rowNum] = self._blankRow()
+
+    def _blankRow(self, width: int = None) -> CellBuffer:
+        row = CellBuffer(self.cols if width is None else width)
+        self._clearRow(row)
+        return row
+
+    def _clearRow(self, row: CellBuffer):
+        row.fill(0, len(row), ' ', self._create_colour_attribute())
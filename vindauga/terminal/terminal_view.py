@@ -7,17 +7,16 @@ import os
 import wcwidth
 
 from vindauga.constants.command_codes import cmPaste
-from vindauga.utilities.text.text import Text
-from vindauga.constants.event_codes import evMouseUp, evKeyDown, evMouseDown, evCommand, evMouseWheel
+from vindauga.constants.event_codes import evMouseUp, evKeyDown, evMouseDown, evCommand, evMouseWheel, mwUp, mwDown
 from vindauga.constants.option_flags import ofSelectable
 from vindauga.constants.keys import *
 from vindauga.events.event import Event
 from vindauga.utilities.support.clipboard.clipboard import Clipboard
 from vindauga.types.collections.collection import Collection
-from vindauga.types.draw_buffer import DrawBuffer
 from vindauga.types.point import Point
 from vindauga.types.rect import Rect
 from vindauga.types.view import View
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 from vindauga.widgets.window import Window
 
 from .terminal import Terminal, STATE_CURSOR_INVIS, STATE_TITLE_CHANGED, STATE_MOUSE
@@ -82,6 +81,8 @@ logger = logging.getLogger(__name__)
 class TerminalView(View):
     ActiveTerminals = Collection()
     OriginalSignals = dict()
+    # Lines moved per mouse wheel step when browsing the scrollback
+    wheelLines = 3
 
     def __init__(self, bounds: Rect, parent: Window, command=None, *commandArgs):
         super().__init__(bounds)
@@ -92,34 +93,31 @@ class TerminalView(View):
         self.options |= ofSelectable
         self.terminal = Terminal(self.size.x, self.size.y, 0, command, *commandArgs)
         self.terminal.setColors(curses.COLOR_WHITE, curses.COLOR_BLACK)
+        # Lines of history shown above the live screen, 0 follows the output
+        self.scrollOffset = 0
+        self.__historyAdded = 0
 
     def draw(self):
+        history = self.terminal.history
+        self.followHistory()
+
         minY = min(self.size.y, self.terminal.rows)
         minX = min(self.size.x, self.terminal.cols)
+        line = CellBuffer(minX)
         for y in range(minY):
-            buffer = DrawBuffer()
-            x = 0
-            right = minX
-            while x < right:
-                cell = self.terminal.cells[y][x]
-                cell_char = cell.char
-                c_w = Text.width(cell_char) if cell_char else 1
-                colour_attr = cell.attr
-                buffer.putChar(x, cell_char, colour_attr)
-                if c_w and c_w > 0:
-                    buffer.putAttribute(x, colour_attr)
-                if c_w and c_w > 1:
-                    right -= (c_w - 1)
-                x += 1
-            self.writeLine(0, y, min(x, minX), 1, buffer)
+            if y < self.scrollOffset:
+                history[y - self.scrollOffset].restore(line)
+                self.writeLine(0, y, minX, 1, line)
+            else:
+                self.writeLine(0, y, minX, 1, self.terminal.cells[y - self.scrollOffset])
 
         # Set cursor position with bounds checking
         cursor_x = min(self.terminal.currCol, self.size.x - 1)
-        cursor_y = min(self.terminal.currRow, self.size.y - 1)
-        if cursor_x >= 0 and cursor_y >= 0:
+        cursor_y = min(self.terminal.currRow, self.size.y - 1) + self.scrollOffset
+        if cursor_x >= 0 and 0 <= cursor_y < self.size.y:
             self.setCursor(cursor_x, cursor_y)
 
-        if self.terminal.state & STATE_CURSOR_INVIS:
+        if self.terminal.state & STATE_CURSOR_INVIS or cursor_y >= self.size.y:
             self.hideCursor()
         else:
             self.showCursor()
@@ -132,7 +130,18 @@ class TerminalView(View):
         super().handleEvent(event)
         ch = [0, 0]
 
-        if event.what == evKeyDown:
+        if event.what == evKeyDown and event.keyDown.keyCode in {kbCtrlPgUp, kbCtrlPgDn}:
+            page = self.size.y - 1
+            self.scrollHistory(page if event.keyDown.keyCode == kbCtrlPgUp else -page)
+            self.clearEvent(event)
+        elif event.what == evKeyDown and event.keyDown.controlKeyState & kbPaste and event.keyDown.textLength:
+            self.scrollHistory(-self.scrollOffset)
+            # The whole paste in one write, with line breaks sent as Enter
+            self.terminal.writePipe(event.keyDown.getText().replace('\n', '\r'))
+            self.handleTerminal(self)
+            self.clearEvent(event)
+        elif event.what == evKeyDown:
+            self.scrollHistory(-self.scrollOffset)
             ch[0] = event.keyDown.charScan.charCode
             if ord(ch[0]) in {-1, 0}:
                 ch = self.decodeKey(event.keyDown.keyCode)
@@ -146,7 +155,12 @@ class TerminalView(View):
         elif event.what in {evMouseDown, evMouseUp, evMouseWheel}:
             if self.terminal.state & STATE_MOUSE:
                 self.sendMouseEvent(event)
-            if not self.terminal.state & STATE_MOUSE:
+            elif event.what == evMouseWheel:
+                if event.mouse.wheel == mwUp:
+                    self.scrollHistory(self.wheelLines)
+                elif event.mouse.wheel == mwDown:
+                    self.scrollHistory(-self.wheelLines)
+            else:
                 self.tryPaste(event, 1)
             self.clearEvent(event)
         elif event.what == evCommand:
@@ -154,6 +168,26 @@ class TerminalView(View):
                 self.tryPaste(event, 0)
                 self.clearEvent(event)
 
+    def scrollHistory(self, lines: int):
+        """
+        Move the view `lines` further back into the scrollback (negative
+        moves towards the live screen).
+        """
+        self.followHistory()
+        offset = max(0, min(self.scrollOffset + lines, len(self.terminal.history)))
+        if offset != self.scrollOffset:
+            self.scrollOffset = offset
+            self.drawView()
+
+    def followHistory(self):
+        """
+        Keep showing the same history lines while new output scrolls in
+        """
+        history = self.terminal.history
+        if self.scrollOffset:
+            self.scrollOffset = min(self.scrollOffset + history.added - self.__historyAdded, len(history))
+        self.__historyAdded = history.added
+
     def sendMouseEvent(self, event: Event):
         local = self.makeLocal(event.mouse.where)
         b = chr(32)
@@ -208,7 +242,7 @@ class TerminalView(View):
     @staticmethod
     def updateTerminals():
         """
-        Call me on idle; `TerminalView.updateTerminals()`
+        Call me from a timer; `TerminalView.updateTerminals()`
         """
         TerminalView.ActiveTerminals.forEach(TerminalView.handleTerminal)
 
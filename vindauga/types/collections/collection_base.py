@@ -64,3 +64,11 @@ class CollectionBase(list):
             return self.index(key)
         except ValueError:
             return len(self) + 1
+
+    def lookup(self, key: Any) -> tuple[bool, int]:
+        """
+        Like `search()` but also says whether `key` was found. Sorted
+        collections return the insertion point when it was not.
+        """
+        index = self.search(key)
+        return index < len(self), index
@@ -37,8 +37,6 @@ class FileCollection(SortedCollection):
             return -1
         return 1
 
-    def search(self, key) -> int:
-        for i, entry in enumerate(self):
-            if entry == key:
-                return i
-        return len(self) + 1
+    def sortKey(self, key) -> tuple[bool, bool, str]:
+        # '..' first, then directories, then files, ignoring case
+        return key.name != '..', not key.attr & FA_DIREC, key.name.lower()
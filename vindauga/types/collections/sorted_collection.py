@@ -1,5 +1,7 @@
 # -*- coding: utf -*-
+from bisect import bisect_left, bisect_right
 from functools import cmp_to_key
+from typing import Any
 
 from .collection import Collection
 
@@ -8,7 +10,13 @@ class SortedCollection(Collection):
     """
     The abstract class `SortedCollection` is a specialized derivative of both
     `Collection`. It implements collections sorted by a key (with or without duplicates).
-       
+
+    Items are kept in order as they are added: `append()` and `insert()` find
+    the position with a binary search, `extend()` sorts once, and `search()`
+    is O(log n). The order is defined by `sortKey()`, which by default wraps
+    `_compare()`; derived classes with a natural key should override
+    `sortKey()` as well, as it is much faster.
+
     No instances of `SortedCollection` are allowed. It exists solely as a base
     for other standard or user-defined derived classes.
     """
@@ -16,23 +24,91 @@ class SortedCollection(Collection):
     name = 'SortedCollection'
 
     def __init__(self, iterable=()):
+        self._cmpKey = cmp_to_key(self._compare)
         super().__init__(iterable)
         self.sort()
 
     def __setitem__(self, index: int, value):
-        super().__setitem__(index, value)
-        self.sort()
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            self.sort()
+            return
+        del self[index]
+        self.append(value)
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
 
     def insert(self, index: int, value):
-        super().append(value)
-        self.sort()
+        """
+        Insert `value` at its sorted position; `index` is ignored.
+        """
+        self.append(value)
 
     def append(self, value):
-        super().append(value)
+        sortKey = self._itemKey(value)
+        if not self or not sortKey < self._itemKey(self[-1]):
+            # Items arriving in order go straight on the end
+            super().append(value)
+            return
+        index = bisect_right(self, sortKey, key=self._itemKey)
+        super().insert(index, value)
+
+    def extend(self, iterable):
+        super().extend(iterable)
         self.sort()
 
     def sort(self, reverse: bool = False):
-        super().sort(key=cmp_to_key(self._compare), reverse=reverse)
+        super().sort(key=self._itemKey, reverse=reverse)
+
+    def lookup(self, key: Any) -> tuple[bool, int]:
+        """
+        Binary search for `key`.
+
+        :param key: Key to find, as returned by `keyOf()`
+        :return: (found, index of the first matching item, or where one would be inserted)
+        """
+        sortKey = self.sortKey(key)
+        index = bisect_left(self, sortKey, key=self._itemKey)
+        found = index < len(self) and not sortKey < self._itemKey(self[index])
+        return found, index
+
+    def search(self, key: Any) -> int:
+        found, index = self.lookup(key)
+        if found:
+            return index
+        return len(self) + 1
+
+    def indexOf(self, item) -> int:
+        found, index = self.lookup(self.keyOf(item))
+        if found:
+            sortKey = self._itemKey(item)
+            for i in range(index, len(self)):
+                if self[i] == item:
+                    return i
+                if sortKey < self._itemKey(self[i]):
+                    break
+        return -1
+
+    @staticmethod
+    def keyOf(item) -> Any:
+        """
+        The key of `item` that the collection is ordered and searched by.
+        """
+        return item
+
+    def sortKey(self, key) -> Any:
+        """
+        A value ordered the same way as `_compare()` orders `key`.
+
+        :param key: Key as returned by `keyOf()`
+        :return: Orderable value
+        """
+        return self._cmpKey(key)
+
+    def _itemKey(self, item) -> Any:
+        return self.sortKey(self.keyOf(item))
 
     def _compare(self, key1, key2) -> int:
         """
@@ -5,6 +5,9 @@ from .sorted_collection import SortedCollection
 class StringCollection(SortedCollection):
     name = 'StringCollection'
 
+    def sortKey(self, key: str) -> str:
+        return key
+
     def _compare(self, key1: str, key2: str) -> int:
         if key1 == key2:
             return 0
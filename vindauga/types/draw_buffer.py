@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from vindauga.utilities.colours.attribute_pair import AttributePair
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
-from vindauga.utilities.screen.screen_cell import ScreenCell, set_cell, set_attr, set_char
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 from vindauga.utilities.text.text import Text
 
 from .screen import Screen
@@ -19,7 +19,7 @@ class DrawBuffer:
         Initialize with specified width.
         """
         self.width = 8 + max(Screen.screen.screenWidth, Screen.screen.screenHeight, 80)
-        self.data = [ScreenCell() for _ in range(self.width)]
+        self.data = CellBuffer(self.width)
 
     def _normalize_attribute(self, attr):
         """
@@ -37,23 +37,17 @@ class DrawBuffer:
         """
         Fill buffer cells with a character.
         """
+        if indent < 0:
+            return 0
         actual_count = min(count, max(self.width - indent, 0))
         attr = self._normalize_attribute(attr)
 
         if attr:
-            if char:
-                for i in range(actual_count):
-                    cell = ScreenCell()
-                    set_cell(cell, char, attr)
-                    self.data[indent + i] = cell
-            else:
-                # Only attr - set attributes only
-                for i in range(actual_count):
-                    set_attr(self.data[indent + i], attr)
+            # With no char only the attributes are set
+            self.data.fill(indent, actual_count, char or None, attr)
         else:
             # Only char - set characters only
-            for i in range(actual_count):
-                set_char(self.data[indent + i], char)
+            self.data.fill(indent, actual_count, char, None)
 
         return actual_count
 
@@ -119,10 +113,10 @@ class DrawBuffer:
         """
         Set attribute for specified number of cells.
         """
+        if indent < 0:
+            return 0
         actual_count = min(count, max(len(self.data) - indent, 0))
-        for i in range(actual_count):
-            if indent + i < len(self.data):
-                self.data[indent + i].attr = attr
+        self.data.fill_attr(indent, actual_count, attr)
         return actual_count
 
     def moveBuf(self, indent: int, source: str, attr: ColourAttribute | AttributePair, count: int) -> int:
@@ -147,8 +141,7 @@ class DrawBuffer:
         if indent < 0 or indent >= self.width:
             return 0
 
-        self.data[indent].char = char
-        self.data[indent].attr = attr
+        self.data.set_cell(indent, char, attr)
         return 1
 
     def putAttributes(self, indent: int, attr: ColourAttribute, count: int = 1) -> int:
@@ -163,11 +156,7 @@ class DrawBuffer:
             return 0
 
         actual_count = min(count, self.width - indent)
-
-        for i in range(actual_count):
-            if indent + i < len(self.data):
-                self.data[indent + i].attr = attr
-
+        self.data.fill_attr(indent, actual_count, attr)
         return actual_count
 
     def clear(self, attr: ColourAttribute = None):
@@ -176,10 +165,7 @@ class DrawBuffer:
 
         :param attr: Colour attribute.
         """
-        for i in range(len(self.data)):
-            self.data[i] = ScreenCell()
-            if attr:
-                self.data[i].attr = attr
+        self.data.clear(attr)
 
     def fillChar(self, char: str, attr: ColourAttribute = None):
         """
@@ -188,20 +174,15 @@ class DrawBuffer:
         :param char: Character to fill.
         :param attr: Colour attribute.
         """
-        for i in range(len(self.data)):
-            self.data[i].char = char
-            if attr:
-                self.data[i].attr = attr
+        self.data.fill(0, len(self.data), char, attr)
 
-    def toCells(self, max_width: int = None) -> list[ScreenCell]:
+    def toCells(self, max_width: int = None) -> CellBuffer:
         """
-        Return cells as a list, optionally limited to max_width.
+        Return a copy of the cells, optionally limited to max_width.
 
         :param max_width: Max width.
         """
-        if max_width is None:
-            return self.data[:]
-        return self.data[: min(max_width, len(self.data))]
+        return self.data.copy(0, max_width)
 
     def toString(self, max_width: int = None) -> str:
         """
@@ -210,7 +191,7 @@ class DrawBuffer:
         :param max_width: Max width.
         """
         end_pos = min(max_width or self.width, len(self.data))
-        return ''.join(cell.char for cell in self.data[:end_pos])
+        return self.data.to_string(0, end_pos)
 
     def getWidth(self, max_chars: int = None) -> int:
         """
@@ -219,8 +200,7 @@ class DrawBuffer:
         :param max_chars: Max width.
         """
         end_pos = min(max_chars or len(self.data), len(self.data))
-        text = ''.join(cell.char for cell in self.data[:end_pos])
-        return Text.width(text)
+        return Text.width(self.data.to_string(0, end_pos))
 
     def __getitem__(self, key):
         """
@@ -256,11 +236,5 @@ class DrawBuffer:
 
         :param new_width: New width.
         """
-        if new_width > len(self.data):
-            # Expand buffer
-            self.data.extend(ScreenCell() for _ in range(new_width - len(self.data)))
-        elif new_width < len(self.data):
-            # Shrink buffer
-            self.data = self.data[:new_width]
-
+        self.data.resize(new_width)
         self.width = new_width
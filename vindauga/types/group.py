@@ -12,16 +12,19 @@ from vindauga.constants.event_codes import positionalEvents, focusedEvents, evNo
 from vindauga.constants.option_flags import (ofSelectable, ofPreProcess, ofPostProcess, ofBuffered, ofValidate,
                                              ofCenterY, ofCenterX)
 from vindauga.constants.state_flags import (sfVisible, sfActive, sfSelected, sfFocused, sfDragging, sfDisabled, sfModal,
-                                            sfExposed)
+                                            sfExposed, sfShadow)
 from vindauga.events.event import Event
 
 from .point import Point
 from .rect import Rect
 from .screen import Screen
-from .view import View
+from .view import View, SHADOW_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Left and right edges of a row's span map, beyond any child
+SPAN_LIMIT = 1 << 30
+
 
 @dataclass
 class HandleStruct:
@@ -93,6 +96,7 @@ class Group(View):
         self.clip: Rect = self.getExtent()
         self.eventMask = 0xFFFF
         self.current = None
+        self._spans: dict[int, list[tuple[int, int, Optional[View], bool]]] = {}
 
     @property
     def last(self) -> View:
@@ -145,6 +149,7 @@ class Group(View):
             self.destroy(view)
 
         self.children = []
+        self.resetSpans()
         self.freeBuffer()
         self.current = None
         super().shutdown()
@@ -169,7 +174,7 @@ class Group(View):
 
         try:
             return v.execute()
-        except:
+        except Exception:
             logger.exception('exec view failed.')
         finally:
             if not saveOwner:
@@ -467,14 +472,93 @@ class Group(View):
     def removeView(self, view: View):
         if self.children:
             self.children.remove(view)
+            self.resetSpans()
 
     def insertView(self, view: View, target: Optional[View] = None):
         view.owner = self
+        self.resetColorCache()
         if target is not None:
             idx = self.children.index(target)
             self.children.insert(idx, view)
         else:
             self.children.append(view)
+        self.resetSpans()
+
+    def rowSpans(self, y: int) -> list[tuple[int, int, Optional[View], bool]]:
+        """
+        Which child can be seen along row `y` of the group.
+
+        The row is split into sorted, non-overlapping `(start, end, view,
+        shadowed)` spans, where `view` is the topmost visible child over the
+        columns `start` to `end` (None where no child covers them) and
+        `shadowed` is True if the shadow of a child in front of it falls
+        there. Rows are built on first use and kept until `resetSpans()`.
+
+        :param y: Row, in the group's coordinates
+        :return: Spans from `-SPAN_LIMIT` to `SPAN_LIMIT`
+        """
+        spans = self._spans.get(y)
+        if spans is None:
+            spans = self._spans[y] = self.__buildSpans(y)
+        return spans
+
+    def resetSpans(self):
+        """
+        Discards the span map. Called whenever the order, bounds or
+        visibility of the children changes.
+        """
+        self._spans.clear()
+
+    def __buildSpans(self, y: int) -> list[tuple[int, int, Optional[View], bool]]:
+        spans = [(-SPAN_LIMIT, SPAN_LIMIT, None, False)]
+        # Paint back to front, so each child covers the ones behind it
+        for view in reversed(self.children):
+            if not (view.state & sfVisible):
+                continue
+            top = view.origin.y
+            bottom = top + view.size.y
+            left = view.origin.x
+            right = left + view.size.x
+            if top <= y < bottom:
+                spans = self.__coverSpans(spans, left, right, view)
+                if (view.state & sfShadow) and y >= top + SHADOW_SIZE.y:
+                    spans = self.__shadeSpans(spans, right, right + SHADOW_SIZE.x)
+            elif (view.state & sfShadow) and bottom <= y < bottom + SHADOW_SIZE.y:
+                spans = self.__shadeSpans(spans, left + SHADOW_SIZE.x, right + SHADOW_SIZE.x)
+        return spans
+
+    @staticmethod
+    def __coverSpans(spans, left: int, right: int, view: View):
+        if left >= right:
+            return spans
+        result = []
+        for span in spans:
+            start, end, top, shadowed = span
+            if end <= left or start >= right:
+                result.append(span)
+                continue
+            if start < left:
+                result.append((start, left, top, shadowed))
+            if start <= left:
+                result.append((left, right, view, False))
+            if end > right:
+                result.append((right, end, top, shadowed))
+        return result
+
+    @staticmethod
+    def __shadeSpans(spans, left: int, right: int):
+        result = []
+        for span in spans:
+            start, end, top, shadowed = span
+            if shadowed or end <= left or start >= right:
+                result.append(span)
+                continue
+            if start < left:
+                result.append((start, left, top, False))
+            result.append((max(start, left), min(end, right), top, True))
+            if end > right:
+                result.append((right, end, top, False))
+        return result
 
     def remove(self, view: View):
         if view is None:
@@ -484,6 +568,7 @@ class Group(View):
         view.hide()
         self.removeView(view)
         view.owner = None
+        self.resetColorCache()
         if saveState & sfVisible:
             view.show()
 
@@ -38,6 +38,7 @@
 #----------------------------------------------------------------------#
 """
 from __future__ import annotations
+from functools import lru_cache
 from typing import List, Union
 
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
@@ -55,13 +56,28 @@ class Palette:
 
     def __init__(self, palette: Union[Palette, str, List[ColourAttribute]] = ''):
         if isinstance(palette, (Palette,)):
-            self.palette = palette.palette[:]
+            self.palette = list(palette.palette)
         else:
             if isinstance(palette, list):
                 self.palette = palette[:]
             else:
                 self.palette = [ColourAttribute.from_bios(ord(c)) for c in palette]
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def shared(palette: str) -> Palette:
+        """
+        The one read-only `Palette` for the palette string `palette`, for
+        `getPalette()` implementations to return without building a new
+        object on every call. Use `Palette(palette)` for a copy to edit.
+
+        :param palette: Palette string
+        :return: Shared palette
+        """
+        shared = Palette(palette)
+        shared.palette = tuple(shared.palette)
+        return shared
+
     def __len__(self):
         return len(self.palette)
 
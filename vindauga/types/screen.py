@@ -8,7 +8,7 @@ import threading
 import traceback
 
 from vindauga.utilities.platform.system_interface import systemInterface
-from vindauga.utilities.screen.screen_cell import ScreenCell
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 from vindauga.types.display import Display
 from vindauga.mouse.mouse import Mouse
 
@@ -73,7 +73,7 @@ class Screen(_Display):
         # Expose platform for compatibility checking
         self.startupMode = self.getCrtMode()
         self.startupCursor = self.getCursorType()
-        self.screenBuffer: list[ScreenCell] = systemInterface.allocateScreenBuffer()
+        self.screenBuffer: CellBuffer = systemInterface.allocateScreenBuffer()
         self.setCrtData()
         self.cursorLines: int = 0
 
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from vindauga.constants.command_codes import cmTaskDone, cmTaskProgress
+from vindauga.constants.event_codes import evBroadcast, evNothing
+from vindauga.events.event import Event
+from vindauga.events.posted_event_queue import PRIORITY_HIGH, PRIORITY_LOW
+
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """
+    Raised by `Task.checkCancelled()` to stop a task that has been cancelled
+    """
+
+
+class Task:
+    """
+    A function running on a worker, and the handle the UI keeps for it.
+
+    The worker reports with `setProgress()` and looks at `checkCancelled()`
+    (or `cancelled`) between steps. On the UI thread `cancel()` asks it to
+    stop, and once the receiver has had `cmTaskDone`, `result()` gives back
+    what the function returned or raises what it raised.
+    """
+
+    def __init__(self, executor: TaskExecutor, receiver=None, progressView=None):
+        self.executor = executor
+        self.receiver = receiver
+        self.progressView = progressView
+        self.done = 0
+        self.total = 0
+        self.future: Optional[Future] = None
+        self._cancelled = threading.Event()
+        # A cmTaskProgress is on its way; later updates ride along with it
+        self._progressPosted = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+        """
+        Ask the task to stop; neither progress nor its result is delivered
+        """
+        self._cancelled.set()
+        if self.future:
+            self.future.cancel()
+
+    def checkCancelled(self):
+        """
+        Raise `TaskCancelled` if the task has been cancelled
+        """
+        if self._cancelled.is_set():
+            raise TaskCancelled
+
+    def setProgress(self, done: float, total: Optional[float] = None):
+        """
+        Report progress from the worker. Updates made while the previous one
+        is still waiting for the event loop are sent with it.
+        """
+        self.done = done
+        if total is not None:
+            self.total = total
+        if not self._progressPosted:
+            self._progressPosted = True
+            if not self.executor.postTaskEvent(self, cmTaskProgress, PRIORITY_LOW):
+                self._progressPosted = False
+
+    def result(self) -> Any:
+        return self.future.result()
+
+
+class TaskExecutor:
+    """
+    Runs long operations off the event loop's thread.
+
+    `submit()` runs `fn(task, *args)` on a pool of threads; `submitProcess()`
+    runs `fn(*args)` in a pool of processes, for CPU bound work that needs
+    neither progress nor cooperative cancelling. Each pool is only started
+    when first used.
+
+    Progress and completion come back as `evBroadcast` events with a command
+    of `cmTaskProgress` or `cmTaskDone` and the `Task` as `infoPtr`, posted
+    to the event loop, which wakes up for them. `dispatch()` then sends
+    progress to the task's `progressView` (or else its `receiver`) and
+    completion to its `receiver`; a task with neither is broadcast to
+    everyone.
+    """
+
+    def __init__(self, post: Callable[[Event, int], bool], maxWorkers: Optional[int] = None,
+                 maxProcesses: Optional[int] = None):
+        self.post = post
+        self.maxWorkers = maxWorkers
+        self.maxProcesses = maxProcesses
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._tasks: set[Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, fn: Callable, *args, receiver=None, progressView=None) -> Task:
+        """
+        Run `fn(task, *args)` on a worker thread
+        """
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.maxWorkers, thread_name_prefix='vindauga-task')
+        task = Task(self, receiver, progressView)
+        return self.__start(task, self._threads.submit(self.__run, task, fn, args))
+
+    def submitProcess(self, fn: Callable, *args, receiver=None) -> Task:
+        """
+        Run `fn(*args)` in a worker process; `fn` and `args` must pickle
+        """
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.maxProcesses)
+        task = Task(self, receiver)
+        return self.__start(task, self._processes.submit(fn, *args))
+
+    def dispatch(self, event: Event):
+        """
+        Hand a task event to its view. Called on the event loop's thread.
+        """
+        task: Task = event.message.infoPtr
+        if event.message.command == cmTaskProgress:
+            task._progressPosted = False
+            view = task.receiver if task.progressView is None else task.progressView
+            # The cmTaskDone that is ahead of it or on its way has the final count
+            stale = task.finished
+        else:
+            view = task.receiver
+            stale = False
+        if task.cancelled or stale:
+            event.what = evNothing
+        elif view is not None:
+            view.handleEvent(event)
+            event.what = evNothing
+
+    def cancelAll(self):
+        with self._lock:
+            tasks, self._tasks = self._tasks, set()
+        for task in tasks:
+            task.cancel()
+
+    def shutdown(self):
+        """
+        Cancel every task and let the pools go once their workers are idle
+        """
+        self.cancelAll()
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+    def postTaskEvent(self, task: Task, command: int, priority: int) -> bool:
+        event = Event(evBroadcast)
+        event.message.command = command
+        event.message.infoPtr = task
+        return self.post(event, priority)
+
+    def __start(self, task: Task, future: Future) -> Task:
+        task.future = future
+        with self._lock:
+            self._tasks.add(task)
+        future.add_done_callback(lambda _future: self.__finished(task))
+        return task
+
+    @staticmethod
+    def __run(task: Task, fn: Callable, args: tuple) -> Any:
+        task.checkCancelled()
+        return fn(task, *args)
+
+    def __finished(self, task: Task):
+        with self._lock:
+            self._tasks.discard(task)
+        if task.cancelled or task.future.cancelled():
+            return
+        # Completion goes ahead of queued input and is never dropped
+        self.postTaskEvent(task, cmTaskDone, PRIORITY_HIGH)
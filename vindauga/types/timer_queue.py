@@ -1,11 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import time
-
-from typing import Callable
-
 from dataclasses import dataclass
+import heapq
+import itertools
+from typing import Callable
 
 from vindauga.utilities.platform.system_interface import systemInterface
 
@@ -18,78 +17,119 @@ def systemTimeMs():
     return systemInterface.getTickCount() * (1000 / systemInterface.TICKS_PER_SECOND)
 
 
-@dataclass
+@dataclass(eq=False)
 class Timer:
+    """
+    A timer handle.  It doubles as the cancellation token: `killTimer()`
+    just marks it inactive and the queue drops it when it comes up.
+    """
     expiresAt: int = 0
     period: int = 0
-    collectId = []
+    active: bool = True
+    # In the queue's heap (not while it is being fired)
+    queued: bool = False
 
 
 class TimerQueue:
+    """
+    Timers ordered by expiry in a binary heap, so setting one is O(log n),
+    killing one is O(1), and finding the next expiry is O(1).
+
+    Every timer that is due when `collectExpiredTimers()` runs fires in that
+    one pass, and a periodic timer fires at most once per pass however many
+    periods have gone by.
+    """
+    # Rebuild the heap once more than this share of it is killed timers
+    CANCELLED_RATIO = 0.5
+
     def __init__(self, getTimeMs: Callable | None = None):
         if getTimeMs is None:
             self.getTimeMs = systemTimeMs
         else:
             self.getTimeMs = getTimeMs
-        self.timers = []
+        # (expiresAt, sequence, timer); the sequence keeps equal expiries in order
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
 
-    def __del__(self):
-        for timer in self.timers:
-            del timer
-        self.timers = []
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    @property
+    def timers(self) -> list[Timer]:
+        """
+        The active timers, soonest first.
+        """
+        return [timer for _expiresAt, _sequence, timer in sorted(self._heap) if timer.active]
 
     def setTimer(self, timeoutMs: int, periodMs: int) -> Timer:
         timer = Timer()
         timer.expiresAt = self.getTimeMs() + timeoutMs
         timer.period = periodMs
-        self.timers.append(timer)
+        self.__push(timer)
         return timer
 
     def killTimer(self, timer: Timer) -> None:
-        if timer in self.timers:
-            self.timers.remove(timer)
+        if not timer.active:
+            return
+        timer.active = False
+        if not timer.queued:
+            return
+        self._cancelled += 1
+        if self._cancelled > len(self._heap) * self.CANCELLED_RATIO:
+            for _expiresAt, _sequence, killed in self._heap:
+                killed.queued = killed.active
+            self._heap = [entry for entry in self._heap if entry[2].active]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
 
     @staticmethod
     def calcNextExpiresAt(expiresAt, now, period) -> int:
-        return (1 + (now - expiresAt + period) / period) * period + expiresAt - period
+        return (1 + (now - expiresAt + period) // period) * period + expiresAt - period
 
     def collectExpiredTimers(self, callback: Callable, *callbackArgs):
-        collectId = time.time_ns()
         # Must use the same clock that setTimer()/timeUntilNextTimeout() use
         # for expiresAt (self.getTimeMs(), tick-based) -- comparing against
         # time.time() (wall-clock epoch seconds) made every timer appear
         # already expired the instant it was created.
         now = self.getTimeMs()
 
-        removals = []
-        for timer in self.timers:
-            if timer.collectId or now < timer.expiresAt:
+        # Take everything that is due first, so timers set or rescheduled by
+        # the callbacks wait for the next pass
+        expired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            timer.queued = False
+            if timer.active:
+                expired.append(timer)
+            else:
+                self._cancelled -= 1
+
+        for timer in expired:
+            if not timer.active:
+                # Killed by an earlier callback in this pass
                 continue
             if timer.period > 0:
                 # Recurring timer: reschedule for the next period.
-                timer.collectId = collectId
                 timer.expiresAt = TimerQueue.calcNextExpiresAt(timer.expiresAt, now, timer.period)
+                self.__push(timer)
             else:
-                # One-shot timer (period <= 0): fire once, then remove it.
-                # `period >= 0` here previously treated a one-shot timer
-                # (period == 0) as recurring without ever advancing its
-                # expiresAt, so it fired again on every subsequent idle
-                # cycle forever instead of firing once.
-                removals.append(timer)
+                # One-shot timer (period <= 0): fire once, then forget it.
+                timer.active = False
             callback(timer, *callbackArgs)
 
-        for timer in removals:
-            self.timers.remove(timer)
-            del timer
-
-        for timer in self.timers:
-            if timer.collectId == collectId:
-                timer.collectId = 0
-
     def timeUntilNextTimeout(self) -> int:
-        if not self.timers:
+        heap = self._heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)[2].queued = False
+            self._cancelled -= 1
+        if not heap:
             return -1
 
         now = self.getTimeMs()
-        nextExpiry = min(t.expiresAt for t in self.timers)
-        return max(0, nextExpiry - now)
+        return max(0, heap[0][0] - now)
+
+    def __push(self, timer: Timer):
+        timer.queued = True
+        heapq.heappush(self._heap, (timer.expiresAt, next(self._sequence), timer))
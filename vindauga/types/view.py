@@ -1,12 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import copy
-import itertools
 import logging
 import sys
-from typing import List, Optional, Set, Union
-
-import wcwidth
+from typing import Optional, Set, Union
 
 from vindauga.constants.command_codes import (cmClose, cmNext, cmPrev, cmZoom, cmResize, cmReleasedFocus, cmCancel,
                                               cmReceivedFocus,
@@ -20,7 +16,7 @@ from vindauga.constants.keys import (kbLeft, kbRight, kbUp, kbDown, kbCtrlLeft,
                                      kbPgUp, kbPgDn, kbEsc, kbEnter)
 from vindauga.constants.option_flags import ofSelectable, ofTopSelect, ofFirstClick, ofValidate
 from vindauga.constants.state_flags import (sfVisible, sfCursorVis, sfCursorIns, sfShadow, sfSelected,
-                                            sfFocused, sfDragging, sfDisabled, sfModal, sfExposed)
+                                            sfFocused, sfDragging, sfDisabled, sfModal, sfExposed, sfActive)
 from vindauga.events.event import Event
 from vindauga.utilities.message import message
 from vindauga.utilities.math_utils import clamp
@@ -29,7 +25,8 @@ from vindauga.utilities.colours.colour_attribute import ColourAttribute, reverse
 from vindauga.utilities.colours.attribute_pair import AttributePair
 from vindauga.utilities.colours.style_mask import StyleMask
 from vindauga.utilities.platform.system_interface import systemInterface
-from vindauga.utilities.screen.screen_cell import ScreenCell, set_cell, set_attr
+from vindauga.utilities.screen.cell_buffer import CellBuffer
+from vindauga.utilities.text.text import Text
 
 from .command_set import CommandSet
 from .cursor import Cursor
@@ -54,28 +51,6 @@ def initCommands() -> CommandSet:
     return temp
 
 
-class TargetContext:
-    def __init__(self, context=None):
-        self.target = None
-        self.offset = 0
-        self.y = 0
-        self.__saved = []
-        if context:
-            self.restore(context)
-
-    def restore(self, context):
-        self.y = context.y
-        self.offset = context.offset
-        self.target = context.target
-
-    def __enter__(self):
-        self.__saved.append(TargetContext(self))
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.restore(self.__saved.pop())
-
-
 class View(VindaugaObject):
     """
      The base of all visible objects.
@@ -101,6 +76,10 @@ class View(VindaugaObject):
     commandSetChanged = False
     showMarkers = False
     errorAttr = 0x4F  # 0xCF
+    # Bumped by `resetColorCache()`; views drop their resolved colours when it moves
+    colorGeneration = 0
+    # Views awaiting a redraw from `drawInvalidated()`, by id: (view, local rect)
+    damaged: dict[int, tuple[View, Rect]] = {}
 
     MOVE_COMMANDS: dict[int, Point] = {kbLeft: Point(-1, 0),
                                        kbRight: Point(1, 0),
@@ -124,9 +103,11 @@ class View(VindaugaObject):
         self.size = Point()
         self.cursor = Point()
         self.setBounds(bounds)
-        self.context = TargetContext()
         self.savedBuffer = None
         self.children = []
+        self._colorCache: dict[int, ColourAttribute] = {}
+        self._pairCache: dict[int, AttributePair] = {}
+        self._colorCacheGeneration = View.colorGeneration
 
     @property
     def next(self) -> View:
@@ -463,6 +444,8 @@ class View(VindaugaObject):
         """
         self.origin = Point(bounds.topLeft.x, bounds.topLeft.y)
         self.size = bounds.bottomRight - bounds.topLeft
+        if self.owner:
+            self.owner.resetSpans()
 
     def getHelpCtx(self) -> int:
         """
@@ -553,57 +536,103 @@ class View(VindaugaObject):
             self.draw()
             self.drawCursor()
 
-    def exposedChildren(self, left: int, right: int, siblings: List[View], context: TargetContext):
-        for i, child in enumerate(siblings):
-            if child is context.target:
-                return self.exposedParent(left, right, child.owner)
+    def invalidate(self, rect: Optional[Rect] = None):
+        """
+        Marks `rect` (in local coordinates, the whole view by default) as
+        needing to be redrawn, without drawing anything yet.
+
+        Damage collects until `drawInvalidated()` runs, once per frame from
+        `Program.getEvent()`, so a view invalidated many times between frames
+        is drawn once. Use it in place of `drawView()` for updates that can
+        arrive faster than the screen is refreshed.
 
-            if (not (child.state & sfVisible)) or context.y < child.origin.y:
-                continue
+        :param rect: Area to redraw
+        """
+        if rect is None:
+            rect = self.getExtent()
+        else:
+            rect = rect.copy()
+            rect.intersect(self.getExtent())
+            if rect.isEmpty():
+                return
 
-            if context.y < child.origin.y + child.size.y:
-                if left < child.origin.x:
-                    if right <= child.origin.x:
-                        continue
-                    if right > child.origin.x + child.size.x:
-                        _siblings = siblings[i + 1:]
-                        if self.exposedChildren(left, child.origin.x, _siblings, context):
-                            return True
-                        left = child.origin.x + child.size.x
-                    else:
-                        right = child.origin.x
-                else:
-                    if left < child.origin.x + child.size.x:
-                        left = child.origin.x + child.size.x
-                    if left >= right:
-                        return False
+        damaged = View.damaged.get(id(self))
+        if damaged:
+            damaged[1].union(rect)
+        else:
+            View.damaged[id(self)] = (self, rect)
 
-    def exposedParent(self, left: int, right: int, child: View):
+    @staticmethod
+    def drawInvalidated():
+        """
+        Redraws every view passed to `invalidate()` since the last call.
+        Views whose damage is covered by a damaged owner are left for the
+        owner's redraw.
+        """
+        if not View.damaged:
+            return
+        damaged = View.damaged
+        View.damaged = {}
+
+        for view, rect in damaged.values():
+            if not View.__coveredByOwner(view, rect, damaged):
+                view.drawView()
+
+    @staticmethod
+    def __coveredByOwner(view: View, rect: Rect, damaged: dict) -> bool:
+        r = rect.copy()
+        while view.owner:
+            r.move(view.origin.x, view.origin.y)
+            view = view.owner
+            owner = damaged.get(id(view))
+            if owner:
+                covered = owner[1].copy()
+                covered.union(r)
+                if covered == owner[1]:
+                    return True
+        return False
+
+    def exposedChildren(self, left: int, right: int, y: int, child: View) -> bool:
+        """
+        Whether any of the columns `left` to `right` of row `y` in the owner of
+        `child` belong to `child` (see `Group.rowSpans()`) and can be seen.
+        """
+        for start, end, view, _shadowed in child.owner.rowSpans(y):
+            if end <= left:
+                continue
+            if start >= right:
+                break
+            if view is child and self.exposedParent(max(start, left), min(end, right), child.owner, y):
+                return True
+        return False
+
+    def exposedParent(self, left: int, right: int, child: View, y: int) -> bool:
+        """
+        Whether any of the columns `left` to `right` of row `y` of `child`
+        (in its own coordinates) can be seen.
+        """
         if not (child.state & sfVisible):
             return False
 
         if (not child.owner) or child.owner.buffer:
             return True
 
-        with self.context as context:
-            context.y += child.origin.y
+        y += child.origin.y
+        left += child.origin.x
+        right += child.origin.x
 
-            left += child.origin.x
-            right += child.origin.x
-            context.target = child
-
-            group = child.owner
-            # Is my parent overlapping me?
-            if not group.clip.topLeft.y <= context.y < group.clip.bottomRight.y:
-                return False
+        group = child.owner
+        # Is my parent overlapping me?
+        if not group.clip.topLeft.y <= y < group.clip.bottomRight.y:
+            return False
 
-            left = max(left, group.clip.topLeft.x)
-            right = min(right, group.clip.bottomRight.x)
+        left = max(left, group.clip.topLeft.x)
+        right = min(right, group.clip.bottomRight.x)
 
-            if left >= right:
-                return False
+        if left >= right:
+            return False
 
-            return self.exposedChildren(left, right, group.children, context)
+        return self.exposedChildren(left, right, y, child)
 
     def exposed(self) -> bool:
         """
@@ -621,7 +650,7 @@ class View(VindaugaObject):
         if (not (self.state & sfExposed)) or self.size.x <= 0 or self.size.y <= 0:
             return False
 
-        return any(self.exposedParent(0, self.size.x, self) for self.context.y in range(self.size.y))
+        return any(self.exposedParent(0, self.size.x, self, y) for y in range(self.size.y))
 
     def focus(self) -> bool:
         """
@@ -913,6 +942,12 @@ class View(VindaugaObject):
         :param color: Color to map
         :return: Color pair
         """
+        if self._colorCacheGeneration != View.colorGeneration:
+            self.__dropColorCache()
+        pair = self._pairCache.get(color)
+        if pair is not None:
+            return pair
+
         # Extract high byte (highlight attribute) and low byte (normal attribute)
         high_index = (color >> 8) & 0xFF
         low_index = color & 0xFF
@@ -922,7 +957,8 @@ class View(VindaugaObject):
         low_attr = self.mapColor(low_index)
 
         # Create AttributePair with mapped colors
-        return AttributePair(pair=(low_attr, high_attr))
+        pair = self._pairCache[color] = AttributePair(pair=(low_attr, high_attr))
+        return pair
 
     def getPalette(self) -> Palette:
         """
@@ -951,9 +987,20 @@ class View(VindaugaObject):
         If `color` is invalid (for example, out of range) for any of the
         palettes encountered in the chain, `mapColor()` returns `errorAttr`.
 
+        Results are cached per view until `resetColorCache()` is called, so
+        the returned attribute is shared and must not be modified.
+
         :param index: Color to map
         :return: Color
         """
+        if self._colorCacheGeneration != View.colorGeneration:
+            self.__dropColorCache()
+        color = self._colorCache.get(index)
+        if color is None:
+            color = self._colorCache[index] = self.__mapColor(index)
+        return color
+
+    def __mapColor(self, index: int) -> ColourAttribute:
         palette = self.getPalette()
 
         if len(palette):
@@ -998,6 +1045,20 @@ class View(VindaugaObject):
         elif self.owner:
             self.owner.setCurrent(self, self.normalSelect)
 
+    @staticmethod
+    def resetColorCache():
+        """
+        Forget the colours resolved by `mapColor()` and `getColor()` in every
+        view. Called whenever a palette, the owner chain or the active state
+        changes, as any of those can change how an index maps.
+        """
+        View.colorGeneration += 1
+
+    def __dropColorCache(self):
+        self._colorCache = {}
+        self._pairCache = {}
+        self._colorCacheGeneration = View.colorGeneration
+
     def setState(self, state: int, enable: bool):
         """
         Sets or clears a state flag in the `state` data member.
@@ -1022,9 +1083,15 @@ class View(VindaugaObject):
         else:
             self.state &= ~state
 
+        if state & sfActive:
+            self.resetColorCache()
+
         if not self.owner:
             return
 
+        if state & (sfVisible | sfShadow):
+            self.owner.resetSpans()
+
         if state == sfVisible:
             if self.owner.state & sfExposed:
                 self.setState(sfExposed, enable)
@@ -1173,6 +1240,7 @@ class View(VindaugaObject):
                 while lastView is not None and lastView is not self:
                     lastView = lastView.nextView()
                 self.state &= ~sfVisible
+                self.owner.resetSpans()
 
                 if lastView is target:
                     self.drawHide(target)
@@ -1180,6 +1248,7 @@ class View(VindaugaObject):
                 self.owner.removeView(self)
                 self.owner.insertView(self, target)
                 self.state |= sfVisible
+                self.owner.resetSpans()
 
                 if lastView is not target:
                     self.drawShow(lastView)
@@ -1218,9 +1287,8 @@ class View(VindaugaObject):
         if count <= 0:
             return
 
-        cell = ScreenCell()
-        set_cell(cell, chr(c), self.mapColor(color))
-        buf = [cell] * count
+        buf = CellBuffer(count)
+        buf.fill(0, count, chr(c), self.mapColor(color))
         self.__writeView(x, x + count, y, buf)
 
     def writeLine(self, x: int, y: int, w: int, h: int, buf):
@@ -1257,11 +1325,11 @@ class View(VindaugaObject):
         if not text:
             return
 
-        textLen = wcwidth.wcswidth(text)
+        textLen = Text.width(text)
         attr = self.mapColor(color)
-        buf = [ScreenCell() for _ in range(textLen)]
-        for b, s in zip(buf, text):
-            set_cell(b, s, attr)
+        buf = CellBuffer(textLen)
+        buf.fill_attr(0, textLen, attr)
+        Text.draw_str(buf, text, 0, 0, attr)
         self.__writeView(x, x + textLen, y, buf)
 
     def at(self, index: int) -> View:
@@ -1292,94 +1360,50 @@ class View(VindaugaObject):
             size += delta
         return point, size
 
-    def __writeChildrenViewRec(self, left: int, right: int, children: List[View], shadowCounter: int,
-                               context: TargetContext):
-        for i, view in enumerate(children):
-            if view is context.target:
-                if view.owner.buffer:
-                    if not shadowCounter:
-                        self.__paintWithoutShadow(context, view, left, right)
-                    else:  # Paint with shadow
-                        self.__paintWithShadow(context, view, left, right)
-
-                if not view.owner.lockFlag:
-                    self.__writeViewRec2(left, right, view.owner, shadowCounter)
-                return
-
-            if (not (view.state & sfVisible)) or context.y < view.origin.y:
+    def __writeChildrenViewRec(self, left: int, right: int, y: int, offset: int, view: View, shadowed: bool):
+        group = view.owner
+        for start, end, top, shade in group.rowSpans(y):
+            if end <= left:
+                continue
+            if start >= right:
+                break
+            if top is not view:
                 continue
 
-            if context.y < view.origin.y + view.size.y:
-                if left < view.origin.x:
-                    if right <= view.origin.x:
-                        continue
-                    _children = children[i + 1:]
-                    self.__writeChildrenViewRec(left, view.origin.x, _children, shadowCounter, context)
-                    left = view.origin.x
-
-                if right <= view.origin.x + view.size.x:
-                    return
-
-                if left < view.origin.x + view.size.x:
-                    left = view.origin.x + view.size.x
-
-                if (view.state & sfShadow) and (context.y >= view.origin.y + SHADOW_SIZE.y):
-                    if left < view.origin.x + view.size.x + SHADOW_SIZE.x:
-                        shadowCounter += 1
-                        if right > view.origin.x + view.size.x + SHADOW_SIZE.x:
-                            _children = children[i + 1:]
-                            self.__writeChildrenViewRec(left, view.origin.x + view.size.x + SHADOW_SIZE.x, _children,
-                                                        shadowCounter, context)
-                            left = view.origin.x + view.size.x + SHADOW_SIZE.x
-                            shadowCounter -= 1
-                        continue
-                else:
-                    continue
-
-            if (view.state & sfShadow) and (context.y < view.origin.y + view.size.y + SHADOW_SIZE.y):
-                if left < view.origin.x + SHADOW_SIZE.x:
-                    if right <= view.origin.x + SHADOW_SIZE.x:
-                        continue
-                    _children = children[i + 1:]
-                    self.__writeChildrenViewRec(left, view.origin.x + SHADOW_SIZE.x, _children, shadowCounter, context)
-                    left = view.origin.x + SHADOW_SIZE.x
-
-                if left >= view.origin.x + SHADOW_SIZE.x + view.size.x:
-                    continue
-
-                shadowCounter += 1
+            spanLeft = max(start, left)
+            spanRight = min(end, right)
+            shade = shadowed or shade
+            if group.buffer:
+                if not shade:
+                    self.__paintWithoutShadow(view, y, offset, spanLeft, spanRight)
+                else:  # Paint with shadow
+                    self.__paintWithShadow(view, y, offset, spanLeft, spanRight)
 
-                if right > view.origin.x + view.size.x + SHADOW_SIZE.x:
-                    _children = children[i + 1:]
-                    self.__writeChildrenViewRec(left, view.origin.x + view.size.x + SHADOW_SIZE.x, _children,
-                                                shadowCounter, context)
-                    left = view.origin.x + view.size.x + SHADOW_SIZE.x
-                    shadowCounter -= 1
+            if not group.lockFlag:
+                self.__writeViewRec2(spanLeft, spanRight, y, offset, group, shade)
 
-    def __writeViewRec2(self, left: int, right: int, view: View, shadowCounter: int):
+    def __writeViewRec2(self, left: int, right: int, y: int, offset: int, view: View, shadowed: bool) -> bool:
         if not (view.state & sfVisible) or not view.owner:
             return False
 
-        with self.context as context:
-            context.y += view.origin.y
-            left += view.origin.x
-            right += view.origin.x
-            context.offset += view.origin.x
-            context.target = view
+        y += view.origin.y
+        left += view.origin.x
+        right += view.origin.x
+        offset += view.origin.x
 
-            group = view.owner
+        group = view.owner
 
-            if not (group.clip.topLeft.y <= context.y < group.clip.bottomRight.y):
-                return False
+        if not (group.clip.topLeft.y <= y < group.clip.bottomRight.y):
+            return False
 
-            left = max(left, group.clip.topLeft.x)
-            right = min(right, group.clip.bottomRight.x)
+        left = max(left, group.clip.topLeft.x)
+        right = min(right, group.clip.bottomRight.x)
 
-            if left >= right:
-                return False
+        if left >= right:
+            return False
 
-            self.__writeChildrenViewRec(left, right, group.children, shadowCounter, context)
-            return True
+        self.__writeChildrenViewRec(left, right, y, offset, view, shadowed)
+        return True
 
     def __writeView(self, left: int, right: int, y: int, buf):
 
@@ -1392,13 +1416,9 @@ class View(VindaugaObject):
         if left >= right:
             return
 
-        with self.context as context:
-            context.offset = left
-            context.y = y
-
-            self.savedBuffer = buf
-            if self.__writeViewRec2(left, right, self, 0):
-                self.doRefresh()
+        self.savedBuffer = CellBuffer.as_cells(buf)
+        if self.__writeViewRec2(left, right, y, left, self, False):
+            self.doRefresh()
 
     def __moveGrow(self, point: Point, size: Point, limits: Rect, minSize: Point, maxSize: Point, mode: int):
         size.x = min(max(size.x, minSize.x), maxSize.x)
@@ -1422,38 +1442,32 @@ class View(VindaugaObject):
         r = Rect(point.x, point.y, point.x + size.x, point.y + size.y)
         self.locate(r)
 
-    def __paintWithoutShadow(self, context, view: View, left: int, right: int):
+    def __paintWithoutShadow(self, view: View, y: int, offset: int, left: int, right: int):
         width = right - left
         pOwner = view.owner
-        offset = context.offset
         soff = left - offset
+        src = self.savedBuffer
         if pOwner.buffer is Screen.screen.screenBuffer:
             # Write something to the screen.
-            systemInterface.screenWrite(left, context.y, self.savedBuffer[soff: soff + width], width)
+            systemInterface.screenWrite(left, y, src[soff: soff + width], width)
 
-        poff = pOwner.size.x * context.y + left
-        # Use individual assignments instead of slice assignment to avoid buffer size corruption
-        for i in range(width):
-            if poff + i < len(pOwner.buffer) and soff + i < len(self.savedBuffer):
-                pOwner.buffer[poff + i] = copy.deepcopy(self.savedBuffer[soff + i])
+        poff = pOwner.size.x * y + left
+        # `copy_from` clips to both buffers, so a short saved buffer can't grow the owner
+        pOwner.buffer.copy_from(poff, src, soff, width)
 
-    def __paintWithShadow(self, context, view: View, left: int, right: int):
+    def __paintWithShadow(self, view: View, y: int, offset: int, left: int, right: int):
         width = right - left
-        dst1 = view.owner.size.x * context.y + left
-        start = left - context.offset
-        src = itertools.islice(self.savedBuffer, start, start + width)
-        for offset, d in enumerate(src):
-            # Create shadow cell - keep character, set shadow attribute
-            shadow_cell: ScreenCell = copy.deepcopy(d)
-            # special handling for the wallpaper character...
-            if shadow_cell.char == '▄':
-                shadow_cell.char = '▒'
-
-            set_attr(shadow_cell, SHADOW_ATTR)
-            d = shadow_cell
-            if view.owner.buffer is Screen.screen.screenBuffer:
-                systemInterface.screenWrite(offset + left, context.y, [d], 1)
-            view.owner.buffer[dst1 + offset] = d
+        pOwner = view.owner
+        dst = pOwner.size.x * y + left
+        start = left - offset
+        # Shade the span in the owner buffer: keep the characters, set the
+        # shadow attribute.
+        count = pOwner.buffer.copy_from(dst, self.savedBuffer, start, width)
+        # special handling for the wallpaper character...
+        pOwner.buffer.replace_char(dst, count, '▄', '▒')
+        pOwner.buffer.fill_attr(dst, count, SHADOW_ATTR)
+        if pOwner.buffer is Screen.screen.screenBuffer:
+            systemInterface.screenWrite(left, y, pOwner.buffer[dst: dst + count], count)
 
     def __handleMouseDownDrag(self, event: Event, mode: int, limits: Rect, minSize: Point, maxSize: Point):
         """
@@ -1480,11 +1494,11 @@ class View(VindaugaObject):
             while working:
                 # Calculate new size based on current mouse position and initial offset
                 newSize = event.mouse.where + point
-                self.__moveGrow(self.origin, newSize, limits, minSize, maxSize, mode)
+                self.__moveGrow(Point(self.origin.x, self.origin.y), newSize, limits, minSize, maxSize, mode)
                 working = self.mouseEvent(event, evMouseMove)
             # Grow to the mouse-up
             newSize = event.mouse.where + point
-            self.__moveGrow(self.origin, newSize, limits, minSize, maxSize, mode)
+            self.__moveGrow(Point(self.origin.x, self.origin.y), newSize, limits, minSize, maxSize, mode)
 
     def __handleKeyDownDrag(self, event: Event, mode: int, limits: Rect, minSize: Point, maxSize: Point):
         """
@@ -1493,8 +1507,9 @@ class View(VindaugaObject):
         saveBounds = self.getBounds()
         done = False
         while not done:
-            point = self.origin
-            size = self.size
+            # Copies, so the view isn't moved before `locate()` sees the change
+            point = Point(self.origin.x, self.origin.y)
+            size = Point(self.size.x, self.size.y)
             self.keyEvent(event)
             kd = event.keyDown
             ckState = kd.controlKeyState
@@ -13,59 +13,108 @@ from .style_mask import StyleMask
 logger = logging.getLogger(__name__)
 
 
+COLOUR_MASK = 0xFFFFFFFF
+# Interned attributes are kept up to this many; beyond it (e.g. an RGB
+# gradient) `from_packed()` hands out private instances instead.
+INTERN_LIMIT = 4096
+
+
 class ColourAttribute:
-    __slots__ = ('_style', '_fg', '_bg')
+    """
+    A foreground/background/style triple, held as one packed integer
+    `fg | bg << 32 | style << 64` so comparing and hashing attributes are
+    single int operations.
+
+    `from_bios()` and `from_packed()` return shared (interned) instances,
+    which raise `TypeError` if changed: build a new attribute instead, as
+    `reverse_attribute()` and `|=` do.  Instances made any other way (e.g.
+    `from_colour_attribute()`) are private and may be changed in place.
+    """
+    __slots__ = ('_value',)
+
+    _interned: dict[int, ColourAttribute] = {}
+    _bios: list[ColourAttribute | None] = [None] * 256
 
     def __init__(self, bios: int | None = None):
-        self._style: StyleMask = StyleMask.NONE
-        self._fg: int = 0
-        self._bg: int = 0
+        self._value: int = 0
 
     def __repr__(self):
         return f'<ColourAttribute: fg={self._fg:08x}, bg={self._bg:08x}, style={self._style:08x}>'
 
+    @property
+    def packed(self) -> int:
+        return self._value
+
+    @property
+    def _fg(self) -> int:
+        return self._value & COLOUR_MASK
+
+    @_fg.setter
+    def _fg(self, fg: int):
+        self.__checkPrivate()
+        self._value = (self._value & ~COLOUR_MASK) | (fg & COLOUR_MASK)
+
+    @property
+    def _bg(self) -> int:
+        return (self._value >> 32) & COLOUR_MASK
+
+    @_bg.setter
+    def _bg(self, bg: int):
+        self.__checkPrivate()
+        self._value = (self._value & ~(COLOUR_MASK << 32)) | ((bg & COLOUR_MASK) << 32)
+
+    @property
+    def _style(self) -> StyleMask:
+        return StyleMask(self._value >> 64)
+
+    @_style.setter
+    def _style(self, style: StyleMask | int):
+        self.__checkPrivate()
+        self._value = (self._value & ((1 << 64) - 1)) | (int(style) << 64)
+
+    def __checkPrivate(self):
+        if ColourAttribute._interned.get(self._value) is self:
+            raise TypeError(f'{self!r} is shared and can\'t be changed; make a new attribute instead')
+
+    @classmethod
+    def from_packed(cls, value: int, intern: bool = False) -> ColourAttribute:
+        """
+        The interned attribute with packed value `value`.  Once there are
+        `INTERN_LIMIT` of them a private one is returned, unless `intern`.
+        """
+        attr = cls._interned.get(value)
+        if attr is None:
+            attr = cls()
+            attr._value = value
+            if intern or len(cls._interned) < INTERN_LIMIT:
+                cls._interned[value] = attr
+        return attr
+
     @classmethod
     def from_bios(cls, bios: ColourBIOS | int) -> ColourAttribute:
         if isinstance(bios, cls):
             return bios  # Already ColourAttribute
         elif isinstance(bios, AttributePair):
             return bios.attrs[0]  # Use first (normal) attribute
-        elif isinstance(bios, int):
-            bios_int = bios
-        else:
-            bios_int = int(bios)
-        attr = cls()
-        attr._style = StyleMask.NONE  # BIOS format doesn't include style
-        
-        fg_value = bios_int & 0x0F
-        bg_value = (bios_int & 0xF0) >> 4
-        
-        # Create DesiredColour directly from color indices (0-15)
-        fg_desired = DesiredColour()
-        fg_desired._data = (fg_value & 0xF) | (ColourType.BIOS << 24)
-        
-        bg_desired = DesiredColour()
-        bg_desired._data = (bg_value & 0xF) | (ColourType.BIOS << 24)
-        
-        attr._fg = fg_desired.bit_cast
-        attr._bg = bg_desired.bit_cast
-        
+        bios_int = int(bios) & 0xFF
+        attr = cls._bios[bios_int]
+        if attr is None:
+            # BIOS format doesn't include style
+            fg = (bios_int & 0x0F) | (ColourType.BIOS << 24)
+            bg = (bios_int >> 4) | (ColourType.BIOS << 24)
+            attr = cls._bios[bios_int] = cls.from_packed(fg | (bg << 32), intern=True)
         return attr
 
     @classmethod
     def from_colour_attribute(cls, attributes: ColourAttribute) -> ColourAttribute:
         attr = cls()
-        attr._style = attributes._style
-        attr._fg = attributes._fg
-        attr._bg = attributes._bg
+        attr._value = attributes._value
         return attr
 
     @classmethod
     def from_desired_colors(cls, fg: DesiredColour, bg: DesiredColour, style: int | StyleMask = 0):
         c = cls()
-        c._style = StyleMask(style)
-        c._fg = fg.bit_cast
-        c._bg = bg.bit_cast
+        c._value = fg.bit_cast | (bg.bit_cast << 32) | (int(style) << 64)
         return c
 
     def is_bios(self) -> bool:
@@ -133,22 +182,16 @@ class ColourAttribute:
 
     def __eq__(self, other: ColourAttribute | int):
         if isinstance(other, ColourAttribute):
-            return self._fg == other._fg and self._bg == other._bg and self._style == other._style
-        return self == ColourAttribute.from_bios(other)
+            return self._value == other._value
+        return self._value == ColourAttribute.from_bios(other)._value
+
+    def __hash__(self):
+        return hash(self._value)
 
     def __ior__(self, other: ColourAttribute | int):
-        # It doesn't do bitwise OR, it's an assignment operation
-        if isinstance(other, ColourAttribute):
-            self._fg = other._fg
-            self._bg = other._bg
-            self._style = other._style
-        else:
-            # Handle integer operand - treat as BIOS color value and assign
-            other_attr = ColourAttribute.from_bios(other)
-            self._fg = other_attr._fg
-            self._bg = other_attr._bg
-            self._style = other_attr._style
-        return self
+        # It doesn't do bitwise OR, it's an assignment operation.  The name
+        # is rebound to `other` so shared attributes are never changed.
+        return ColourAttribute.from_bios(other)
 
     def __int__(self) -> int:
         return self.as_bios()
@@ -200,23 +243,32 @@ def _get_style(attr: AttributePair) -> StyleMask:
 
 
 def set_fore(attr: ColourAttribute, colour: DesiredColour):
+    """
+    Change the foreground of a private attribute; shared ones raise `TypeError`.
+    """
     attr._fg = colour.bit_cast
 
 
 def set_back(attr: ColourAttribute, colour: DesiredColour):
+    """
+    Change the background of a private attribute; shared ones raise `TypeError`.
+    """
     attr._bg = colour.bit_cast
 
 
 def set_style(attr: ColourAttribute, style: StyleMask | int):
+    """
+    Change the style of a private attribute; shared ones raise `TypeError`.
+    """
     attr._style = StyleMask(style)
 
 
 def reverse_attribute(attr: ColourAttribute) -> ColourAttribute:
+    """
+    The reverse of `attr`; `attr` itself is left alone.
+    """
     fg = get_fore(attr)
     bg = get_back(attr)
     if fg.is_default() or bg.is_default():
-        set_style(attr, get_style(attr) ^ StyleMask.Reverse)
-    else:
-        set_fore(attr, bg)
-        set_back(attr, fg)
-    return attr
+        return ColourAttribute.from_packed(attr._value ^ (int(StyleMask.Reverse) << 64))
+    return ColourAttribute.from_desired_colors(bg, fg, get_style(attr))
@@ -19,7 +19,7 @@ def getAltChar(keyCode: Union[str, int]) -> str:
             return '\xF0'  # Alt-Space
         elif 0x10 <= tmp <= 0x33:
             return altCodes1[tmp - 0x10]  # alt-letter
-        elif 0x78 <= tmp <= 0x84:
+        elif 0x78 <= tmp <= 0x83:
             return altCodes2[tmp - 0x78]  # alt-number
     return ''
 
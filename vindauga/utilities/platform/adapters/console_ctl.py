@@ -199,15 +199,19 @@ class ConsoleCtl(metaclass=Singleton):
             except Exception:
                 pass
 
-        def write(self, data: str) -> None:
+        def write(self, data: str) -> int:
             """
             Write to Windows console
+
+            :return: Characters written
             """
             try:
                 if data and self.cn[ACTIVE_OUTPUT].handle:  # activeOutput
                     self.cn[ACTIVE_OUTPUT].handle.WriteConsole(data)
+                    return len(data)
             except Exception:
                 pass
+            return 0
 
         def _is_valid_handle(self, handle):
             """
@@ -316,19 +320,22 @@ class ConsoleCtl(metaclass=Singleton):
                         except Exception:
                             pass
 
-        def write(self, data: str) -> None:
+        def write(self, data: str) -> int:
             """
             Write to Unix console
+
+            :return: Bytes written
             """
+            written = 0
             try:
                 if self.files and self.files[1]:
                     self.files[1].flush()
-                written = 0
                 data = data.encode('utf-8')
                 while written < len(data):
                     written += os.write(self.fds[1], data[written:])
             except Exception:
                 pass
+            return written
 
         def get_fds(self) -> tuple[int, int]:
             """
@@ -1,5 +1,13 @@
 # -*- coding: utf-8 -*-
+import logging
+import os
+
 from vindauga.types.point import Point
+from vindauga.utilities.text.text import Text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_FPS = 60
 
 
 class DisplayAdapter:
@@ -12,9 +20,53 @@ class DisplayAdapter:
     def get_font_size(self):
         return Point(0, 0)
 
+    def get_max_fps(self) -> int:
+        """
+        The most frames per second the screen should be flushed at, 0 for no
+        limit. `VINDAUGA_MAX_FPS` overrides the adapter's `default_max_fps()`.
+        """
+        fps = os.environ.get('VINDAUGA_MAX_FPS')
+        if fps is not None:
+            try:
+                return max(0, int(fps))
+            except ValueError:
+                logger.warning('Ignoring VINDAUGA_MAX_FPS=%r', fps)
+        return self.default_max_fps()
+
+    def default_max_fps(self) -> int:
+        return DEFAULT_MAX_FPS
+
     def write_cell(self, pos, text, attr, double_width=False):
         pass
 
+    def write_run(self, pos, text, attr, width):
+        """
+        Write a run of cells that share `attr`, starting at `pos` and covering
+        `width` columns.  Every cell in the run is a single code point; wide
+        characters cover two columns.  Adapters that can emit a run in one go
+        should override this, the default writes it cell by cell.
+        """
+        x = pos.x
+        for ch in text:
+            wide = Text.width(ch) > 1
+            self.write_cell(Point(x, pos.y), ch, attr, wide)
+            x += 1 + wide
+
+    def scroll_rows(self, top: int, bottom: int, count: int) -> bool:
+        """
+        Move rows `top` to `bottom` (inclusive) up by `count` lines, or down
+        if `count` is negative, blanking the lines moved in.  Adapters that
+        can't should return False, and the rows are written out instead.
+        """
+        return False
+
+    def scroll_rect(self, top: int, bottom: int, left: int, right: int, count: int) -> bool:
+        """
+        As `scroll_rows()`, moving only columns `left` to `right`. Most
+        terminals can't, so this returns False unless overridden.
+        """
+        return False
+
     def set_caret_position(self, pos):
         pass
 
@@ -24,8 +76,13 @@ class DisplayAdapter:
     def clear_screen(self):
         pass
 
-    def flush(self):
-        pass
+    def flush(self) -> int:
+        """
+        Write out everything buffered so far.
+
+        :return: Bytes written
+        """
+        return 0
 
     def resize(self, width: int, height: int):
         pass
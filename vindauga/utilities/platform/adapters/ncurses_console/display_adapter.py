@@ -4,12 +4,13 @@ from __future__ import annotations
 import atexit
 import curses
 import logging
+import os
 from typing import Optional
 
 from vindauga.utilities.singleton import Singleton
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
 from vindauga.utilities.platform.adapters.console_ctl import ConsoleCtl
-from vindauga.utilities.platform.adapters.display_adapter import DisplayAdapter
+from vindauga.utilities.platform.adapters.display_adapter import DisplayAdapter, DEFAULT_MAX_FPS
 from vindauga.utilities.platform.ansi.screen_writer import ScreenWriter
 from vindauga.utilities.platform.ansi.termcap import TermCap
 from vindauga.types.point import Point
@@ -83,6 +84,25 @@ class NcursesDisplayAdapter(DisplayAdapter, metaclass=Singleton):
         """
         self.ansi_screen_writer.write_cell(pos, text, attr, double_width)
 
+    def write_run(self, pos: Point, text: str, attr: ColourAttribute, width: int):
+        """
+        Write a run of cells sharing one attribute
+        """
+        self.ansi_screen_writer.write_run(pos, text, attr, width)
+
+    def scroll_rows(self, top: int, bottom: int, count: int) -> bool:
+        """
+        Scroll part of the screen
+        """
+        self.ansi_screen_writer.scroll_rows(top, bottom, count)
+        return True
+
+    def scroll_rect(self, top: int, bottom: int, left: int, right: int, count: int) -> bool:
+        """
+        Scroll part of the screen between left and right margins
+        """
+        return self.ansi_screen_writer.scroll_rect(top, bottom, left, right, count)
+
     def set_caret_position(self, pos: Point):
         """
         Set cursor position
@@ -95,11 +115,21 @@ class NcursesDisplayAdapter(DisplayAdapter, metaclass=Singleton):
         """
         self.ansi_screen_writer.clear_screen()
 
-    def flush(self):
+    def flush(self) -> int:
         """
         Flush output to screen
+
+        :return: Bytes written
+        """
+        return self.ansi_screen_writer.flush()
+
+    def default_max_fps(self) -> int:
+        """
+        Over SSH every frame crosses the network, so flush half as often
         """
-        self.ansi_screen_writer.flush()
+        if 'SSH_CONNECTION' in os.environ or 'SSH_TTY' in os.environ:
+            return DEFAULT_MAX_FPS // 2
+        return DEFAULT_MAX_FPS
 
     def cleanup(self):
         """
@@ -344,7 +344,7 @@ class NcursesInputAdapter(InputAdapter):
                 event.keyDown = copy.copy(FROM_CURSES_KEY_CODE[keys[0]])
         elif curses.KEY_MAX < keys[0]:
             # Use keyname() to get string representation for high keys
-            key_name = curses.keyname(keys[0])
+            key_name = curses.keyname(keys[0]).decode()
             if key_name in FROM_CURSES_HIGH_KEY:
                 event.keyDown = copy.copy(FROM_CURSES_HIGH_KEY[key_name])
 
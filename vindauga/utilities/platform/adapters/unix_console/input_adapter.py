@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+import atexit
+from collections import deque
+import curses
+import logging
+import re
+
+from vindauga.constants.event_codes import evKeyDown, evNothing
+import vindauga.constants.keys as Keys
+from vindauga.events.event import Event
+from vindauga.events.key_down_event import KeyDownEvent
+from vindauga.utilities.platform.adapters.console_ctl import ConsoleCtl
+from vindauga.utilities.platform.adapters.input_adapter import InputAdapter
+from vindauga.utilities.platform.adapters.ncurses_console.input_adapter import FROM_NON_PRINTABLE_ASCII
+from vindauga.utilities.platform.codepage.codepage_translator import CodepageTranslator
+from vindauga.utilities.platform.events.get_ch_buf import GetChBuf
+from vindauga.utilities.platform.events.input_state import InputState
+from vindauga.utilities.platform.events.parse_result import ParseResult
+from vindauga.utilities.platform.events.raw_input_getter import RawInputGetter
+from vindauga.utilities.platform.events.sys_manual_event import SysHandle
+from vindauga.utilities.platform.events.termio import term_io
+from vindauga.utilities.platform.events.utf8_handler import utf8_bytes_left
+
+logger = logging.getLogger(__name__)
+
+KEY_ESC = 0x1B
+
+# Runs of bytes that become one key event per character
+_TEXT_RUN = re.compile(rb'[^\x00-\x1f\x7f]+')
+_PASTE_RUN = re.compile(rb'[^\x1b]+')
+
+# A complete sequence for each byte that may follow ESC, so that a sequence
+# split across two reads is waited for rather than taken for Alt+key
+_SEQUENCES = {
+    ord('['): re.compile(rb'\x1b\[(?:M[\x00-\xff]{3}|[\x30-\x3f]*[\x20-\x2f]*[\x40-\x7e])'),
+    ord('O'): re.compile(rb'\x1bO[\x30-\x3f]*[\x40-\x7e]'),
+    ord(']'): re.compile(rb'\x1b\].*?(?:\x07|\x1b\\)', re.DOTALL),
+    ord('P'): re.compile(rb'\x1bP.*?(?:\x07|\x1b\\)', re.DOTALL),
+}
+
+
+def _complete_utf8(data: bytes) -> int:
+    """
+    Length of `data` without a character cut short at its end
+    """
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 != 0x80:
+            if byte & 0x80 and utf8_bytes_left(byte) >= back:
+                return len(data) - back
+            break
+    return len(data)
+
+
+class UnixConsoleInputAdapter(InputAdapter):
+    """
+    Terminal input read directly from the tty.
+
+    Whatever the terminal has sent is read in one go and parsed into a queue
+    of events, so a wakeup hands over everything that arrived with it.  The
+    byte at the read position selects the handler from a table: text and
+    pasted text are taken a run at a time (a bracketed paste run becoming a
+    single `kbPaste` event), and escape sequences are passed to `term_io`
+    with the same `ParseResult` handling as the curses adapter.
+    """
+    ESC_DELAY = 0.01
+
+    def __init__(self, console_ctl: ConsoleCtl, display, input_state: InputState, mouse_enabled: bool = True):
+        fd = console_ctl.get_input_fd()
+        super().__init__(SysHandle(fd))
+
+        self._console_ctl = console_ctl
+        self._display = display
+        self._input_state = input_state
+        self._mouse_enabled = mouse_enabled
+        self._input_getter = RawInputGetter(fd)
+        self._events: deque[Event] = deque()
+        self._translator = CodepageTranslator()
+        self._handlers = [self._text] * 256
+        for k in range(0x20):
+            self._handlers[k] = self._control
+        self._handlers[0x7F] = self._control
+        self._handlers[KEY_ESC] = self._escape
+        if fd >= 0:
+            self._initialize_input()
+        logger.info('UnixConsoleInputAdapter initialized')
+
+    def _initialize_input(self):
+        """
+        Put the terminal in raw mode and turn on mouse and paste reporting
+        """
+        try:
+            curses.raw()
+            curses.noecho()
+            curses.nonl()
+        except curses.error as e:
+            logger.error('Failed to set terminal modes: %s', e)
+        if self._mouse_enabled:
+            term_io.mouse_on(self._console_ctl)
+        term_io.bracketed_paste_on(self._console_ctl)
+        atexit.register(self._restore_console)
+
+    def _restore_console(self):
+        """
+        Restore console to normal state on exit
+        """
+        if self._mouse_enabled:
+            term_io.mouse_off(self._console_ctl)
+        term_io.bracketed_paste_off(self._console_ctl)
+        term_io.consume_unprocessed_input(self._console_ctl, self._input_getter, self._input_state)
+
+    def has_pending_events(self) -> bool:
+        """
+        Check if input events are pending
+        """
+        return bool(self._events) or len(self._input_getter) > 0
+
+    def get_event(self, event) -> bool:
+        """
+        Get next input event, reading and parsing a new batch if none is queued
+        """
+        if not self._events:
+            self.read_events()
+        if self._events:
+            event.setFrom(self._events.popleft())
+            return True
+        return False
+
+    def read_events(self) -> int:
+        """
+        Parse everything the terminal has sent so far into the event queue
+
+        :return: Number of events queued
+        """
+        getter = self._input_getter
+        if not len(getter):
+            getter.fill()
+        count = len(self._events)
+        while len(getter):
+            if self._input_state.bracketed_paste and getter.peek() != KEY_ESC:
+                self._run(_PASTE_RUN, self._put_paste)
+            else:
+                self._handlers[getter.peek()]()
+        return len(self._events) - count
+
+    def flush_input(self):
+        """
+        Drop queued events and unread input
+        """
+        self._events.clear()
+        getter = self._input_getter
+        getter.take(len(getter))
+
+    def _text(self):
+        self._run(_TEXT_RUN, self._put_text)
+
+    def _run(self, pattern, put):
+        getter = self._input_getter
+        data = getter.match(pattern).group()
+        end = len(data)
+        if end == len(getter):
+            # The rest of a character may still be on its way
+            end = _complete_utf8(data)
+            if not end and getter.fill(self.ESC_DELAY):
+                return
+        put(getter.take(end or len(data)))
+
+    def _control(self):
+        self._events.append(self._char_event(chr(self._input_getter.get())))
+
+    def _escape(self):
+        getter = self._input_getter
+        if len(getter) == 1:
+            # A lone ESC: the key itself, or the start of a sequence
+            getter.fill(self.ESC_DELAY)
+        pattern = _SEQUENCES.get(getter.peek(1))
+        while pattern and not getter.match(pattern) and getter.fill(self.ESC_DELAY):
+            pass
+
+        event = Event(evNothing)
+        buf = GetChBuf(getter)
+        result = term_io.parse_event(buf, event, self._input_state)
+        if result == ParseResult.Accepted:
+            self._events.append(event)
+            return
+        if result == ParseResult.Ignored:
+            return
+
+        buf.reject()
+        getter.get()
+        if (k := getter.peek()) == -1:
+            self._events.append(self._char_event(chr(KEY_ESC)))
+            return
+        # ESC followed by a key is Alt+key
+        size = 1 + utf8_bytes_left(k)
+        event = self._char_event(getter.take(size).decode('utf-8', errors='replace')[0])
+        event.keyDown.controlKeyState |= Keys.kbLeftAlt
+        term_io.normalize_key(event.keyDown)
+        self._events.append(event)
+
+    def _put_text(self, data: bytes):
+        self._events.extend(map(self._char_event, data.decode('utf-8', errors='replace')))
+
+    def _put_paste(self, data: bytes):
+        # The whole run goes in one event, which the event queue hands on as it is
+        key = KeyDownEvent()
+        key.controlKeyState = Keys.kbPaste
+        key.text = bytearray(data.decode('utf-8', errors='replace').encode('utf-8'))
+        key.textLength = len(key.text)
+        event = Event(evKeyDown)
+        event.keyDown = key
+        self._events.append(event)
+
+    def _char_event(self, char: str) -> Event:
+        code = ord(char)
+        if code < 0x20:
+            key = FROM_NON_PRINTABLE_ASCII[code]
+            key = KeyDownEvent.create(key.keyCode, key.controlKeyState, key.text[:key.textLength])
+        elif code == 0x7F:
+            # ^?, Delete
+            key = KeyDownEvent.create(Keys.kbBackSpace, 0)
+        else:
+            key = KeyDownEvent()
+            key.text = bytearray(char.encode('utf-8'))
+            key.textLength = len(key.text)
+            key.charScan.charCode = self._translator.from_utf8(char)
+            if key.keyCode <= Keys.kbCtrlZ:
+                key.keyCode = Keys.kbNoKey
+        if self._input_state.bracketed_paste:
+            key.controlKeyState |= Keys.kbPaste
+        event = Event(evKeyDown)
+        event.keyDown = key
+        return event
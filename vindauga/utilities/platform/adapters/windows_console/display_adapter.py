@@ -27,15 +27,19 @@ class ConsoleWrapper:
     def __init__(self, console_handle):
         self._console_handle = console_handle
 
-    def write(self, data: str):
+    def write(self, data: str) -> int:
         """
         Write data to Windows console
+
+        :return: Characters written
         """
         if self._console_handle:
             try:
                 self._console_handle.WriteConsole(data)
+                return len(data)
             except Exception as e:
                 logger.error("ConsoleWrapper.write: %s", e)
+        return 0
 
 
 ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x04
@@ -139,6 +143,15 @@ class WindowsConsoleDisplayAdapter(DisplayAdapter, metaclass=Singleton):
         except Exception as e:
             logger.error("WindowsConsoleDisplayAdapter.write_cell: %s", e)
 
+    def write_run(self, pos: Point, text: str, attr: ColourAttribute, width: int):
+        """
+        Write a run of cells sharing one attribute
+        """
+        if self._ansi_screen_writer:
+            self._ansi_screen_writer.write_run(pos, text, attr, width)
+            return
+        super().write_run(pos, text, attr, width)
+
     def set_caret_size(self, size: int):
         """
         Set cursor size
@@ -179,21 +192,24 @@ class WindowsConsoleDisplayAdapter(DisplayAdapter, metaclass=Singleton):
         except Exception as e:
             logger.error("WindowsConsoleDisplayAdapter.clear_screen: %s", e)
 
-    def flush(self):
+    def flush(self) -> int:
         """
         Flush any pending output
+
+        :return: Characters written
         """
         if self._ansi_screen_writer:
-            self._ansi_screen_writer.flush()
-        else:
-            try:
-                if self._buffer:
-                    # Write buffered text to console
-                    text = bytes(self._buffer).decode('utf-8', errors='replace')
-                    self._console_ctl.write(text)
-                    self._buffer.clear()
-            except Exception as e:
-                logger.error("WindowsConsoleDisplayAdapter.flush: %s", e)
+            return self._ansi_screen_writer.flush()
+        try:
+            if self._buffer:
+                # Write buffered text to console
+                text = bytes(self._buffer).decode('utf-8', errors='replace')
+                written = self._console_ctl.write(text)
+                self._buffer.clear()
+                return written
+        except Exception as e:
+            logger.error("WindowsConsoleDisplayAdapter.flush: %s", e)
+        return 0
 
     def _convert_to_bios_attr(self, attr) -> int:
         """
@@ -213,6 +229,24 @@ class WindowsConsoleDisplayAdapter(DisplayAdapter, metaclass=Singleton):
         except Exception:
             return 0x07
 
+    def scroll_rows(self, top: int, bottom: int, count: int) -> bool:
+        """
+        Scroll part of the screen, in ANSI mode only
+        """
+        if not self._ansi_screen_writer:
+            return False
+        self._ansi_screen_writer.scroll_rows(top, bottom, count)
+        return True
+
+    def scroll_rect(self, top: int, bottom: int, left: int, right: int, count: int) -> bool:
+        """
+        Scroll part of the screen between left and right margins, in ANSI
+        mode only
+        """
+        if not self._ansi_screen_writer:
+            return False
+        return self._ansi_screen_writer.scroll_rect(top, bottom, left, right, count)
+
     def set_caret_position(self, pos: Point):
         """
         Set caret position
@@ -137,3 +137,61 @@ def convert_attributes(attribute: ColourAttribute, last_attribute: TermAttribute
     buf += write_attributes(attr, last_attribute)
 
     return buf, attr
+
+
+class SGRCache:
+    """
+    Memoizes `convert_attributes()`.
+
+    Applications only use a few dozen distinct attributes, so the escape
+    sequence taking the terminal from one attribute to the next is cached,
+    keyed on the packed attribute integers.  Key `DEFAULT` stands for the
+    terminal's default attribute (after a reset or clear).  The cache is
+    dropped whenever the terminal capabilities change.
+    """
+    DEFAULT = -1
+
+    def __init__(self, termcap: TermCap, max_size: int = 4096):
+        self.termcap = termcap
+        self.max_size = max_size
+        self.__caps = None
+        self.__sgr: dict[tuple[int, int], str] = {}
+        self.__term: dict[int, TermAttribute] = {}
+        self.clear()
+
+    @staticmethod
+    def key(attribute: ColourAttribute | int) -> int:
+        if isinstance(attribute, int):
+            attribute = ColourAttribute.from_bios(attribute)
+        return attribute.packed
+
+    def clear(self):
+        self.__caps = (self.termcap.colours, self.termcap.quirks)
+        self.__sgr.clear()
+        self.__term.clear()
+        self.__term[self.DEFAULT] = TermAttribute(TermColour.default(), TermColour.default())
+
+    def convert(self, attribute: ColourAttribute | int, last_key: int) -> tuple[str, int]:
+        """
+        Escape sequence to switch from the attribute with key `last_key` to
+        `attribute`.  Returns the sequence and the key of `attribute`.
+        """
+        if (self.termcap.colours, self.termcap.quirks) != self.__caps:
+            self.clear()
+        key = self.key(attribute)
+        sgr = self.__sgr.get((key, last_key))
+        if sgr is None:
+            if len(self.__sgr) >= self.max_size:
+                self.clear()
+            last = self.__term_attribute(last_key)
+            sgr, self.__term[key] = convert_attributes(attribute, last, self.termcap, '')
+            self.__sgr[key, last_key] = sgr
+        return sgr, key
+
+    def __term_attribute(self, key: int) -> TermAttribute:
+        attr = self.__term.get(key)
+        if attr is None:
+            # Not seen since the last clear; rebuild it from the packed key
+            colour = ColourAttribute.from_packed(key)
+            attr = self.__term[key] = convert_attributes(colour, self.__term[self.DEFAULT], self.termcap, '')[1]
+        return attr
@@ -3,36 +3,36 @@
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
 from vindauga.types.point import Point
 
-from .attribute import TermAttribute
-from .colour import TermColour
-from .conversions import convert_attributes
+from .conversions import SGRCache
 from .termcap import TermCap
 from .writers import CSI
 
 
 class ScreenWriter:
     class Buffer:
+        """
+        Append-only output buffer.  Chunks are only joined once, on flush, so
+        the cost of a frame is linear in the number of bytes emitted.
+        """
         def __init__(self):
-            self.__capacity = 0
-            self.__data = []  # Use list of strings instead of bytearray
+            self.__data: list[str] = []
+            self.__size = 0
 
         def __len__(self):
-            return len(self.__data)
+            return self.__size
 
         @property
-        def data(self):
-            return ''.join(self.__data)  # Join to string when accessed
-
-        @data.setter
-        def data(self, data: str):
-            self.__data.clear()
-            self.__data.extend(data)  # Store as single string in list
+        def data(self) -> str:
+            return ''.join(self.__data)
 
         def clear(self):
             self.__data.clear()
+            self.__size = 0
 
         def push(self, data: str):
-            self.__data.append(data)  # Append string directly
+            if data:
+                self.__data.append(data)
+                self.__size += len(data)
 
         def reserve(self, capacity):
             pass
@@ -42,37 +42,37 @@ class ScreenWriter:
         self.__termcap = termcap
         self.__caret_pos: Point = Point(-1, -1)
         self.__con = console_ctl
-        self.__last_attribute = TermAttribute(TermColour.default(), TermColour.default())
+        self.__sgr = SGRCache(termcap)
+        self.__last_attribute = SGRCache.DEFAULT
 
     def __buf_write_CSI1(self, a: int, f: str):
-        self.__buffer.push(CSI)
-        self.__buffer.push(str(a))
-        self.__buffer.push(f)
+        self.__buffer.push(f'{CSI}{a}{f}')
 
     def __buf_write_CSI2(self, a: int, b: int, f: str):
-        self.__buffer.push(CSI)
-        self.__buffer.push(str(a))
-        self.__buffer.push(';')
-        self.__buffer.push(str(b))
-        self.__buffer.push(f)
+        self.__buffer.push(f'{CSI}{a};{b}{f}')
+
+    def __move_to(self, pos):
+        if pos.y != self.__caret_pos.y:
+            self.__buf_write_CSI2(pos.y + 1, pos.x + 1, 'H')
+        elif pos.x != self.__caret_pos.x:
+            self.__buf_write_CSI1(pos.x + 1, 'G')
+
+    def __write_attributes(self, attribute: ColourAttribute):
+        sgr, self.__last_attribute = self.__sgr.convert(attribute, self.__last_attribute)
+        self.__buffer.push(sgr)
 
     def reset(self):
         self.__buffer.push(CSI + '0m')
         self.__caret_pos = Point(-1, -1)
-        self.__last_attribute = TermAttribute(TermColour.default(), TermColour.default())
+        self.__last_attribute = SGRCache.DEFAULT
 
     def clear_screen(self):
         self.__buffer.push(CSI + '0m' + CSI + '2J')
-        self.__last_attribute = TermAttribute(TermColour.default(), TermColour.default())
+        self.__last_attribute = SGRCache.DEFAULT
 
     def write_cell(self, pos, text, attribute: ColourAttribute, double_width: bool):
-        if pos.y != self.__caret_pos.y:
-            self.__buf_write_CSI2(pos.y + 1, pos.x + 1, 'H')
-        elif pos.x != self.__caret_pos.x:
-            self.__buf_write_CSI1(pos.x + 1, 'G')
-            
-        buf, self.__last_attribute = convert_attributes(attribute, self.__last_attribute, self.__termcap, self.__buffer.data)
-        self.__buffer.data = buf  # Update buffer with new data
+        self.__move_to(pos)
+        self.__write_attributes(attribute)
         self.__buffer.push(text)
         # If the cell text has combining chars (multi-codepoint), the terminal's
         # cursor advance is unpredictable — force absolute position on next write.
@@ -81,11 +81,60 @@ class ScreenWriter:
         else:
             self.__caret_pos = Point(pos.x + 1 + int(double_width), pos.y)
 
+    def write_run(self, pos, text: str, attribute: ColourAttribute, width: int):
+        """
+        Write a run of single code point cells sharing `attribute`, covering
+        `width` columns, with one cursor move and one attribute change.
+        """
+        self.__move_to(pos)
+        self.__write_attributes(attribute)
+        self.__buffer.push(text)
+        self.__caret_pos = Point(pos.x + width, pos.y)
+
+    def scroll_rows(self, top: int, bottom: int, count: int):
+        """
+        Move rows `top` to `bottom` up by `count` lines (down if negative)
+        by deleting or inserting lines at the top of a DECSTBM scroll region.
+        """
+        self.__buffer.push(f'{CSI}{top + 1};{bottom + 1}r{CSI}{top + 1};1H')
+        if count > 0:
+            self.__buffer.push(f'{CSI}{count}M')
+        else:
+            self.__buffer.push(f'{CSI}{-count}L')
+        self.__buffer.push(CSI + 'r')
+        # Resetting the margins homes the cursor
+        self.__caret_pos = Point(-1, -1)
+
+    def scroll_rect(self, top: int, bottom: int, left: int, right: int, count: int) -> bool:
+        """
+        Move columns `left` to `right` of rows `top` to `bottom` up by
+        `count` lines (down if negative), within DECSLRM left and right
+        margins. Returns False, writing nothing, if the terminal has none.
+        """
+        if not self.__termcap.lr_margins:
+            return False
+        self.__buffer.push(f'{CSI}?69h{CSI}{top + 1};{bottom + 1}r{CSI}{left + 1};{right + 1}s'
+                           f'{CSI}{top + 1};{left + 1}H')
+        if count > 0:
+            self.__buffer.push(f'{CSI}{count}M')
+        else:
+            self.__buffer.push(f'{CSI}{-count}L')
+        # Leaving DECLRMM mode resets the left and right margins
+        self.__buffer.push(f'{CSI}r{CSI}?69l')
+        self.__caret_pos = Point(-1, -1)
+        return True
+
     def set_caret_pos(self, pos):
         self.__buf_write_CSI2(pos.y + 1, pos.x + 1, 'H')
         self.__caret_pos = Point(pos.x, pos.y)
 
-    def flush(self):
-        # Buffer data is already a string, so no need to decode
-        self.__con.write(self.__buffer.data)
-        self.__buffer.clear()
+    def flush(self) -> int:
+        written = 0
+        if self.__buffer:
+            data = self.__buffer.data
+            if self.__termcap.sync_output:
+                # The terminal shows the frame all at once
+                data = f'{CSI}?2026h{data}{CSI}?2026l'
+            written = self.__con.write(data) or 0
+            self.__buffer.clear()
+        return written
@@ -9,11 +9,20 @@ from .quirks import TerminalQuirks
 
 logger = logging.getLogger(__name__)
 
+# Terminals known to support synchronized output (DEC private mode 2026)
+SYNC_OUTPUT_TERMS = ('xterm-kitty', 'xterm-ghostty', 'foot', 'alacritty', 'wezterm', 'contour')
+SYNC_OUTPUT_PROGRAMS = ('WezTerm', 'iTerm.app', 'ghostty', 'contour')
+# Terminals known to support left and right margins (DECLRMM, DECSLRM)
+LR_MARGINS_TERMS = ('wezterm', 'contour')
+LR_MARGINS_PROGRAMS = ('WezTerm', 'iTerm.app', 'contour')
+
 
 @dataclass
 class TermCap:
     colours: TermCapColours
     quirks: TerminalQuirks
+    sync_output: bool = False
+    lr_margins: bool = False
 
     @classmethod
     def get_display_capabilities(cls, console_ctl: Any, display_adapter: Any):
@@ -37,4 +46,32 @@ class TermCap:
                 if term == 'xterm':
                     colours = TermCapColours.Indexed16
         
-        return cls(colours, quirks)
+        return cls(colours, quirks, cls.has_sync_output(term), cls.has_lr_margins(term))
+
+    @staticmethod
+    def has_sync_output(term: str | None) -> bool:
+        """
+        Whether frames can be wrapped in synchronized output. Set
+        `VINDAUGA_SYNC_OUTPUT` to 1 or 0 to override the guess.
+        """
+        setting = os.getenv('VINDAUGA_SYNC_OUTPUT')
+        if setting is not None:
+            return setting not in ('', '0')
+        if os.getenv('TERM_PROGRAM') in SYNC_OUTPUT_PROGRAMS:
+            return True
+        return bool(term) and term.startswith(SYNC_OUTPUT_TERMS)
+
+    @staticmethod
+    def has_lr_margins(term: str | None) -> bool:
+        """
+        Whether part of a row can be scrolled within left and right margins.
+        xterm itself says so through `XTERM_VERSION`, as most terminals that
+        call themselves xterm can't. Set `VINDAUGA_LR_MARGINS` to 1 or 0 to
+        override the guess.
+        """
+        setting = os.getenv('VINDAUGA_LR_MARGINS')
+        if setting is not None:
+            return setting not in ('', '0')
+        if os.getenv('XTERM_VERSION') or os.getenv('TERM_PROGRAM') in LR_MARGINS_PROGRAMS:
+            return True
+        return bool(term) and term.startswith(LR_MARGINS_TERMS)
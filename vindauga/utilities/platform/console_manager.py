@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import logging
+import os
 import platform
 import sys
 import threading
@@ -13,11 +14,11 @@ from vindauga.types.point import Point
 from .adapters.console_adapter import ConsoleAdapter
 from .adapters.console_ctl import ConsoleCtl
 from .adapters.display_adapter import DisplayAdapter
-from .display_buffer import DisplayBuffer
+from .display_buffer import DisplayBuffer, FrameStats
 from .events.event_waiter import EventWaiter
 from .events.input_state import InputState
 from .events.signal_handler import SignalHandler
-from vindauga.utilities.screen.screen_cell import ScreenCell
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -83,12 +84,17 @@ class ConsoleManager(metaclass=Singleton):
             from .adapters.ncurses_console.display_adapter import NcursesDisplayAdapter
             from .adapters.ncurses_console.input_adapter import NcursesInputAdapter
             from .adapters.unix_console.console_adapter import UnixConsoleAdapter
-            
+            from .adapters.unix_console.input_adapter import UnixConsoleInputAdapter
+
             con = ConsoleCtl.getInstance()
             input_state = InputState()
             display = NcursesDisplayAdapter.create(con)
-            curses_input = NcursesInputAdapter(con, display, input_state, True)
-            return UnixConsoleAdapter.create(con, self.display_buffer, input_state, display, curses_input)
+            # VINDAUGA_CURSES_INPUT reads keys through curses getch() instead of the tty
+            if os.environ.get('VINDAUGA_CURSES_INPUT') is not None:
+                unix_input = NcursesInputAdapter(con, display, input_state, True)
+            else:
+                unix_input = UnixConsoleInputAdapter(con, display, input_state, True)
+            return UnixConsoleAdapter.create(con, self.display_buffer, input_state, display, unix_input)
 
     def __init_and_get_char_width(self, x: int):
         # Initialize encoding and return character width
@@ -128,6 +134,16 @@ class ConsoleManager(metaclass=Singleton):
     def interrupt_event_wait(self):
         self.waiter.interrupt_event_wait()
 
+    def has_pending_events(self) -> bool:
+        return self.waiter.has_pending_events()
+
+    def get_waitable_handles(self) -> list:
+        self.__check_console()
+        return [handle for handle in self.waiter.handles if handle is not None and handle != -1]
+
+    def time_until_pending_flush_ms(self) -> int:
+        return self.display_buffer.time_until_pending_flush_ms()
+
     def get_caret_size(self):
         return min(max(self.display_buffer.caret_size, 1), 100)
 
@@ -175,7 +191,7 @@ class ConsoleManager(metaclass=Singleton):
     def set_caret_size(self, size: int):
         self.display_buffer.set_caret_size(size)
 
-    def screen_write(self, x: int, y: int, b: list[ScreenCell], length: int):
+    def screen_write(self, x: int, y: int, b: CellBuffer, length: int):
         with self.console.lock:
             self.display_buffer.screen_write(x, y, b, length)
 
@@ -183,7 +199,10 @@ class ConsoleManager(metaclass=Singleton):
         with self.console.lock:
             self.display_buffer.flush_screen(self.console.display)
 
-    def reload_screen_info(self) -> list[ScreenCell]:
+    def get_frame_stats(self) -> FrameStats:
+        return self.display_buffer.stats
+
+    def reload_screen_info(self) -> CellBuffer:
         with self.console.lock:
             return self.display_buffer.reload_screen_info(self.console.display)
 
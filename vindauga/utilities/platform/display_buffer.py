@@ -1,23 +1,34 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass
 import logging
+import math
 import time
 from platform import platform
 
 from vindauga.types.point import Point
 
-from .adapters.display_adapter import DisplayAdapter
+from .adapters.display_adapter import DisplayAdapter, DEFAULT_MAX_FPS
 from .flush_screen_algorithm import flush_screen_algorithm
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
-from vindauga.utilities.screen.screen_cell import ScreenCell
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 
 logger = logging.getLogger(__name__)
 
 
 def negate_attribute(attr: ColourAttribute) -> ColourAttribute:
-    negated = ColourAttribute.from_colour_attribute(attr)
-    negated._fg, negated._bg = attr._bg, attr._fg
-    return negated
+    style = attr.packed >> 64
+    return ColourAttribute.from_packed(attr._bg | (attr._fg << 32) | (style << 64))
+
+
+@dataclass
+class FrameStats:
+    """
+    Running totals kept by `DisplayBuffer.flush_screen()`
+    """
+    frames_flushed: int = 0
+    # Updates folded into a later frame because they came in too soon
+    frames_skipped: int = 0
+    bytes_written: int = 0
 
 
 class DisplayBuffer:
@@ -32,8 +43,8 @@ class DisplayBuffer:
         self.__screen_touched = True
         self.__caret_or_cursor_changed = False
 
-        self._buffer: list[ScreenCell] = []
-        self._flush_buffer: list[ScreenCell] = []
+        self._buffer = CellBuffer()
+        self._flush_buffer = CellBuffer()
         self._row_damage: list[DisplayBuffer.Range] = []
 
         self.__caret_position = Point(-1, -1)
@@ -43,23 +54,20 @@ class DisplayBuffer:
 
         self.__attr_under_cursor = ColourAttribute()
 
-        self.__limit_fps = True
-        self.__flush_delay = 0
-        self.__last_flush = 0
+        # Frame pacing, in `time.monotonic()` seconds
+        self.__flush_delay = 1 / DEFAULT_MAX_FPS
+        self.__next_flush = 0
         self.__pending_flush = 0
-        self.__default_fps = 60
+        self.stats = FrameStats()
 
         self.size = Point(0, 0)
         self.caret_size = -1
         self.__caret_size = -1
         self._flushLocked = False
 
-        if self.__limit_fps:
-            self.__flush_delay = (1 / 60)
-
     def free_buffer(self):
-        self._buffer.clear()
-        self._flush_buffer.clear()
+        self._buffer.resize(0)
+        self._flush_buffer.resize(0)
         self._row_damage.clear()
         self.size = Point(0, 0)
         self.__caret_position = Point(-1, -1)
@@ -67,8 +75,7 @@ class DisplayBuffer:
         self.__cursor_position = Point(-1, -1)
         self.__cursor_visible = False
         self.__attr_under_cursor = ColourAttribute()
-        self.__flush_delay = 0
-        self.__last_flush = 0
+        self.__next_flush = 0
         self.__pending_flush = 0
         self.caret_size = -1
         self.__caret_size = -1
@@ -78,10 +85,10 @@ class DisplayBuffer:
 
     def __resize_buffer(self):
         buffer_size = self.size.x * self.size.y
+        self._buffer.resize(buffer_size)
         self._buffer.clear()
-        self._buffer.extend(ScreenCell() for _ in range(buffer_size))
-        self._flush_buffer.clear()
-        self._flush_buffer.extend([None] * buffer_size)
+        self._flush_buffer.resize(buffer_size)
+        self._flush_buffer.invalidate()
         self._row_damage.clear()
         self._row_damage.extend(self.Range(65536, -65536) for _ in range(self.size.y))
 
@@ -92,16 +99,6 @@ class DisplayBuffer:
         if x + count - 1 > dam.end:
             dam.end = x + count - 1
 
-    def _validate_cell(self, cell: ScreenCell):
-        ch = cell._ch
-        # Add bounds checking - only validate if we have at least 2 characters
-        if len(ch._text) >= 2 and ch[1] == '\x00':
-            c = ch[0]
-            if c == '\x00':
-                ch[0] = ' '
-            elif c < ' ' or 0x7F <= ord(c):
-                ch.move_multi_byte_char(c)  # cp_translator.to_packed_utf8(c))
-
     def __draw_cursor(self):
         if self.__cursor_visible:
             x, y = self.__cursor_position
@@ -111,15 +108,14 @@ class DisplayBuffer:
                     logger.error("__draw_cursor: buffer index out of bounds!")
                     return
                     
-                cell = self._buffer[buffer_idx]
-                if cell._ch.is_wide_char_trail() and x > 0:
+                if self._buffer.is_trail(buffer_idx) and x > 0:
                     prev_idx = buffer_idx - 1
-                    if prev_idx >= 0 and self._buffer[prev_idx].is_wide():
-                        cell = self._buffer[prev_idx]
+                    if prev_idx >= 0 and self._buffer.is_wide(prev_idx):
+                        buffer_idx = prev_idx
                         x -= 1
-                        
-                self.__attr_under_cursor = cell.attr
-                cell.attr = negate_attribute(cell.attr)
+
+                self.__attr_under_cursor = self._buffer.get_attr(buffer_idx)
+                self._buffer.set_attr(buffer_idx, negate_attribute(self.__attr_under_cursor))
                 self.__set_dirty(x, y, 1)
 
     def __undraw_cursor(self):
@@ -127,31 +123,28 @@ class DisplayBuffer:
             x, y = self.__cursor_position
             if self.__in_bounds(x, y):
                 buffer_idx = y * self.size.x + x
-                           
-                cell = self._buffer[buffer_idx]
-                if cell._ch.is_wide_char_trail() and x > 0:
+
+                if self._buffer.is_trail(buffer_idx) and x > 0:
                     prev_idx = buffer_idx - 1
-                    if prev_idx >= 0 and self._buffer[prev_idx].is_wide():
-                        cell = self._buffer[prev_idx]
+                    if prev_idx >= 0 and self._buffer.is_wide(prev_idx):
+                        buffer_idx = prev_idx
                         x -= 1
-                        
-                cell.attr = self.__attr_under_cursor
+
+                self._buffer.set_attr(buffer_idx, self.__attr_under_cursor)
                 self.__set_dirty(x, y, 1)
 
     def __needs_flush(self) -> bool:
         return any((self.__screen_touched, self.__caret_or_cursor_changed, self.__caret_size != self.__new_caret_size))
 
     def __time_to_flush(self) -> bool:
-        if self.__limit_fps:
-            now = time.monotonic()
-            flush_time = self.__last_flush + self.__flush_delay
-            if flush_time <= now:
-                self.__last_flush = now
-                self.__pending_flush = 0
-            else:
-                self.__pending_flush = flush_time
-                return False
-        return True
+        if self.__next_flush <= time.monotonic():
+            self.__pending_flush = 0
+            return True
+        if self.__pending_flush:
+            # The frame already waiting will carry this update too
+            self.stats.frames_skipped += 1
+        self.__pending_flush = self.__next_flush
+        return False
 
     def set_caret_size(self, caret_size: int):
         self.__new_caret_size = caret_size
@@ -161,7 +154,7 @@ class DisplayBuffer:
         self.__caret_position.y = y
         self.__caret_or_cursor_changed = True
 
-    def screen_write(self, x: int, y: int, buf: list[ScreenCell], count: int):
+    def screen_write(self, x: int, y: int, buf: CellBuffer, count: int):
         if self.__in_bounds(x, y):
             # `buf` can legitimately be shorter than `count` (callers may
             # pass an already-clipped slice, e.g. near the edge of a saved
@@ -170,11 +163,8 @@ class DisplayBuffer:
             _len = min(count, self.size.x - x, len(buf))
             dst = y * self.size.x + x
 
-            if self._buffer is buf:
-                pass
-            else:
-                for i in range(_len):
-                    self._buffer[dst + i] = buf[i]
+            if self._buffer is not buf:
+                self._buffer.copy_from(dst, buf, 0, _len)
 
             self.__set_dirty(x, y, _len)
             self.__screen_touched = True
@@ -186,33 +176,47 @@ class DisplayBuffer:
 
     def redraw_screen(self, display: DisplayAdapter):
         self.__screen_touched = True
-        self.__last_flush = 0
-        self._flush_buffer.clear()
-        self._flush_buffer.extend([None] * len(self._buffer))
+        self.__next_flush = 0
+        self._flush_buffer.invalidate()
         for r in self._row_damage:
             r.begin = 0
             r.end = self.size.x - 1
         self.flush_screen(display)
 
     def flush_screen(self, display: DisplayAdapter):
-        needs_flush = self.__needs_flush()
-        time_to_flush = self.__time_to_flush()
-
-        if needs_flush and time_to_flush:
-            self.__draw_cursor()
-            flush_screen_algorithm(self, display)
-            if self.__caret_position.x != -1:
-                display.set_caret_position(self.__caret_position)
-            self.__undraw_cursor()
-            if self.__caret_size != self.__new_caret_size:
-                display.set_caret_size(self.__new_caret_size)
-            display.flush()
-            self.__screen_touched = False
-            self.__caret_or_cursor_changed = False
-            self.__caret_size = self.__new_caret_size
-
-    def reload_screen_info(self, display: DisplayAdapter) -> list[ScreenCell]:
+        """
+        Writes the damaged cells out to `display`, at most once per frame.
+
+        A call that comes in before the frame is due leaves the update
+        pending; `time_until_pending_flush_ms()` says when to call again.
+        The next frame is due a frame period after this one started, or, if
+        writing took longer than that (a slow link, a busy terminal), as long
+        after it finished as writing took, so output can't starve input.
+        """
+        if not (self.__needs_flush() and self.__time_to_flush()):
+            return
+
+        start = time.monotonic()
+        self.__draw_cursor()
+        flush_screen_algorithm(self, display)
+        if self.__caret_position.x != -1:
+            display.set_caret_position(self.__caret_position)
+        self.__undraw_cursor()
+        if self.__caret_size != self.__new_caret_size:
+            display.set_caret_size(self.__new_caret_size)
+        written = display.flush()
+        self.__screen_touched = False
+        self.__caret_or_cursor_changed = False
+        self.__caret_size = self.__new_caret_size
+
+        end = time.monotonic()
+        self.__next_flush = max(start + self.__flush_delay, end + (end - start))
+        self.stats.frames_flushed += 1
+        self.stats.bytes_written += written or 0
+
+    def reload_screen_info(self, display: DisplayAdapter) -> CellBuffer:
         self.size = display.reload_screen_info()
+        self.set_max_fps(display.get_max_fps())
         self.__caret_size = -1
         self.__resize_buffer()
         return self._buffer
@@ -228,14 +232,18 @@ class DisplayBuffer:
             self.__caret_or_cursor_changed = True
         self.__cursor_visible = visible
 
+    def set_max_fps(self, fps: int):
+        """
+        Limits flushes to `fps` frames per second; 0 removes the limit.
+        """
+        self.__flush_delay = 1 / fps if fps > 0 else 0
+        self.__next_flush = 0
+
     def time_until_pending_flush_ms(self) -> int:
         if self.__pending_flush == 0:
             return -1
-
-        now = int(time.monotonic() * 1000)
-        if self.__pending_flush < now:
-            return 0
-        return self.__pending_flush - now
+        # Round up, so the wait doesn't end just short of the frame
+        return max(0, math.ceil((self.__pending_flush - time.monotonic()) * 1000))
 
     def __len__(self):
         return len(self._buffer)
@@ -91,6 +91,13 @@ class EventWaiter:
         event.setFrom(self.__ready_event)
         self.__ready_event_present = False
 
+    @property
+    def handles(self) -> list:
+        """
+        The waitable handle of each source, wake-up handle included
+        """
+        return [source.handle for source in self.__sources]
+
     def add_source(self, source: EventSource):
         self.__sources.append(source)
         self.__poll_data.append(source.handle)
@@ -139,6 +146,12 @@ class EventWaiter:
             self.__poll_sources(-1 if timeout_ms < 0 else self.poll_delay_ms(now, end))
             now = time.monotonic()
 
+    def has_pending_events(self) -> bool:
+        """
+        True if a source has an event ready, without waiting for one
+        """
+        return self.__has_ready_event()
+
     def interrupt_event_wait(self):
         if self.__wakeup:
             self.__wakeup.signal()
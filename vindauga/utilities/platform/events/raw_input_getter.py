@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import logging
+import os
+import select
+
+from .input_getter import InputGetter
+
+logger = logging.getLogger(__name__)
+
+
+class RawInputGetter(InputGetter):
+    """
+    Input getter over a byte buffer filled straight from a file descriptor.
+
+    Everything the terminal has sent is taken in one `os.read()`, so a paste
+    or a burst of mouse reports costs one system call rather than one per
+    byte.  Consumed bytes stay in the buffer until it is compacted, which
+    makes `unget()` of what was just read a matter of moving the read
+    position back.
+    """
+    READ_SIZE = 1 << 16
+
+    def __init__(self, fd: int = -1):
+        self.fd = fd
+        self._buffer = bytearray()
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer) - self._pos
+
+    def get(self) -> int:
+        """
+        Get next byte, reading whatever has arrived if the buffer is empty
+
+        :return: The byte, or -1 if none is available
+        """
+        if self._pos == len(self._buffer) and not self.fill():
+            return -1
+        k = self._buffer[self._pos]
+        self._pos += 1
+        return k
+
+    def unget(self, key: int) -> None:
+        """
+        Push byte back
+        """
+        if self._pos and self._buffer[self._pos - 1] == key:
+            self._pos -= 1
+        else:
+            self._buffer.insert(self._pos, key)
+
+    def feed(self, data: bytes) -> None:
+        """
+        Append bytes to the buffer
+        """
+        if self._pos == len(self._buffer):
+            self._buffer.clear()
+            self._pos = 0
+        elif self._pos > self.READ_SIZE:
+            del self._buffer[:self._pos]
+            self._pos = 0
+        self._buffer += data
+
+    def fill(self, timeout: float = 0) -> int:
+        """
+        Read everything available from the file descriptor, waiting at most
+        `timeout` seconds for it to become readable
+
+        :return: Number of bytes read
+        """
+        if self.fd < 0:
+            return 0
+        try:
+            ready, _w, _x = select.select([self.fd], [], [], timeout)
+            if not ready:
+                return 0
+            data = os.read(self.fd, self.READ_SIZE)
+        except (OSError, ValueError) as e:
+            logger.error('Failed to read input: %s', e)
+            return 0
+        self.feed(data)
+        return len(data)
+
+    def peek(self, offset: int = 0) -> int:
+        """
+        Look at an unread byte without consuming it
+
+        :return: The byte, or -1 if not buffered yet
+        """
+        pos = self._pos + offset
+        if pos < len(self._buffer):
+            return self._buffer[pos]
+        return -1
+
+    def find(self, sub: bytes) -> int:
+        """
+        Offset of `sub` among the unread bytes, or -1
+        """
+        index = self._buffer.find(sub, self._pos)
+        return index - self._pos if index != -1 else -1
+
+    def match(self, pattern):
+        """
+        Match a compiled bytes pattern at the read position
+        """
+        return pattern.match(self._buffer, self._pos)
+
+    def take(self, count: int) -> bytes:
+        """
+        Consume the next `count` unread bytes
+        """
+        data = bytes(self._buffer[self._pos:self._pos + count])
+        self._pos += len(data)
+        return data
@@ -273,7 +273,8 @@ class TermIO:
         """
         read, mod = buf.get_num()
         if not read:
-            return ParseResult.Rejected
+            # No modifier, as in "\x1BOP"
+            mod = 1
         key = buf.last()
         if not self.key_from_letter(key, mod, event.keyDown):
             return ParseResult.Rejected
@@ -446,6 +447,26 @@ class TermIO:
         )
         console_ctl.write(seq)
 
+    def bracketed_paste_on(self, console_ctl: 'ConsoleCtl') -> None:
+        """
+        Enable bracketed paste on its own
+        """
+        seq = (
+            "\x1B[?2004s"  # Save bracketed paste.
+            "\x1B[?2004h"  # Enable bracketed paste.
+        )
+        console_ctl.write(seq)
+
+    def bracketed_paste_off(self, console_ctl: 'ConsoleCtl') -> None:
+        """
+        Disable bracketed paste
+        """
+        seq = (
+            "\x1B[?2004l"  # Disable bracketed paste.
+            "\x1B[?2004r"  # Restore bracketed paste.
+        )
+        console_ctl.write(seq)
+
     def parse_x10_mouse(self, buf: GetChBuf, event: Event, state: InputState) -> ParseResult:
         """
         Parse X10 mouse sequence - basic implementation
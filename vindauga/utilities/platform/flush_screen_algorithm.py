@@ -1,13 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+from collections import Counter
 import logging
 from typing import TYPE_CHECKING
 
 from vindauga.utilities.platform.adapters.display_adapter import DisplayAdapter
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
-from vindauga.utilities.screen.cell_char import CellChar
-from vindauga.utilities.screen.screen_cell import ScreenCell
+from vindauga.utilities.screen.cell_buffer import CellRef
 from vindauga.types.point import Point
 
 if TYPE_CHECKING:
@@ -16,39 +16,47 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Fewest rows worth moving with a terminal scroll rather than rewriting them
+MIN_SCROLL_ROWS = 3
+
 
 class FlushScreenAlgorithm:
     def __init__(self, display: DisplayBuffer, adapter: DisplayAdapter):
         self.display = display
         self.adapter = adapter
-        self.cell: ScreenCell = None
+        self.cell: CellRef = None
         self.damage: DisplayBuffer.Range = None
         self.x: int = 0
         self.y: int = 0
         self.row_offset: int = 0
         self.size = Point(0, 0)
+        # The pending run: consecutive cells on a row sharing one attribute
+        self.run_text: list[str] = []
+        self.run_attr: ColourAttribute = None
+        self.run_key: int = -1
+        self.run_x: int = 0
+        self.run_end: int = -1
 
-    def is_trail(self, cell: ScreenCell) -> bool:
-        return cell._ch.is_wide_char_trail()
+    def is_trail(self, cell: CellRef) -> bool:
+        return cell.is_wide_char_trail()
 
-    def is_wide(self, cell: ScreenCell) -> bool:
+    def is_wide(self, cell: CellRef) -> bool:
         return cell.is_wide()
 
-    def cell_at(self, x: int) -> ScreenCell:
+    def cell_at(self, x: int) -> CellRef:
         return self.display._buffer[self.row_offset + x]
 
     def get_cell(self):
         index = self.row_offset + self.x
         self.cell = self.display[index]
-        self.display._validate_cell(self.cell)
 
     def cell_dirty(self) -> bool:
         cell_index = self.row_offset + self.x
-        return self.cell != self.display._flush_buffer[cell_index]
+        return not self.display._buffer.cell_equal(cell_index, self.display._flush_buffer, cell_index)
 
     def commit_dirty(self):
         cell_index = self.row_offset + self.x
-        self.display._flush_buffer[cell_index] = self.cell
+        self.display._flush_buffer.copy_from(cell_index, self.display._buffer, cell_index, 1)
 
     def wide_can_overlap(self):
         return self.display._wide_overlapping
@@ -62,16 +70,41 @@ class FlushScreenAlgorithm:
             return
         self.write_cell()
 
-    def _write_cell(self, ch: CellChar, attr: ColourAttribute, wide: bool):
-        self.adapter.write_cell(Point(self.x, self.y), ch.get_text(), attr, wide)
+    def _write_cell(self, text: str, wide: bool):
+        """
+        Queue the current cell, showing `text`.  Cells that continue the
+        pending run (same row, adjacent, same attribute) are appended to it so
+        that a run costs one cursor move, one attribute change and one write.
+        """
+        key = self.cell.attr_key()
+        if self.x != self.run_end or key != self.run_key:
+            self.flush_run()
+            self.run_x = self.x
+            self.run_key = key
+            self.run_attr = self.cell.attr
+        if len(text) > 1:
+            # Combining sequences move the terminal cursor unpredictably, so
+            # they are always written on their own.
+            self.flush_run()
+            self.adapter.write_cell(Point(self.x, self.y), text, self.run_attr, wide)
+            self.run_key = -1
+            return
+        self.run_text.append(text)
+        self.run_end = self.x + 1 + wide
+
+    def flush_run(self):
+        if self.run_text:
+            self.adapter.write_run(Point(self.run_x, self.y), ''.join(self.run_text), self.run_attr,
+                                   self.run_end - self.run_x)
+            self.run_text.clear()
+        self.run_end = -1
 
     def write_cell(self):
-        self._write_cell(self.cell._ch, self.cell.attr, self.cell.is_wide())
+        # Blank cells (and NULs) go out as spaces
+        self._write_cell(self.cell.char, self.cell.is_wide())
 
     def write_space(self, *args):
-        ch: CellChar = CellChar()
-        ch.move_char(' ')
-        self._write_cell(ch, self.cell.attr, False)
+        self._write_cell(' ', False)
 
     def handle_wide_char_spill(self):
         width = int(self.cell.is_wide())
@@ -147,8 +180,80 @@ class FlushScreenAlgorithm:
         else:
             self.x -= 1
 
+    def scroll(self):
+        """
+        Find blocks of damaged rows that hold the rows last flushed, moved up
+        or down, and have the terminal move them.  The flush buffer is moved
+        the same way, so only what still differs is written afterwards.
+
+        A block spans the columns damaged on any of its rows.  Blocks narrower
+        than the screen, such as a scrolling view inside a window, can only be
+        moved by terminals with left and right margins (DECSLRM); elsewhere
+        only full-width blocks are scrolled and the rest are rewritten.
+        """
+        damage = self.display._row_damage
+        y = 0
+        while y < self.size.y:
+            top = y
+            while y < self.size.y and damage[y].begin <= damage[y].end:
+                y += 1
+            if y - top >= MIN_SCROLL_ROWS:
+                self.scroll_block(top, y)
+            y += 1
+
+    def scroll_block(self, top: int, end: int):
+        width = self.size.x
+        damage = self.display._row_damage
+        left = max(min(damage[y].begin for y in range(top, end)), 0)
+        right = min(max(damage[y].end for y in range(top, end)), width - 1)
+        cols = right - left + 1
+        buffer = self.display._buffer
+        flushed = self.display._flush_buffer
+        new = [buffer.fingerprint(y * width + left, cols) for y in range(top, end)]
+        old = [flushed.fingerprint(y * width + left, cols) for y in range(top, end)]
+
+        # Rows that appear once in the old block say how far they moved
+        where = {}
+        for i, key in enumerate(old):
+            where[key] = -1 if key in where else i
+        votes = Counter(where[key] - i for i, key in enumerate(new)
+                        if key != old[i] and where.get(key, -1) >= 0)
+        if not votes:
+            return
+        shift = votes.most_common(1)[0][0]
+
+        moved = [i for i in range(max(0, -shift), min(len(new), len(new) - shift)) if new[i] == old[i + shift]]
+        first = min(moved[0], moved[0] + shift)
+        last = max(moved[-1], moved[-1] + shift)
+        # Rows in the region that are right already but would be moved away
+        matched = set(moved)
+        lost = sum(1 for i in range(first, last + 1) if new[i] == old[i] and i not in matched)
+        if len(moved) - lost < MIN_SCROLL_ROWS - 1:
+            return
+        first += top
+        last += top
+        if cols == width:
+            if not self.adapter.scroll_rows(first, last, shift):
+                return
+        elif not self.adapter.scroll_rect(first, last, left, right, shift):
+            return
+
+        if shift > 0:
+            rows = range(first, last - shift + 1)
+            blank = range(last - shift + 1, last + 1)
+        else:
+            rows = range(last, first - shift - 1, -1)
+            blank = range(first, first - shift)
+        for y in rows:
+            flushed.copy_from(y * width + left, flushed, (y + shift) * width + left, cols)
+        for y in blank:
+            flushed[y * width + left:y * width + right + 1].invalidate()
+        for y in range(first, last + 1):
+            self.display._row_damage[y] = self.display.__class__.Range(left, right)
+
     def __call__(self):
         self.size = self.display.size
+        self.scroll()
         self.row_offset = 0
         for self.y in range(self.size.y):
             self.damage = self.display._row_damage[self.y]
@@ -174,6 +279,7 @@ class FlushScreenAlgorithm:
                     if self.is_trail(self.cell):
                         self.handle_trail()
 
+            self.flush_run()
             # Reset damage range
             self.display._row_damage[self.y] = self.display.__class__.Range(65536, -65536)
             self.row_offset += self.size.x
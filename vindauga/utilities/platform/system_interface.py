@@ -9,7 +9,8 @@ from vindauga.constants.keys import kbIns, kbInsState
 from vindauga.events.mouse_event import MouseEvent
 
 from .console_manager import ConsoleManager
-from vindauga.utilities.screen.screen_cell import ScreenCell
+from .display_buffer import FrameStats
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 
 if TYPE_CHECKING:
     from vindauga.events.event import Event
@@ -55,15 +56,15 @@ class SystemInterface:
     def clearScreen(self, w: int, h: int):
         self.__consoleManager.clear_screen()
 
-    def screenWrite(self, x: int, y: int, buf: list[ScreenCell], length: int):
+    def screenWrite(self, x: int, y: int, buf: CellBuffer, length: int):
         self.__consoleManager.screen_write(x, y, buf, length)
         if self.alwaysFlush:
             self.flushScreen()
 
-    def allocateScreenBuffer(self) -> list[ScreenCell]:
+    def allocateScreenBuffer(self) -> CellBuffer:
         return self.__consoleManager.reload_screen_info()
 
-    def freeScreenBuffer(self, _buffer: list[ScreenCell]):
+    def freeScreenBuffer(self, _buffer: CellBuffer):
         self.__consoleManager.free_screen_buffer()
 
     def getButtonCount(self) -> int:
@@ -78,6 +79,12 @@ class SystemInterface:
     def flushScreen(self):
         self.__consoleManager.flush_screen()
 
+    def getFrameStats(self) -> FrameStats:
+        """
+        Frames flushed and skipped and bytes written to the terminal so far
+        """
+        return self.__consoleManager.get_frame_stats()
+
     def setupConsole(self):
         self.__consoleManager.setup_console()
 
@@ -130,9 +137,28 @@ class SystemInterface:
             self.flushScreen()
             self.__consoleManager.wait_for_events(timeoutMs)
 
+    def hasPendingEvents(self) -> bool:
+        """
+        True if input has been read from the console but not handed out yet
+        """
+        return bool(self.__eventQ) or self.__consoleManager.has_pending_events()
+
     def interruptEventWait(self):
         self.__consoleManager.interrupt_event_wait()
 
+    def getWaitableHandles(self) -> list:
+        """
+        Handles that become readable when `waitForEvents()` would return:
+        console input, the wake-up pipe and the resize signal pipe
+        """
+        return self.__consoleManager.get_waitable_handles()
+
+    def timeUntilPendingFlushMs(self) -> int:
+        """
+        Milliseconds until a held back frame may be flushed, -1 if none is
+        """
+        return self.__consoleManager.time_until_pending_flush_ms()
+
     def setClipboardText(self, text: str):
         self.__consoleManager.set_clipboard_text(text)
 
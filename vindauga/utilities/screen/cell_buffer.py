@@ -0,0 +1,573 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from array import array
+from itertools import groupby
+from typing import Iterable, Iterator
+
+from vindauga.utilities.colours.attribute_pair import AttributePair
+from vindauga.utilities.colours.colour_attribute import ColourAttribute
+
+from .cell_char import CellFlags
+from .screen_cell import ScreenCell
+
+# Layout of a packed character slot: the code point lives in the low 21 bits
+# and the `CellFlags` live above it.  Cells whose text is more than a single
+# code point (combining sequences) set `Extended` and keep the text in a side
+# table keyed by the absolute cell index.
+CODEPOINT_MASK = 0x1FFFFF
+FLAG_SHIFT = 21
+WIDE = int(CellFlags.Wide) << FLAG_SHIFT
+TRAIL = int(CellFlags.Trail) << FLAG_SHIFT
+EXTENDED = int(CellFlags.Extended) << FLAG_SHIFT
+FLAG_MASK = WIDE | TRAIL | EXTENDED
+
+# A character slot that can never be produced by a real cell.  Used to mark
+# every cell of a buffer as "unknown" (e.g. the last-flushed screen after a
+# full redraw is requested).
+INVALID = 0xFFFFFFFF
+
+# fg | bg << 32 half of a packed `ColourAttribute`
+COLOURS_MASK = (1 << 64) - 1
+
+
+def pack_attr(attr) -> tuple[int, int]:
+    """
+    Pack a colour attribute into the (fg | bg << 32, style) integers kept by `CellBuffer`.
+    """
+    if isinstance(attr, AttributePair):
+        attr = attr.attrs[0]
+    elif not isinstance(attr, ColourAttribute):
+        attr = ColourAttribute.from_bios(attr)
+    value = attr._value
+    return value & COLOURS_MASK, value >> 64
+
+
+def unpack_attr(colours: int, style: int) -> ColourAttribute:
+    """
+    The (interned) `ColourAttribute` for packed integers.
+    """
+    return ColourAttribute.from_packed(colours | (style << 64))
+
+
+class CellRef:
+    """
+    A lightweight reference to one cell of a `CellBuffer`.
+
+    Quacks like a `ScreenCell` so that code written against lists of cells
+    (`cell.char = ...`, `set_cell(cell, ...)`) keeps working, but all reads and
+    writes go straight through to the buffer's arrays.
+    """
+    __slots__ = ('_buffer', '_index')
+
+    def __init__(self, buffer: CellBuffer, index: int):
+        self._buffer = buffer
+        self._index = index
+
+    @property
+    def char(self) -> str:
+        return self._buffer.get_char(self._index)
+
+    @char.setter
+    def char(self, value: str):
+        self._buffer.set_text(self._index, value)
+
+    @property
+    def attr(self) -> ColourAttribute:
+        return self._buffer.get_attr(self._index)
+
+    @attr.setter
+    def attr(self, value):
+        self._buffer.set_attr(self._index, value)
+
+    def get_text(self) -> str:
+        return self._buffer.get_text(self._index)
+
+    def is_wide(self) -> bool:
+        return self._buffer.is_wide(self._index)
+
+    def is_wide_char_trail(self) -> bool:
+        return self._buffer.is_trail(self._index)
+
+    def attr_key(self) -> int:
+        return self._buffer.attr_key(self._index)
+
+    def to_screen_cell(self) -> ScreenCell:
+        """
+        Detach the referenced cell into a standalone `ScreenCell`.
+        """
+        return self._buffer.get_cell(self._index)
+
+    def __copy__(self) -> ScreenCell:
+        return self.to_screen_cell()
+
+    def __deepcopy__(self, memo) -> ScreenCell:
+        return self.to_screen_cell()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CellRef):
+            return self._buffer.cell_equal(self._index, other._buffer, other._index)
+        if isinstance(other, ScreenCell):
+            return (self.get_text() == other._ch.get_text() and self.is_wide() == other.is_wide() and
+                    self.attr == other.attr)
+        return NotImplemented
+
+    def __repr__(self):
+        return f'<CellRef {self._index}: {self.get_text()!r} {self.attr!r}>'
+
+
+class CellBuffer:
+    """
+    Compact storage for a run of screen cells.
+
+    Cells are kept in parallel arrays of packed integers: the code point and
+    `CellFlags` in one, the foreground and background colours in another and
+    the style mask in a third.  Slicing a `CellBuffer` returns a *view* that
+    shares the same storage, so rows and spans can be handed around without
+    copying; use `copy_from()` to move cells between buffers in bulk.
+    """
+    __slots__ = ('_chars', '_colours', '_styles', '_text', '_offset', '_length')
+
+    def __init__(self, size: int = 0):
+        self._chars = array('L', [0]) * size
+        self._colours = array('Q', [0]) * size
+        self._styles = array('H', [0]) * size
+        self._text: dict[int, str] = {}
+        self._offset = 0
+        self._length = size
+
+    @classmethod
+    def from_cells(cls, cells: Iterable) -> CellBuffer:
+        """
+        Build a buffer holding copies of `cells` (`ScreenCell` or `CellRef` objects).
+        """
+        cells = list(cells)
+        buffer = cls(len(cells))
+        for i, cell in enumerate(cells):
+            buffer.set_from(i, cell)
+        return buffer
+
+    @classmethod
+    def as_cells(cls, buf) -> CellBuffer:
+        """
+        Return `buf` as a `CellBuffer` without copying where possible: buffers
+        are returned as-is, a `DrawBuffer` yields its backing store and only
+        plain sequences of cells are converted.
+        """
+        if isinstance(buf, CellBuffer):
+            return buf
+        data = getattr(buf, 'data', None)
+        if isinstance(data, CellBuffer):
+            return data
+        return cls.from_cells(buf)
+
+    def _view(self, start: int, length: int) -> CellBuffer:
+        view = CellBuffer.__new__(CellBuffer)
+        view._chars = self._chars
+        view._colours = self._colours
+        view._styles = self._styles
+        view._text = self._text
+        view._offset = self._offset + start
+        view._length = length
+        return view
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[CellRef]:
+        for i in range(self._length):
+            yield CellRef(self, i)
+
+    def __getitem__(self, key: int | slice) -> CellRef | CellBuffer:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                raise ValueError('CellBuffer slices must be contiguous')
+            return self._view(start, max(stop - start, 0))
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError('CellBuffer index out of range')
+        return CellRef(self, key)
+
+    def __setitem__(self, key: int | slice, value):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                raise ValueError('CellBuffer slices must be contiguous')
+            self.copy_from(start, value, 0, min(stop - start, len(value)))
+            return
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError('CellBuffer index out of range')
+        self.set_from(key, value)
+
+    def row(self, y: int, width: int) -> CellBuffer:
+        """
+        View of row `y` when the buffer holds a `width`-wide grid.
+        """
+        return self._view(y * width, width)
+
+    # -- Character access
+
+    def _encode(self, index: int, text: str) -> int:
+        """
+        Pack `text` for absolute `index`, spilling clusters to the side table.
+        """
+        if len(text) <= 1:
+            if self._text:
+                self._text.pop(index, None)
+            return ord(text) if text else 0
+        self._text[index] = text
+        return EXTENDED
+
+    def get_text(self, index: int) -> str:
+        """
+        Raw text of the cell; empty for blank cells and wide-character trails.
+        """
+        index += self._offset
+        packed = self._chars[index]
+        if packed & EXTENDED:
+            return self._text.get(index, '')
+        cp = packed & CODEPOINT_MASK
+        return chr(cp) if cp else ''
+
+    def get_char(self, index: int) -> str:
+        """
+        Printable text of the cell; blank cells read back as a space.
+        """
+        index += self._offset
+        packed = self._chars[index]
+        if packed & EXTENDED:
+            return self._text.get(index, ' ')
+        cp = packed & CODEPOINT_MASK
+        return chr(cp) if cp else ' '
+
+    def set_text(self, index: int, text: str):
+        """
+        Store `text` in the cell.  Any wide/trail marking is cleared.
+        """
+        index += self._offset
+        self._chars[index] = self._encode(index, text or '')
+
+    def append_text(self, index: int, text: str):
+        """
+        Append zero-width text (e.g. combining marks) to the cell.
+        """
+        flags = self._chars[index + self._offset] & (WIDE | TRAIL)
+        self.set_text(index, self.get_char(index) + text)
+        self._chars[index + self._offset] |= flags
+
+    def is_wide(self, index: int) -> bool:
+        return bool(self._chars[index + self._offset] & WIDE)
+
+    def is_trail(self, index: int) -> bool:
+        return bool(self._chars[index + self._offset] & TRAIL)
+
+    def set_wide(self, index: int):
+        self._chars[index + self._offset] |= WIDE
+
+    def set_trail(self, index: int):
+        """
+        Mark the cell as the continuation of the wide character to its left.
+        """
+        index += self._offset
+        if self._text:
+            self._text.pop(index, None)
+        self._chars[index] = TRAIL
+
+    # -- Attribute access
+
+    def get_attr(self, index: int) -> ColourAttribute:
+        index += self._offset
+        return unpack_attr(self._colours[index], self._styles[index])
+
+    def set_attr(self, index: int, attr):
+        if attr is None:
+            return
+        index += self._offset
+        self._colours[index], self._styles[index] = pack_attr(attr)
+
+    def attr_key(self, index: int) -> int:
+        """
+        The packed attribute as a single int; equal keys mean equal attributes.
+        """
+        index += self._offset
+        return self._colours[index] | (self._styles[index] << 64)
+
+    def same_attr(self, index: int, other: CellBuffer, other_index: int) -> bool:
+        index += self._offset
+        other_index += other._offset
+        return (self._colours[index] == other._colours[other_index] and
+                self._styles[index] == other._styles[other_index])
+
+    # -- Whole cells
+
+    def set_cell(self, index: int, text: str, attr=None):
+        self.set_text(index, text)
+        self.set_attr(index, attr)
+
+    def set_from(self, index: int, cell):
+        """
+        Copy the value of a `ScreenCell` or `CellRef` into the cell at `index`.
+        """
+        if isinstance(cell, CellRef):
+            self.copy_from(index, cell._buffer, cell._index, 1)
+            return
+        ch = cell._ch
+        self.set_text(index, ch.get_text())
+        self._chars[index + self._offset] |= (int(ch._flags) << FLAG_SHIFT) & (WIDE | TRAIL)
+        self.set_attr(index, cell.attr)
+
+    def get_cell(self, index: int) -> ScreenCell:
+        """
+        Detached `ScreenCell` copy of the cell at `index`.
+        """
+        cell = ScreenCell()
+        cell._ch.move_char(self.get_text(index))
+        packed = self._chars[index + self._offset]
+        if packed != INVALID:
+            cell._ch._flags = CellFlags((packed >> FLAG_SHIFT) & (CellFlags.Wide | CellFlags.Trail))
+        cell.attr = self.get_attr(index)
+        return cell
+
+    def cell_equal(self, index: int, other: CellBuffer, other_index: int) -> bool:
+        i = index + self._offset
+        j = other_index + other._offset
+        packed = self._chars[i]
+        if packed != other._chars[j] or self._colours[i] != other._colours[j] or self._styles[i] != other._styles[j]:
+            return False
+        return not packed & EXTENDED or self._text.get(i) == other._text.get(j)
+
+    def fingerprint(self, start: int, count: int) -> tuple:
+        """
+        Hashable summary of `count` cells from `start`; two spans have equal
+        fingerprints exactly when their cells are equal (see `cell_equal()`).
+        """
+        begin = self._offset + start
+        end = begin + max(min(count, self._length - start), 0)
+        texts = None
+        if self._text:
+            texts = tuple(sorted((k - begin, v) for k, v in self._text.items() if begin <= k < end))
+        return (self._chars[begin:end].tobytes(), self._colours[begin:end].tobytes(),
+                self._styles[begin:end].tobytes(), texts)
+
+    # -- Bulk operations
+
+    def fill(self, start: int, count: int, text: str | None = None, attr=None):
+        """
+        Fill `count` cells from `start`.  `text` and `attr` are each optional;
+        whichever is `None` is left untouched.  Writing text gives fresh,
+        non-wide cells.
+        """
+        count = min(count, self._length - start)
+        if start < 0 or count <= 0:
+            return
+        begin = self._offset + start
+        end = begin + count
+        if text is not None:
+            self._drop_text(begin, end)
+            if len(text) <= 1:
+                self._chars[begin:end] = array('L', [ord(text) if text else 0]) * count
+            else:
+                self._chars[begin:end] = array('L', [EXTENDED]) * count
+                for i in range(begin, end):
+                    self._text[i] = text
+        if attr is not None:
+            colours, style = pack_attr(attr)
+            self._colours[begin:end] = array('Q', [colours]) * count
+            self._styles[begin:end] = array('H', [style]) * count
+
+    def fill_attr(self, start: int, count: int, attr):
+        self.fill(start, count, None, attr)
+
+    def write_text(self, start: int, text: str, attr=None) -> int:
+        """
+        Store `text` one code point per cell from `start`.  The caller
+        guarantees every code point is a single column wide with no combining
+        marks, so the whole run is written as one slice.
+
+        :return: Number of cells written
+        """
+        count = min(len(text), self._length - start)
+        if start < 0 or count <= 0:
+            return 0
+        begin = self._offset + start
+        end = begin + count
+        self._drop_text(begin, end)
+        self._chars[begin:end] = array('L', map(ord, text[:count]))
+        if attr is not None:
+            colours, style = pack_attr(attr)
+            self._colours[begin:end] = array('Q', [colours]) * count
+            self._styles[begin:end] = array('H', [style]) * count
+        return count
+
+    def snapshot(self, start: int = 0, count: int | None = None) -> tuple:
+        """
+        Compact, detached copy of `count` cells for long term storage: the
+        packed characters (a `str` when no cell has flags or extended text),
+        the extended texts and the attributes as `(start, colours, style)`
+        runs.  `restore()` puts it back.
+        """
+        if count is None:
+            count = self._length - start
+        begin = self._offset + start
+        end = begin + max(min(count, self._length - start), 0)
+        chars = self._chars[begin:end]
+        texts = None
+        if self._text:
+            texts = {k - begin: v for k, v in self._text.items() if begin <= k < end} or None
+        if texts is None and max(chars, default=0) <= CODEPOINT_MASK:
+            chars = ''.join(map(chr, chars))
+        else:
+            chars = array('I', chars)
+
+        runs = []
+        x = 0
+        for key, group in groupby(zip(self._colours[begin:end], self._styles[begin:end])):
+            runs.append((x, *key))
+            x += len(list(group))
+        return chars, texts, tuple(runs)
+
+    def restore(self, start: int, snapshot: tuple) -> int:
+        """
+        Write a `snapshot()` back from `start`, clipped to this buffer.
+
+        :return: Number of cells written
+        """
+        chars, texts, runs = snapshot
+        count = min(len(chars), self._length - start)
+        if start < 0 or count <= 0:
+            return 0
+        begin = self._offset + start
+        end = begin + count
+        self._drop_text(begin, end)
+        if isinstance(chars, str):
+            self._chars[begin:end] = array('L', map(ord, chars[:count]))
+        else:
+            self._chars[begin:end] = array('L', chars[:count])
+        if texts:
+            self._text.update((k + begin, v) for k, v in texts.items() if k < count)
+        for i, (x, colours, style) in enumerate(runs):
+            if x >= count:
+                break
+            run = (runs[i + 1][0] if i + 1 < len(runs) else count) - x
+            run = min(run, count - x)
+            self._colours[begin + x:begin + x + run] = array('Q', [colours]) * run
+            self._styles[begin + x:begin + x + run] = array('H', [style]) * run
+        return count
+
+    def replace_char(self, start: int, count: int, old: str, new: str):
+        """
+        Replace the single code point `old` with `new` in `count` cells from
+        `start`, keeping the attributes and wide/trail flags.
+        """
+        count = min(count, self._length - start)
+        if start < 0 or count <= 0:
+            return
+        begin = self._offset + start
+        chars = self._chars
+        old = ord(old)
+        new = ord(new)
+        for i in range(begin, begin + count):
+            ch = chars[i]
+            if ch & CODEPOINT_MASK == old and not ch & EXTENDED:
+                chars[i] = (ch & FLAG_MASK) | new
+
+    def clear(self, attr=None):
+        """
+        Reset every cell to a blank, optionally giving it `attr`.
+        """
+        self.fill(0, self._length, '', attr if attr is not None else ColourAttribute())
+
+    def invalidate(self):
+        """
+        Mark every cell as unknown so that it never compares equal to a real cell.
+        """
+        begin = self._offset
+        end = begin + self._length
+        self._drop_text(begin, end)
+        self._chars[begin:end] = array('L', [INVALID]) * self._length
+
+    def copy_from(self, dst: int, src, src_start: int = 0, count: int | None = None) -> int:
+        """
+        Copy `count` cells from `src` (a `CellBuffer`, or any sequence of
+        `ScreenCell` / `CellRef` objects) into this buffer at `dst`.
+
+        :return: Number of cells copied
+        """
+        if count is None:
+            count = len(src) - src_start
+        count = min(count, self._length - dst, len(src) - src_start)
+        if dst < 0 or src_start < 0 or count <= 0:
+            return 0
+        if not isinstance(src, CellBuffer):
+            if hasattr(src, 'data') and isinstance(src.data, CellBuffer):
+                src = src.data
+            else:
+                for i in range(count):
+                    self.set_from(dst + i, src[src_start + i])
+                return count
+
+        begin = self._offset + dst
+        end = begin + count
+        s_begin = src._offset + src_start
+        s_end = s_begin + count
+        if src._chars is self._chars and s_begin == begin:
+            # Copying a span onto itself
+            return count
+        moved = None
+        if src._text:
+            moved = [(k - s_begin + begin, v) for k, v in src._text.items() if s_begin <= k < s_end]
+        self._chars[begin:end] = src._chars[s_begin:s_end]
+        self._colours[begin:end] = src._colours[s_begin:s_end]
+        self._styles[begin:end] = src._styles[s_begin:s_end]
+        self._drop_text(begin, end)
+        if moved:
+            self._text.update(moved)
+        return count
+
+    def copy(self, start: int = 0, count: int | None = None) -> CellBuffer:
+        """
+        Detached copy of `count` cells from `start`.
+        """
+        if count is None:
+            count = self._length - start
+        count = max(min(count, self._length - start), 0)
+        buffer = CellBuffer(count)
+        buffer.copy_from(0, self, start, count)
+        return buffer
+
+    def to_string(self, start: int = 0, count: int | None = None) -> str:
+        if count is None:
+            count = self._length - start
+        return ''.join(self.get_char(i) for i in range(start, min(start + count, self._length)))
+
+    def resize(self, size: int):
+        """
+        Grow or shrink the buffer in place, keeping existing content.  Views
+        taken before the resize keep their old extent.
+        """
+        if self._offset:
+            raise ValueError('Cannot resize a CellBuffer view')
+        current = len(self._chars)
+        if size > current:
+            grow = size - current
+            self._chars.extend(array('L', [0]) * grow)
+            self._colours.extend(array('Q', [0]) * grow)
+            self._styles.extend(array('H', [0]) * grow)
+        elif size < current:
+            self._drop_text(size, current)
+            del self._chars[size:]
+            del self._colours[size:]
+            del self._styles[size:]
+        self._length = size
+
+    def _drop_text(self, begin: int, end: int):
+        if self._text:
+            for k in [k for k in self._text if begin <= k < end]:
+                del self._text[k]
+
+    def __repr__(self):
+        return f'<CellBuffer offset={self._offset} length={self._length}>'
@@ -8,6 +8,7 @@ class CellFlags(IntFlag):
     NONE = 0x0
     Wide = 0x1
     Trail = 0x2
+    Extended = 0x4  # Text is more than one code point (only used by CellBuffer)
 
 
 class CellChar:
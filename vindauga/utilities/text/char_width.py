@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Cached display widths.
+
+`wcwidth` does a binary search of its tables for every code point, which
+dominates redrawing text-heavy views.  Widths are looked up once per code
+point and kept, so the table fills in to cover whatever part of the BMP
+(and beyond) an application actually shows.  Pure printable ASCII never
+touches the table at all.
+"""
+from __future__ import annotations
+
+import wcwidth
+
+# Code points that change the width of their neighbours; strings with these
+# are measured by `wcwidth.wcswidth()` as a whole.
+_SEQUENCE_CHARS = ('\u200d', '\ufe0f')
+
+_widths: dict[str, int] = {chr(c): wcwidth.wcwidth(chr(c)) for c in range(128)}
+
+
+def char_width(char: str) -> int:
+    """
+    Display width of a single character: 0 for combining marks, 2 for wide
+    characters and -1 for control characters, as `wcwidth.wcwidth()`.
+    """
+    width = _widths.get(char)
+    if width is None:
+        width = wcwidth.wcswidth(char)
+        if len(char) == 1:
+            _widths[char] = width
+    return width
+
+
+def char_widths(text: str) -> list[int]:
+    """
+    Width of each character of `text`, measured in one call.
+    """
+    if text.isascii() and text.isprintable():
+        return [1] * len(text)
+    widths = _widths
+    return [widths[c] if c in widths else char_width(c) for c in text]
+
+
+def str_width(text: str) -> int:
+    """
+    Display width of `text`, or -1 if it contains a control character, as
+    `wcwidth.wcswidth()`.
+    """
+    if text.isascii():
+        if text.isprintable():
+            return len(text)
+    elif any(c in text for c in _SEQUENCE_CHARS):
+        return wcwidth.wcswidth(text)
+    widths = char_widths(text)
+    if -1 in widths:
+        return -1
+    return sum(widths)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from array import array
+import sys
+
+# Code points are kept as native 32 bit ints; this codec converts between the
+# raw array memory and `str` in one C-level step.
+_CODEC = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+_ERRORS = 'surrogatepass'
+
+
+def _encode(text: str) -> array:
+    buffer = array('I')
+    buffer.frombytes(text.encode(_CODEC, _ERRORS))
+    return buffer
+
+
+class EditBuffer:
+    """
+    Mutable storage for an editor gap buffer.
+
+    Holds one code point per slot, so physical positions are the same as
+    `str` indices.  The buffer knows nothing about the gap itself; the
+    `Editor` keeps `curPtr` / `gapLen` and moves text across the gap with
+    `move()`, which costs time proportional to the distance moved rather
+    than the size of the document.
+
+    Indexing returns a one character string, slicing decodes just that
+    range to a `str` and `view()` gives a zero-copy `memoryview`.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, source: int | str = 0):
+        if isinstance(source, str):
+            self._data = _encode(source)
+        else:
+            self._data = array('I', bytes(4 * source))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __getitem__(self, key: int | slice) -> str:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self._data))
+            if step != 1:
+                raise ValueError('EditBuffer slices must be contiguous')
+            return self.text(start, stop)
+        return chr(self._data[key])
+
+    def __setitem__(self, key: int | slice, text: str):
+        """
+        Overwrite cells with `text`.  A slice must be the same length as the
+        text; the buffer is never resized by assignment.
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self._data))
+            if step != 1 or stop - start != len(text):
+                raise ValueError('EditBuffer assignment must not change the buffer size')
+            self._data[start:stop] = _encode(text)
+        else:
+            self._data[key] = ord(text)
+
+    def __str__(self) -> str:
+        return self.text(0, len(self._data))
+
+    def view(self, start: int, end: int) -> memoryview:
+        """
+        Zero-copy view of the code points in [start, end)
+        """
+        return memoryview(self._data)[start:end]
+
+    def text(self, start: int, end: int) -> str:
+        if end <= start:
+            return ''
+        return str(self.view(start, end), _CODEC, _ERRORS)
+
+    def count(self, sub: str, start: int, end: int) -> int:
+        return self.text(start, end).count(sub)
+
+    def move(self, destination: int, source: int, length: int):
+        """
+        Copy `length` code points from `source` to `destination` (memmove semantics)
+        """
+        if length > 0:
+            self._data[destination:destination + length] = self._data[source:source + length]
+
+    def grow(self, at: int, count: int):
+        """
+        Insert `count` empty slots before position `at`
+        """
+        if count > 0:
+            self._data[at:at] = array('I', bytes(4 * count))
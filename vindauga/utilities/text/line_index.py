@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+
+class LineIndex:
+    """
+    Positions of the line breaks (`'\\n'`) in a document, kept up to date as
+    text is inserted and deleted.
+
+    Like the text it indexes, the index has a gap.  Breaks before the gap are
+    stored as absolute offsets, breaks after it as distances from the end of
+    the document, so an edit at the gap shifts nothing and moving the gap
+    only touches the breaks it passes.  Edits are expected to cluster around
+    the cursor, so this keeps updates cheap while every query is a binary
+    search.
+
+    Lines are numbered from 0; a document with `n` breaks has `n + 1` lines.
+    """
+    __slots__ = ('_before', '_after', '_gap', '_length')
+
+    def __init__(self, text: str = ''):
+        self.reset(text)
+
+    def reset(self, text: str):
+        """
+        Rebuild the index for `text`
+        """
+        self._length = len(text)
+        self._gap = 0
+        self._before = []
+        # Distances from the end, nearest the gap last
+        self._after = [self._length - p + 1 for p in accumulate(len(line) + 1 for line in text.split('\n')[:-1])]
+        self._after.reverse()
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def line_count(self) -> int:
+        return len(self._before) + len(self._after) + 1
+
+    def _move_gap(self, pos: int):
+        before, after, length = self._before, self._after, self._length
+        if pos > self._gap:
+            while after and length - after[-1] < pos:
+                before.append(length - after.pop())
+        elif pos < self._gap:
+            while before and before[-1] >= pos:
+                after.append(length - before.pop())
+        self._gap = pos
+
+    def insert(self, pos: int, text: str):
+        """
+        Record `text` being inserted at offset `pos`
+        """
+        self._move_gap(pos)
+        start = text.find('\n')
+        while start >= 0:
+            self._before.append(pos + start)
+            start = text.find('\n', start + 1)
+        self._gap += len(text)
+        self._length += len(text)
+
+    def delete(self, pos: int, count: int):
+        """
+        Record `count` characters being deleted at offset `pos`
+        """
+        if count <= 0:
+            return
+        self._move_gap(pos + count)
+        before = self._before
+        while before and before[-1] >= pos:
+            before.pop()
+        self._gap = pos
+        self._length -= count
+
+    def line_of(self, pos: int) -> int:
+        """
+        Line number containing offset `pos`
+        """
+        if pos <= self._gap:
+            return bisect_left(self._before, pos)
+        after = self._after
+        return len(self._before) + len(after) - bisect_right(after, self._length - pos)
+
+    def line_break(self, line: int) -> int:
+        """
+        Offset of the break ending `line`, or the document length for the last line
+        """
+        if line < len(self._before):
+            return self._before[line]
+        line -= len(self._before)
+        if line < len(self._after):
+            return self._length - self._after[-1 - line]
+        return self._length
+
+    def line_start(self, line: int) -> int:
+        """
+        Offset of the first character of `line`
+        """
+        if line <= 0:
+            return 0
+        return min(self.line_break(line - 1) + 1, self._length)
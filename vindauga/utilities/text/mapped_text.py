@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from operator import sub
+import os
+import re
+import threading
+
+_NEWLINE = re.compile(b'\n')
+
+
+class MappedText:
+    """
+    The lines of a file, read as they are needed rather than into memory.
+
+    Line start offsets are found by a background thread a chunk at a time, so
+    the first lines are available at once and `len()` grows until `indexed`
+    becomes True.  Lines are read and decoded only when asked for, and the
+    most recent ones are kept in a small cache.  Nothing else of the file is
+    held in memory apart from the offsets.  `refresh()` picks up lines
+    appended to the file since.
+
+    Reads are positioned reads of the open file rather than a memory map, so
+    a file truncated by another process gives short reads instead of
+    SIGBUS: lines past the new end come back empty, indexing stops there
+    and `refresh()` reports the file has to be opened again.
+
+    `width` is an estimate of the longest line: its length in bytes, which is
+    never less than its width in columns for UTF-8 outside the wide CJK
+    ranges.
+    """
+    CHUNK_SIZE = 1 << 20
+    CACHE_LINES = 512
+
+    def __init__(self, fileName: str, encoding: str = 'utf-8'):
+        self.fileName = fileName
+        self.encoding = encoding
+        self._file = open(fileName, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        # Set when a read comes up short of `_size`
+        self._truncated = False
+        self._readLock = threading.Lock()
+        self._starts = array('Q', [0])
+        self._scanned = 0
+        self._width = 0
+        self._cache: OrderedDict[int, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        # The first screenful is wanted straight away
+        self.__indexChunk()
+        self._indexing = True
+        self._thread = self.__startIndexing()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.__lineCount()
+
+    def __getitem__(self, index: int) -> str:
+        line = self._cache.get(index)
+        if line is not None:
+            self._cache.move_to_end(index)
+            return line
+        with self._lock:
+            count = self.__lineCount()
+            if index < 0:
+                index += count
+            if not 0 <= index < count:
+                raise IndexError(index)
+            start = self._starts[index]
+            end = self._starts[index + 1] if index + 1 < len(self._starts) else self._size
+        data = self.__read(start, end - start)
+        if len(data) < end - start:
+            self._truncated = True
+        line = data.decode(self.encoding, errors='replace')
+        self._cache[index] = line
+        if len(self._cache) > self.CACHE_LINES:
+            self._cache.popitem(last=False)
+        return line
+
+    @property
+    def indexed(self) -> bool:
+        """
+        True once every line break in the file has been found.
+        """
+        return self._scanned == self._size
+
+    @property
+    def truncated(self) -> bool:
+        """
+        True once a read has come up short because the file shrank.
+        """
+        return self._truncated
+
+    @property
+    def width(self) -> int:
+        with self._lock:
+            width = self._width
+            if self._scanned == self._size:
+                width = max(width, self._size - self._starts[-1])
+        return width
+
+    def waitIndexed(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the background indexing to finish.
+        """
+        self._thread.join(timeout)
+        return self.indexed
+
+    def refresh(self) -> bool:
+        """
+        Index anything appended to the file.
+
+        :return: False if the file has been truncated or replaced (e.g. by log
+                 rotation), in which case it has to be opened again
+        """
+        fileNo = self._file.fileno()
+        size = os.fstat(fileNo).st_size
+        try:
+            replaced = os.stat(self.fileName).st_ino != os.fstat(fileNo).st_ino
+        except OSError:
+            # Moved away and not recreated yet
+            replaced = False
+        if replaced or self._truncated or size < self._size:
+            return False
+        if size == self._size:
+            return True
+
+        with self._lock:
+            self._size = size
+            lastLine = len(self._starts) - 1
+            start = not self._indexing
+            self._indexing = True
+        # The last line may have been added to
+        for index in [index for index in self._cache if index >= lastLine]:
+            del self._cache[index]
+        if start:
+            self._thread = self.__startIndexing()
+        return True
+
+    def close(self):
+        self._closed.set()
+        self._thread.join()
+        self._cache.clear()
+        self._file.close()
+
+    def __lineCount(self) -> int:
+        count = len(self._starts) - 1
+        if self._scanned == self._size and self._starts[-1] < self._size:
+            # Last line has no line break
+            count += 1
+        return count
+
+    def __startIndexing(self) -> threading.Thread:
+        thread = threading.Thread(target=self.__indexAll, name=f'index {self.fileName}', daemon=True)
+        thread.start()
+        return thread
+
+    def __indexAll(self):
+        while not self._closed.is_set():
+            with self._lock:
+                if self._scanned == self._size:
+                    self._indexing = False
+                    return
+            self.__indexChunk()
+
+    def __read(self, start: int, length: int) -> bytes:
+        """
+        Up to `length` bytes from `start`; fewer if the file has shrunk.
+        """
+        if hasattr(os, 'pread'):
+            return os.pread(self._file.fileno(), length, start)
+        with self._readLock:
+            self._file.seek(start)
+            return self._file.read(length)
+
+    def __indexChunk(self):
+        with self._lock:
+            size = self._size
+        start = self._scanned
+        end = min(start + self.CHUNK_SIZE, size)
+        data = self.__read(start, end - start)
+        starts = array('Q', [self._starts[-1]])
+        starts.extend(start + m.end() for m in _NEWLINE.finditer(data))
+        width = max(map(sub, starts[1:], starts[:-1]), default=0)
+        with self._lock:
+            self._starts.extend(starts[1:])
+            self._width = max(self._width, width - 1)
+            if len(data) < end - start:
+                # Truncated under us: what is left ends here
+                self._truncated = True
+                end = self._size = start + len(data)
+            self._scanned = end
@@ -3,12 +3,10 @@ from __future__ import annotations
 from typing import Callable
 import unicodedata
 
-import wcwidth
-
 from vindauga.utilities.colours.colour_attribute import ColourAttribute
-from vindauga.utilities.screen.cell_char import CellFlags
-from vindauga.utilities.screen.screen_cell import ScreenCell, set_cell, set_char
+from vindauga.utilities.screen.cell_buffer import CellBuffer
 
+from .char_width import char_width, char_widths, str_width
 from .text_metrics import TextMetrics
 
 
@@ -21,11 +19,7 @@ class Text:
         """
         Returns the display width of text using wcwidth.
         """
-        try:
-            return wcwidth.wcswidth(text) or 0
-        except ImportError:
-            # Fallback to simple length
-            return len(text)
+        return str_width(text)
 
     @staticmethod
     def measure(text: str) -> TextMetrics:
@@ -94,10 +88,9 @@ class Text:
             return False, index, 0
 
         # Get width of this character
-        char = text[index : index + char_len]
-        char_width = Text.width(char)
-
-        return True, index + char_len, char_width
+        if char_len == 1:
+            return True, index + 1, char_width(text[index])
+        return True, index + char_len, Text.width(text[index:index + char_len])
 
     @staticmethod
     def prev_char(text: str, index: int) -> int:
@@ -137,29 +130,7 @@ class Text:
         """
         Returns the byte length of a substring that is 'count' columns wide.
         """
-        if count <= 0:
-            return 0
-
-        length = 0
-        width = 0
-        index = 0
-
-        while index < len(text) and width < count:
-            success, new_index, char_width = Text.next_with_width(text, index)
-            if not success:
-                break
-
-            if width + char_width > count and not include_incomplete:
-                break  # Would exceed count, don't include this character
-
-            length = new_index
-            width += char_width
-            index = new_index
-
-            if width >= count:
-                break
-
-        return length
+        return Text.scroll_with_metrics(text, count, include_incomplete)[0]
 
     @staticmethod
     def scroll_with_metrics(text: str, count: int, include_incomplete: bool = False) -> tuple[int, int]:
@@ -168,45 +139,33 @@ class Text:
         """
         if count <= 0:
             return 0, 0
+        if text.isascii() and text.isprintable():
+            length = min(count, len(text))
+            return length, length
 
         length = 0
         width = 0
-        index = 0
-
-        while index < len(text) and width < count:
-            success, new_index, char_width = Text.next_with_width(text, index)
-            if not success:
-                break
-
+        for char_width in char_widths(text):
             if width + char_width > count and not include_incomplete:
-                break
+                break  # Would exceed count, don't include this character
 
-            length = new_index
+            length += 1
             width += char_width
-            index = new_index
-
             if width >= count:
                 break
 
         return length, width
 
     @staticmethod
-    def draw_char(cells: list[ScreenCell], char: str, attr: ColourAttribute = None):
+    def draw_char(cells: CellBuffer, char: str, attr: ColourAttribute = None):
         """
         Fill cells with the given character.
         """
-        if attr:
-            for i in range(len(cells)):
-                cell = ScreenCell()
-                set_cell(cell, char, attr)
-                cells[i] = cell
-        else:
-            # Just set character, preserve existing attributes
-            for i in range(len(cells)):
-                cells[i].char = char
+        # Without an attribute the existing attributes are preserved
+        cells.fill(0, len(cells), char, attr or None)
 
     @staticmethod
-    def draw_str(cells: list[ScreenCell], text: str, indent: int = 0, text_indent: int = 0,
+    def draw_str(cells: CellBuffer, text: str, indent: int = 0, text_indent: int = 0,
                  attr: ColourAttribute | None = None) -> int:
         """
         Copy text into cells, starting at indent position.
@@ -223,11 +182,27 @@ class Text:
         visible_text = text[text_start:]
         cells_span = cells[indent:]
 
+        widths = char_widths(visible_text)
+        text_len = len(visible_text)
+        size = len(cells_span)
         filled = 0
         text_pos = 0
         cell_pos = 0
 
-        while cell_pos < len(cells_span) and text_pos < len(visible_text):
+        while cell_pos < size and text_pos < text_len:
+            if widths[text_pos] == 1:
+                # Runs of single-column characters are written in one go
+                run_end = text_pos + 1
+                while run_end < text_len and widths[run_end] == 1:
+                    run_end += 1
+                count = cells_span.write_text(cell_pos, visible_text[text_pos:run_end], attr or None)
+                if not count:
+                    break
+                filled += count
+                cell_pos += count
+                text_pos += count
+                continue
+
             # Use draw_one for proper combining character handling
             success, new_cell_pos, new_text_pos = Text.draw_one(
                 cells_span, cell_pos, visible_text, text_pos, attr
@@ -244,7 +219,7 @@ class Text:
 
     @staticmethod
     def draw_one(
-        cells: list[ScreenCell], cell_index: int, text: str, text_index: int, attr: ColourAttribute = None
+        cells: CellBuffer, cell_index: int, text: str, text_index: int, attr: ColourAttribute = None
     ) -> tuple[bool, int, int]:
         """
         Draw one character from text into cells.
@@ -265,30 +240,25 @@ class Text:
         # Handle combining characters
         if char_width == 0 and cell_index > 0:
             # Combining character - add to previous cell
-            prev_cell = cells[cell_index - 1]
-            if prev_cell.char:
-                prev_cell.char += char
+            cells.append_text(cell_index - 1, char)
             return True, cell_index, new_text_index  # Don't advance cell_index
 
-        if attr:
-            set_cell(cells[cell_index], char, attr)
-        else:
-            set_char(cells[cell_index], char)
+        cells.set_cell(cell_index, char, attr or None)
 
         # Mark wide-character lead cell and continuation (trail) cells
         if char_width >= 2:
-            cells[cell_index]._ch._flags |= CellFlags.Wide
+            cells.set_wide(cell_index)
             for i in range(1, char_width):
                 if cell_index + i < len(cells):
-                    cells[cell_index + i]._ch.move_wide_char_trail()
+                    cells.set_trail(cell_index + i)
                     if attr:
-                        cells[cell_index + i].attr = attr
+                        cells.set_attr(cell_index + i, attr)
 
         return True, cell_index + char_width, new_text_index
 
     @staticmethod
     def draw_str_ex(
-        cells: list[ScreenCell],
+        cells: CellBuffer,
         text: str,
         indent: int = 0,
         text_indent: int = 0,
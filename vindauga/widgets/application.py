@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import logging
 
+from vindauga.events.async_driver import AsyncDriver
 from vindauga.history_support.history_utils import initHistory, doneHistory
 from vindauga.types.screen import Screen
 import vindauga.types.screen
@@ -44,8 +45,9 @@ class Application(Program):
 
     @staticmethod
     def suspend():
-        Screen.screen.suspend()
+        # Restoring the console resets signal handlers, which only the main thread may do
+        AsyncDriver.callOnLoopThread(Screen.screen.suspend)
 
     @staticmethod
     def resume():
-        Screen.screen.resume()
+        AsyncDriver.callOnLoopThread(Screen.screen.resume)
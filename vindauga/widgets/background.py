@@ -34,5 +34,5 @@ class Background(View):
         self.writeLine(0, 0, self.size.x, self.size.y, b)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpBackground)
+        palette = Palette.shared(self.cpBackground)
         return palette
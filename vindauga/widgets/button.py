@@ -99,7 +99,7 @@ class Button(View):
         self.writeLine(0, self.size.y - 1, self.size.x, 1, b)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpButton)
+        return Palette.shared(self.cpButton)
 
     def handleEvent(self, event: Event):
         clickRect: Rect = self.getExtent()
@@ -25,5 +25,5 @@ class ClockView(View):
         date = time.ctime(t)
         self.curTime = date[11:19]
         if self.lastTime != self.curTime:
-            self.drawView()
+            self.invalidate()
             self.lastTime = self.curTime
@@ -89,7 +89,7 @@ class Cluster(View):
         return self.helpCtx + self._sel
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpCluster)
+        palette = Palette.shared(self.cpCluster)
         return palette
 
     def handleEvent(self, event: Event):
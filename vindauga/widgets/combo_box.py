@@ -50,8 +50,8 @@ class ComboBox(View):
 
     def getPalette(self) -> Palette:
         if isinstance(self.inputLine, StaticInputLine):
-            return Palette(self.cpSComboBox)
-        return Palette(self.cpComboBox)
+            return Palette.shared(self.cpSComboBox)
+        return Palette.shared(self.cpComboBox)
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
@@ -37,7 +37,7 @@ class ComboViewer(ListViewer):
         return True
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpComboViewer)
+        return Palette.shared(self.cpComboViewer)
 
     @staticmethod
     def matchChars(item: str, target: str) -> bool:
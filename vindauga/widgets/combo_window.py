@@ -32,7 +32,7 @@ class ComboWindow(Window):
         self.insert(self.viewer)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpComboWindow)
+        return Palette.shared(self.cpComboWindow)
 
     def getSelection(self) -> str:
         return self.viewer.getText(self.viewer.focused, 255)
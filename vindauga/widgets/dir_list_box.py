@@ -4,16 +4,20 @@ import os
 import pathlib
 import platform
 import re
-from typing import List
+from typing import List, Optional
 
 from vindauga.types.collections.dir_collection import DirCollection, DirEntry
+from vindauga.constants.command_codes import cmTaskDone
 from vindauga.constants.std_dialog_commands import cmChangeDir, cmDirSelection, cmDirFocused
 from vindauga.constants.event_codes import evCommand, evBroadcast
 from vindauga.constants.state_flags import sfFocused
+from vindauga.events.event import Event
 from vindauga.utilities.message import message
 from vindauga.types.rect import Rect
+from vindauga.types.task_executor import Task
 
 from .list_box import ListBox
+from .program import Program
 from .scroll_bar import ScrollBar
 
 PLATFORM_IS_WINDOWS = platform.system().lower() == 'windows'
@@ -44,6 +48,7 @@ class DirListBox(ListBox):
         self.cur = 0
         self.dirList = DirCollection()
         self.letters = self.__getDriveLetters()
+        self.task: Optional[Task] = None
 
     def getText(self, item: int, maxChars: int) -> str:
         return self.dirList[item].text()[:maxChars]
@@ -66,13 +71,45 @@ class DirListBox(ListBox):
         return pathlib.Path(directory).resolve()
 
     def newDirectory(self, directory: str):
+        """
+        Show `directory`, its parents and its subdirectories. While an
+        application is running the subdirectories are listed on a worker
+        thread and the list is shown when they are.
+        """
         self.dir = self.__absolute(directory)
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        if Program.application:
+            self.task = Program.application.runTask(self.listDirs, self.dir, receiver=self)
+        else:
+            self.showList(self.listDirs(None, self.dir))
+
+    def showList(self, subDirs: List[str]):
         self.dirList = DirCollection()
         self.showDrives(self.dirList)
-        self.showDirs(self.dirList)
+        self.showDirs(self.dirList, subDirs)
         self.newList(self.dirList)
         self.focusItem(self.cur)
 
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        if event.what == evBroadcast and event.message.command == cmTaskDone and event.message.infoPtr is self.task:
+            task, self.task = self.task, None
+            try:
+                subDirs = task.result()
+            except OSError:
+                logger.exception('Cannot read directory')
+                subDirs = []
+            self.showList(subDirs)
+            self.clearEvent(event)
+
+    def shutdown(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        super().shutdown()
+
     def setState(self, state: int, enable: bool):
         super().setState(state, enable)
         if state & sfFocused:
@@ -86,13 +123,22 @@ class DirListBox(ListBox):
         for letter in self.letters:
             collection.append(DirEntry(letter[:2], letter))
 
-    def showDirs(self, collection: DirCollection):
-        # todo: Put the `Path` into the DirEntry instead of the string.
-        logger.info('showDirs(): %s', self.dir)
+    @staticmethod
+    def listDirs(task: Optional[Task], directory: pathlib.Path) -> List[str]:
+        """
+        The subdirectories of `directory`, sorted
+        """
         try:
-            _root, subDirs, _files = next(os.walk(self.dir))
+            _root, subDirs, _files = next(os.walk(directory))
         except StopIteration:
             subDirs = []
+        return sorted(subDirs)
+
+    def showDirs(self, collection: DirCollection, subDirs: Optional[List[str]] = None):
+        # todo: Put the `Path` into the DirEntry instead of the string.
+        logger.info('showDirs(): %s', self.dir)
+        if subDirs is None:
+            subDirs = self.listDirs(None, self.dir)
         n = 0
 
         parents = list(reversed(self.dir.parents))
@@ -113,7 +159,6 @@ class DirListBox(ListBox):
         if not subDirs:
             return
 
-        subDirs = sorted(subDirs)
         named_dirs = zip(self.__dirNames(subDirs), subDirs)
         for name, subDir in named_dirs:
             path: pathlib.Path = self.dir.joinpath(subDir)
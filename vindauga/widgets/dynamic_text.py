@@ -26,7 +26,7 @@ class DynamicText(View):
         self.writeBuf(0, 0, self.size.x, 1, b)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpDynamicText)
+        return Palette.shared(self.cpDynamicText)
 
     def setText(self, text: str):
         self.setData(text)
@@ -5,8 +5,6 @@ import logging
 import string
 from typing import List, Optional, Union, Tuple
 
-import wcwidth
-
 from vindauga.constants.command_codes import *
 from vindauga.constants.edit_command_codes import *
 from vindauga.constants.event_codes import *
@@ -16,6 +14,8 @@ from vindauga.constants.option_flags import ofSelectable
 from vindauga.constants.state_flags import sfVisible, sfCursorIns, sfActive, sfExposed
 from vindauga.events.event import Event
 from vindauga.utilities.screen.screen_cell import set_cell
+from vindauga.utilities.text.edit_buffer import EditBuffer
+from vindauga.utilities.text.line_index import LineIndex
 from vindauga.utilities.text.text import Text
 from vindauga.types.command_set import CommandSet
 from vindauga.types.palette import Palette
@@ -122,6 +122,7 @@ class Editor(View):
     name = 'Editor'
     cpEditor = "\x06\x07"
     clipboard = None
+    searchChunk = 0x10000
 
     def __init__(self, bounds: Rect, hScrollBar: ScrollBar, vScrollBar: ScrollBar, indicator: Optional[Indicator],
                  bufSize: int):
@@ -158,6 +159,7 @@ class Editor(View):
         self.findStr = ''
         self.replaceStr = ''
         self.buffer = None
+        self.lineIndex = LineIndex()
 
         self.growMode = gfGrowHiX | gfGrowHiY
 
@@ -179,15 +181,7 @@ class Editor(View):
         if self.encoding == Encoding.encSingleByte:
             return self.bufChar(pos - 1)
 
-        # For string buffer, get characters before position
-        length = min(pos, 4)  # Max UTF-8 char length
-        chars = []
-
-        for i in range(length):
-            if pos - length + i >= 0:
-                chars.append(self.bufChar(pos - length + i))
-
-        return ''.join(chars)
+        return self.bufText(max(pos - 4, 0), pos)
 
     def bufChars(self, pos: int) -> str:
         """
@@ -196,13 +190,18 @@ class Editor(View):
         if self.encoding == Encoding.encSingleByte:
             return self.bufChar(pos)
 
-        # Get remaining buffer length from position
-        remaining = min(self.bufLen - pos, 32)  # Reasonable chunk for Text methods
-        chars = []
-        for i in range(remaining):
-            if pos + i < self.bufLen:
-                chars.append(self.bufChar(pos + i))
-        return ''.join(chars)
+        # Reasonable chunk for Text methods
+        return self.bufText(pos, min(self.bufLen, pos + 32))
+
+    def bufText(self, start: int, end: int) -> str:
+        """
+        Get the text between logical positions `start` and `end`.
+        """
+        if end <= self.curPtr:
+            return self.buffer.text(start, end)
+        if start >= self.curPtr:
+            return self.buffer.text(start + self.gapLen, end + self.gapLen)
+        return self.buffer.text(start, self.curPtr) + self.buffer.text(self.curPtr + self.gapLen, end + self.gapLen)
 
     def bufChar(self, pos: int) -> str:
         """
@@ -226,20 +225,31 @@ class Editor(View):
         self.update(ufView)
 
     def charPos(self, p: int, target: int) -> int:
-        pos = 0
-        while p < target:
-            if self.bufChar(p) == '\x09':
-                pos += (self.tabSize - (pos % self.tabSize) - 1)
+        text = self.bufText(p, target)
+        if '\x09' not in text:
+            return len(text)
 
-            pos += 1
-            p += 1
-        return pos
+        *tabbed, rest = text.split('\x09')
+        pos = 0
+        for chunk in tabbed:
+            pos += len(chunk)
+            pos += self.tabSize - (pos % self.tabSize)
+        return pos + len(rest)
 
     def charPtr(self, p: int, target: int):
-        pos = 0
+        # Every character advances at least one column
+        text = self.bufText(p, min(self.lineEnd(p), p + target))
+        cr = text.find('\r')
+        if cr >= 0:
+            text = text[:cr]
+        if '\x09' not in text:
+            return p + min(target, len(text))
 
-        while pos < target and p < self.bufLen and self.bufChar(p) not in ('\n', '\r'):
-            if self.bufChar(p) == '\x09':
+        pos = 0
+        for ch in text:
+            if pos >= target:
+                break
+            if ch == '\x09':
                 pos += (self.tabSize - (pos % self.tabSize) - 1)
 
             pos += 1
@@ -318,7 +328,7 @@ class Editor(View):
                 if i == cmYes:
                     self.lock()
                     try:
-                        self.insertText(self.replaceStr, wcwidth.wcswidth(self.replaceStr), False)
+                        self.insertText(self.replaceStr, len(self.replaceStr), False)
                         self.trackCursor(False)
                     finally:
                         self.unlock()
@@ -351,20 +361,23 @@ class Editor(View):
 
     def draw(self):
         if self.drawLineNum != self.delta.y:
-            self.drawPtr = self.lineMove(self.drawPtr, self.delta.y - self.drawLineNum)
+            self.drawPtr = self.lineIndex.line_start(self.delta.y)
             self.drawLineNum = self.delta.y
 
         self.drawLines(0, self.size.y, self.drawPtr)
 
     def drawLines(self, y: int, count: int, linePtr: int):
         color = self.getColor(0x0201)
+        line = self.lineIndex.line_of(linePtr)
+        lastLine = self.lineIndex.line_count - 1
 
-        for i in range(count):
-            if y + i < self.size.y:
-                b = DrawBuffer()
-                self.formatLine(b, linePtr, self.size.x, color)
-                self.writeBuf(0, y + i, self.size.x, 1, b.data)
-                linePtr = self.nextLine(linePtr)
+        for i in range(min(count, self.size.y - y)):
+            b = DrawBuffer()
+            if line + i <= lastLine:
+                self.formatLine(b, self.lineIndex.line_start(line + i), self.size.x, color)
+            else:
+                self.formatLine(b, self.bufLen, self.size.x, color)
+            self.writeBuf(0, y + i, self.size.x, 1, b.data)
 
     def find(self):
         result, data = Editor.editorDialog(edFind, (self.editorFlags, self.findStr))
@@ -384,7 +397,7 @@ class Editor(View):
                             mouse.x + self.delta.x)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpEditor)
+        palette = Palette.shared(self.cpEditor)
         return palette
 
     def checkScrollBar(self, event: Event, scrollBar: ScrollBar, value: int) -> int:
@@ -410,7 +423,9 @@ class Editor(View):
         if what == evMouseDown:
             self._handleMouseEvent(event, selectMode)
         elif what == evKeyDown:
-            if (event.keyDown.charScan.charCode == '\x09') or ('\x20' <= event.keyDown.charScan.charCode < '\xFF'):
+            if event.keyDown.controlKeyState & kbPaste and event.keyDown.textLength:
+                self._handlePasteEvent(centerCursor, event)
+            elif (event.keyDown.charScan.charCode == '\x09') or ('\x20' <= event.keyDown.charScan.charCode < '\xFF'):
                 self._handleKeyDownEvent(centerCursor, event)
             else:
                 return
@@ -452,13 +467,12 @@ class Editor(View):
 
     def initBuffer(self, bufSize: int):
         try:
-            # Use string buffer - simple and works
-            self.buffer = '\x00' * bufSize
+            self.buffer = EditBuffer(bufSize)
         except MemoryError:
             self.buffer = None
 
     def countLines(self, start: int, count: int) -> int:
-        return self.buffer[start:start + count].count('\n')
+        return self.buffer.count('\n', start, start + count)
 
     @staticmethod
     def scan(buffer: str, size: int, pattern: str) -> int:
@@ -481,6 +495,10 @@ class Editor(View):
         if selLen == 0 and length == 0:
             return True
 
+        # Take the text now: `p` may be our own buffer, which moves when it grows
+        text = p[offset:offset + length] if length > 0 else ''
+        length = len(text)
+
         delLen = 0
         if allowUndo:
             if self.curPtr == self.selStart:
@@ -492,7 +510,9 @@ class Editor(View):
         if newSize > self.bufLen + self.delCount:
             self.setBufSize(newSize)
 
-        selLines = self.countLines(self.bufPtr(self.selStart), selLen)
+        selLines = self.lineIndex.line_of(self.selEnd) - self.lineIndex.line_of(self.selStart)
+        self.lineIndex.delete(self.selStart, selLen)
+        self.lineIndex.insert(self.selStart, text)
 
         if self.curPtr == self.selEnd:
             if allowUndo:
@@ -511,23 +531,12 @@ class Editor(View):
                 self.delta.y = self.curPos.y
 
         if length > 0:
-            # Simple insertion: just overwrite part of gap with new text
-            text_to_insert = p[offset:offset + length]
-
-            # Insert text by reconstructing string (simple approach)
-            before = self.buffer[:self.curPtr]
-            gap_end = self.curPtr + self.gapLen
-            after = self.buffer[gap_end:]
-
-            new_gap_len = self.gapLen - length
-            remaining_gap = '\x00' * new_gap_len if new_gap_len > 0 else ''
-
-            self.buffer = before + text_to_insert + remaining_gap + after
-
+            # Fill the start of the gap with the new text
+            self.buffer[self.curPtr:self.curPtr + length] = text
             self.gapLen -= length
             self.bufLen += length
 
-        lines = self.countLines(self.curPtr, length)
+        lines = text.count('\n')
         self.curPtr += length
         self.curPos.y += lines
 
@@ -549,7 +558,7 @@ class Editor(View):
             self.delCount += delLen
             self.insCount += length
 
-        self.limit.y += (lines - selLines)
+        self.limit.y = self.lineIndex.line_count
         self.delta.y = max(0, min(self.delta.y, self.limit.y - self.size.y))
 
         if not self.isClipboard():
@@ -577,21 +586,14 @@ class Editor(View):
         return Editor.clipboard is self
 
     def lineMove(self, p: int, count: int) -> int:
-        i = p
-        p = self.lineStart(p)
-        pos = self.charPos(p, i)
-        while count != 0:
-            i = p
-            if count < 0:
-                p = self.prevLine(p)
-                count += 1
-            else:
-                p = self.nextLine(p)
-                count -= 1
-
-        if p != i:
-            p = self.charPtr(p, pos)
-        return p
+        line = self.lineIndex.line_of(p)
+        pos = self.charPos(self.lineIndex.line_start(line), p)
+        line += count
+        if line < 0:
+            return 0
+        if line >= self.lineIndex.line_count:
+            return self.bufLen
+        return self.charPtr(self.lineIndex.line_start(line), pos)
 
     def lock(self):
         self.lockCount += 1
@@ -603,9 +605,9 @@ class Editor(View):
         if self.autoIndent:
             p = self.lineStart(self.curPtr)
             i = p
-            while i < self.curPtr and self.buffer[i] in (' ', '\t'):
+            while i < self.curPtr and self.bufChar(i) in (' ', '\t'):
                 i += 1
-            self.insertText(self.buffer[p:], i - p, False)
+            self.insertText(self.bufText(p, i), i - p, False)
 
     def nextLine(self, pos: int) -> int:
         return self.nextChar(self.lineEnd(pos))
@@ -646,21 +648,34 @@ class Editor(View):
             self.delta.y = y
             self.update(ufView)
 
+    def scanFrom(self, pos: int, findStr: str, caseSensitive: bool) -> int:
+        """
+        Find `findStr` at or after logical position `pos`. The text is scanned
+        in chunks so that a search never copies (or lowercases) the whole
+        remainder of the buffer.
+
+        :return: Logical position of the match, or `sfSearchFailed`
+        """
+        overlap = max(len(findStr) - 1, 0)
+        while pos < self.bufLen:
+            chunk = self.bufText(pos, min(pos + self.searchChunk + overlap, self.bufLen))
+            if caseSensitive:
+                i = self.scan(chunk, len(chunk), findStr)
+            else:
+                i = self.iScan(chunk, len(chunk), findStr)
+            if i != sfSearchFailed:
+                return pos + i
+            pos += self.searchChunk
+        return sfSearchFailed
+
     def search(self, findStr: str, opts: int):
         pos = self.curPtr
         done = False
 
         while not done:
-            if opts & efCaseSensitive != 0:
-                i = self.scan(self.buffer[self.bufPtr(pos):],
-                              self.bufLen - pos, self.findStr)
-            else:
-                i = self.iScan(self.buffer[self.bufPtr(pos):],
-                               self.bufLen - pos, self.findStr)
+            i = self.scanFrom(pos, findStr, opts & efCaseSensitive != 0)
 
             if i != sfSearchFailed:
-                i += pos
-
                 if (opts & efWholeWordsOnly == 0 or
                         not (i != 0 and isWordChar(self.bufChar(i - 1)) or
                              (i + len(findStr) != self.bufLen and
@@ -691,7 +706,8 @@ class Editor(View):
         self.curPos.x = 0
         self.curPos.y = 0
         self.limit.x = maxLineLength
-        self.limit.y = self.countLines(self.gapLen, self.bufLen) + 1
+        self.lineIndex.reset(self.buffer.text(self.gapLen, self.gapLen + length))
+        self.limit.y = self.lineIndex.line_count
         self.drawLineNum = 0
         self.drawPtr = 0
         self.delCount = 0
@@ -734,14 +750,13 @@ class Editor(View):
                 # Moving forward - move text from after gap to before gap
                 l = pos - self.curPtr
                 self.memmove(self.curPtr, self.curPtr + self.gapLen, l)
-                self.curPos.y += self.countLines(self.curPtr, l)
                 self.curPtr = pos
             else:
                 # Moving backward - move text from before gap to after gap
                 l = self.curPtr - pos
                 self.curPtr = pos
-                self.curPos.y -= self.countLines(self.curPtr, l)
                 self.memmove(self.curPtr + self.gapLen, self.curPtr, l)
+            self.curPos.y = self.lineIndex.line_of(pos)
 
             self.delCount = 0
             self.insCount = 0
@@ -752,27 +767,9 @@ class Editor(View):
 
     def memmove(self, destination: int, source: int, length: int):
         """
-        Move data within buffer - reconstruct string since strings are immutable.
+        Move data within buffer, costs O(length).
         """
-        if length <= 0:
-            return
-
-        # Get the data to move
-        blob = self.buffer[source: source + length]
-
-        # Reconstruct the buffer with the moved data
-        if destination < source:
-            # Moving backwards
-            self.buffer = (self.buffer[:destination] +
-                          blob +
-                          self.buffer[destination:source] +
-                          self.buffer[source + length:])
-        else:
-            # Moving forwards
-            self.buffer = (self.buffer[:source] +
-                          self.buffer[source + length:destination + length] +
-                          blob +
-                          self.buffer[destination + length:])
+        self.buffer.move(destination, source, length)
 
     def setSelect(self, newStart: int, newEnd: int, curStart: bool):
         if curStart:
@@ -790,13 +787,12 @@ class Editor(View):
             if pos > self.curPtr:
                 length = pos - self.curPtr
                 self.memmove(self.curPtr, self.curPtr + self.gapLen, length)
-                self.curPos.y += self.countLines(self.curPtr, length)
                 self.curPtr = pos
             else:
                 length = self.curPtr - pos
                 self.curPtr = pos
-                self.curPos.y -= self.countLines(self.curPtr, length)
                 self.memmove(self.curPtr + self.gapLen, self.curPtr, length)
+            self.curPos.y = self.lineIndex.line_of(pos)
 
             self.drawLineNum = self.curPos.y
             self.drawPtr = self.lineStart(pos)
@@ -880,16 +876,14 @@ class Editor(View):
         return self.isValid
 
     def lineStart(self, pos: int) -> int:
-        while pos > 0:
-            pos = self.prevChar(pos)
-            if self.bufChar(pos) == '\n':
-                return self.nextChar(pos)
-        return 0
+        return self.lineIndex.line_start(self.lineIndex.line_of(pos))
 
     def lineEnd(self, pos: int) -> int:
-        while pos < self.bufLen and self.bufChar(pos) != '\n':
-            pos = self.nextChar(pos)
-        return pos
+        end = self.lineIndex.line_break(self.lineIndex.line_of(pos))
+        if pos < end < self.bufLen and self.bufChar(end - 1) == '\r':
+            # Stop before a CR/LF pair rather than between its halves
+            end -= 1
+        return end
 
     def detectEol(self):
         for p in range(self.bufLen):
@@ -989,7 +983,7 @@ class Editor(View):
 
     def setBufSize(self, newSize: int):
         """
-        Resize buffer - reconstruct string with larger gap.
+        Grow the buffer by widening the gap.
         """
         if newSize < 0x1000:
             # At least a 4K buffer
@@ -999,19 +993,12 @@ class Editor(View):
             newSize = self.bufSize + 128
 
         if newSize > self.bufSize:
-            # For string-based gap buffer, reconstruct with larger gap
-            # Get text before gap and after gap
-            before_gap = self.buffer[:self.curPtr]
-            after_gap_start = self.curPtr + self.gapLen
-            after_gap = self.buffer[after_gap_start:] if after_gap_start < len(self.buffer) else ''
-
-            # Calculate new gap size
-            new_gap_len = newSize - self.bufLen
-            gap_chars = '\x00' * new_gap_len  # Use null chars for gap
-
-            # Reconstruct buffer with larger gap
-            self.buffer = before_gap + gap_chars + after_gap
-            self.gapLen = new_gap_len
+            # Grow geometrically so that a run of insertions is amortized O(1).
+            # New space goes at the start of the gap; deleted text kept for
+            # undo stays at its end.
+            newSize = max(newSize, self.bufSize + self.bufSize // 2)
+            self.buffer.grow(self.curPtr, newSize - self.bufSize)
+            self.gapLen = newSize - self.bufLen
 
         return True
 
@@ -1098,6 +1085,18 @@ class Editor(View):
         finally:
             self.unlock()
 
+    def _handlePasteEvent(self, centerCursor: bool, event: Event):
+        """
+        Insert the whole of a paste as one edit, replacing any selection
+        """
+        self.lock()
+        try:
+            text = event.keyDown.getText()
+            self.insertText(text, len(text), False)
+            self.trackCursor(centerCursor)
+        finally:
+            self.unlock()
+
     def _handleMouseEvent(self, event: Event, selectMode: int):
         if event.mouse.eventFlags & meDoubleClick:
             selectMode |= smDouble
@@ -7,10 +7,10 @@ from typing import Optional, Union, IO
 from vindauga.constants.command_codes import *
 from vindauga.constants.edit_command_codes import *
 from vindauga.constants.event_codes import *
-# BufferArray no longer needed - using strings for buffers now
 from vindauga.types.rect import Rect
 from vindauga.utilities.message import message
 from vindauga.utilities.filesystem.path_utils import fexpand
+from vindauga.utilities.text.edit_buffer import EditBuffer
 
 from .editor import Editor
 from .indicator import Indicator
@@ -63,8 +63,7 @@ class FileEditor(Editor):
             self.setBufLen(0)
             return True
 
-        # Read file content as string - matches new Editor string buffer
-        self.buffer = content
+        self.buffer = EditBuffer(content)
         self.setBufLen(len(self.buffer))
         return True
 
@@ -59,7 +59,7 @@ class FileInfoPane(View):
         self.writeLine(0, 2, self.size.x, self.size.y - 2, b)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpInfoPane)
+        return Palette.shared(self.cpInfoPane)
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
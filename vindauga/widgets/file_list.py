@@ -7,14 +7,18 @@ from datetime import datetime
 from typing import Optional
 
 from vindauga.types.collections.file_collection import FileCollection
+from vindauga.constants.command_codes import cmTaskDone
 from vindauga.constants.event_codes import evBroadcast
 from vindauga.constants.keys import kbShift
 from vindauga.constants.std_dialog_commands import cmFileFocused, cmFileDoubleClicked
+from vindauga.events.event import Event
 from vindauga.utilities.message import message
 from vindauga.utilities.filesystem.path_utils import isWild, fexpand, splitPath
 from vindauga.types.records.directory_search_record import DirectorySearchRecord
 from vindauga.types.records.search_record import FA_DIREC, SearchRecord
 from vindauga.types.rect import Rect
+from vindauga.types.task_executor import Task
+from vindauga.widgets.program import Program
 from vindauga.widgets.scroll_bar import ScrollBar
 from vindauga.widgets.sorted_list_box import SortedListBox
 
@@ -24,8 +28,12 @@ logger = logging.getLogger(__name__)
 class FileList(SortedListBox):
     tooManyFiles = _('Too many files.')
 
+    # Entries stat'ed between checks for a cancelled scan
+    statBatch = 256
+
     def __init__(self, bounds: Rect, scrollBar: ScrollBar):
         super().__init__(bounds, 2, scrollBar)
+        self.task: Optional[Task] = None
 
     def focusItem(self, item: int):
         super().focusItem(item)
@@ -55,6 +63,11 @@ class FileList(SortedListBox):
         return dest
 
     def readDirectory(self, path: str, wildcard: Optional[str] = None):
+        """
+        List the files in `path` matching `wildcard`. While an application
+        is running the directory is scanned on a worker thread and the list
+        is shown when the scan is done.
+        """
         if wildcard:
             path = os.path.join(path, wildcard)
             self.readDirectory(path)
@@ -63,6 +76,19 @@ class FileList(SortedListBox):
         if not path:
             raise RuntimeError
 
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        if Program.application:
+            self.task = Program.application.runTask(self.scanDirectory, path, receiver=self)
+        else:
+            self.showList(self.scanDirectory(None, path))
+
+    @classmethod
+    def scanDirectory(cls, task: Optional[Task], path: str) -> FileCollection:
+        """
+        Read the directory and stat its entries, which needs no view
+        """
         if not isWild(path):
             path = os.path.join(path, '*')
 
@@ -86,20 +112,30 @@ class FileList(SortedListBox):
             fileList.append(record)
 
         root, directories, files = next(os.walk(directory), (directory, [], []))
+        records = []
         for localDir in directories:
             record = DirectorySearchRecord()
-            # s = os.stat(os.path.join(root, localDir))
-            # record.setStatInfo(localDir, s)
             record._name = os.path.join(root, localDir)
-            fileList.append(record)
+            records.append(record)
 
         for f in fnmatch.filter(files, wildcard):
             record = DirectorySearchRecord()
-            # s = os.stat(os.path.join(root, f))
-            # record.setStatInfo(f, s)
             record._name = os.path.join(root, f)
-            fileList.append(record)
+            records.append(record)
 
+        # Stat here rather than on first sight, where the sort would do it
+        for n, record in enumerate(records):
+            if task and not n % cls.statBatch:
+                task.checkCancelled()
+            try:
+                record.attr
+            except OSError:
+                record._statSet = True
+        # Sort once rather than on every insert
+        fileList.extend(records)
+        return fileList
+
+    def showList(self, fileList: FileCollection):
         self.newList(fileList)
         self.focusItemNum(0)
         if len(fileList):
@@ -107,3 +143,21 @@ class FileList(SortedListBox):
         else:
             noFile = DirectorySearchRecord()
             message(self.owner, evBroadcast, cmFileFocused, noFile)
+
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        if event.what == evBroadcast and event.message.command == cmTaskDone and event.message.infoPtr is self.task:
+            task, self.task = self.task, None
+            try:
+                fileList = task.result()
+            except OSError:
+                logger.exception('Cannot read directory')
+                fileList = FileCollection()
+            self.showList(fileList)
+            self.clearEvent(event)
+
+    def shutdown(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        super().shutdown()
@@ -1,49 +1,148 @@
 # -*- coding: utf-8 -*-
 from gettext import gettext as _
 import itertools
+import os
 import textwrap
 
 import unicodedata
 
-from vindauga.types.collections.string_collection import StringCollection
+from vindauga.types.collections.collection import Collection
+from vindauga.utilities.text.mapped_text import MappedText
 from vindauga.utilities.text.text import Text
+from vindauga.constants.command_codes import cmTimerExpired
+from vindauga.constants.event_codes import evBroadcast
 from vindauga.constants.message_flags import mfError, mfOKButton
 from vindauga.constants.grow_flags import gfGrowHiX, gfGrowHiY
 from vindauga.constants.state_flags import sfExposed
 from vindauga.dialogs.message_box import messageBox
+from vindauga.events.event import Event
 from vindauga.types.draw_buffer import DrawBuffer
 from vindauga.types.rect import Rect
 
+from .program import Program
 from .scroll_bar import ScrollBar
 from .scroller import Scroller
 
 
+class FileViewer(Scroller):
+    """
+    A scrolling view of a text file.
 
+    Files of `mapThreshold` bytes or more are not read in: they are opened as
+    a `MappedText`, which finds the lines in the background, and only the
+    lines on screen are decoded and wrapped.  While the file is being
+    indexed the scroll limits are brought up to date every `indexPollMs`.
+    The vertical limit counts lines rather than wrapped rows, so any line
+    can be scrolled to the top; once the end of the file is on screen the
+    view is filled up from it.
 
-class FileViewer(Scroller):
+    With `follow` set the viewer works like `tail -f`: every `followPollMs`
+    it reads whatever has been appended to the file (`followChunk` bytes at
+    a time, or up to the end of a longer line) and adds just those lines.
+    A file that is truncated or replaced is read again from the start.  If
+    the last line was on screen, the view scrolls to keep it there.
+    """
     name = 'FileViewer'
+    mapThreshold = 1 << 24
+    indexPollMs = 250
+    followPollMs = 500
+    followChunk = 1 << 20
 
-    def __init__(self, bounds: Rect, hScrollBar: ScrollBar, vScrollBar: ScrollBar, fileName: str, wrap: bool = True):
+    def __init__(self, bounds: Rect, hScrollBar: ScrollBar, vScrollBar: ScrollBar, fileName: str, wrap: bool = True,
+                 follow: bool = False):
         super().__init__(bounds, hScrollBar, vScrollBar)
         self.growMode = gfGrowHiX | gfGrowHiY
         self.fileLines = None
+        self.indexTimer = None
+        self.followTimer = None
+        self.follow = False
+        self._followFile = None
+        # Offset of the first byte not yet in `fileLines` as a whole line,
+        # and how many rows the unfinished last line was shown as
+        self._followPos = 0
+        self._tailRows = 0
+        self._followStat = None
         self.isValid = True
         self.fileName = fileName
         self.wrap = wrap
         self.readFile(fileName)
+        self.setFollow(follow)
 
     def draw(self):
         c = self.getColor(0x0301)
+        rows = self.visibleLines()
         for i in range(self.size.y):
             b = DrawBuffer()
             b.moveChar(0, ' ', c, self.size.x)
-            if self.delta.y + i < len(self.fileLines):
-                p = self.fileLines[self.delta.y + i]
+            if i < len(rows):
+                p = rows[i]
                 if p:
                     s = unicodedata.normalize('NFC', p.rstrip('\n\r'))
                     b.moveStr(0, s, c, maxWidth=self.size.x, strOffset=self.delta.x)
             self.writeBuf(0, i, self.size.x, 1, b)
 
+    def visibleLines(self) -> list[str]:
+        """
+        The lines to show, from the top of the view down.
+        """
+        first = self.delta.y
+        count = len(self.fileLines)
+        if not isinstance(self.fileLines, MappedText) or not self.wrap:
+            return [self.fileLines[i] for i in range(first, min(first + self.size.y, count))]
+
+        # Mapped files are wrapped a screen at a time
+        rows = []
+        for i in range(first, count):
+            rows.extend(self.wrapLine(self.fileLines[i]))
+            if len(rows) >= self.size.y:
+                return rows[:self.size.y]
+        # The end of the file is on screen, so fill the view up to it
+        for i in range(min(first, count) - 1, -1, -1):
+            if len(rows) >= self.size.y:
+                break
+            rows[:0] = self.wrapLine(self.fileLines[i])
+        return rows[max(len(rows) - self.size.y, 0):]
+
+    def wrapLine(self, line: str) -> list[str]:
+        return textwrap.wrap(line + '\n', self.size.x - 1, expand_tabs=True, tabsize=4)
+
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        if event.what == evBroadcast and event.message.command == cmTimerExpired:
+            if self.indexTimer is not None and event.message.infoPtr is self.indexTimer:
+                self.updateLimit()
+            elif self.followTimer is not None and event.message.infoPtr is self.followTimer:
+                self.followFile()
+
+    def updateLimit(self):
+        """
+        Catch the scroll limits up with the lines indexed so far.
+        """
+        lines = self.fileLines
+        if lines.indexed and self.indexTimer is not None:
+            Program.application.killTimer(self.indexTimer)
+            self.indexTimer = None
+        width, rows = self.mappedWidth(), self.mappedRows()
+        if (width, rows) != (self._limit.x, self._limit.y):
+            self.setLimit(width, rows)
+
+    def mappedWidth(self) -> int:
+        if self.wrap:
+            return min(self.fileLines.width, self.size.x - 1)
+        return self.fileLines.width
+
+    def mappedRows(self) -> int:
+        if self.wrap:
+            # Lets the last line be scrolled to the top
+            return len(self.fileLines) + max(self.size.y - 1, 0)
+        return len(self.fileLines)
+
+    def changeBounds(self, bounds: Rect):
+        if isinstance(self.fileLines, MappedText):
+            self.setBounds(bounds)
+            self._limit.x, self._limit.y = self.mappedWidth(), self.mappedRows()
+        super().changeBounds(bounds)
+
     def scrollDraw(self):
         super().scrollDraw()
         self.draw()
@@ -51,25 +150,179 @@ class FileViewer(Scroller):
     def readFile(self, fName: str):
         self._limit.x = 0
         self.fileName = fName
-        self.fileLines = StringCollection()
+        self.closeFile()
+        self.fileLines = Collection()
 
         try:
+            if os.path.getsize(fName) >= self.mapThreshold:
+                self.mapFile(fName)
+                return
             with open(fName, 'rt', encoding='utf-8') as fileToView:
                 lines = fileToView.readlines()
+                self._followPos = fileToView.tell()
         except OSError:
             messageBox(_('Invalid drive or directory'), mfError, [mfOKButton,])
             self.isValid = False
             return
+        self._tailRows = 0
+        if lines and not lines[-1].endswith('\n'):
+            # Appended text continues the last line, so it is read again
+            self._followPos -= len(lines[-1].encode('utf-8'))
+            self._tailRows = len(self.wrapLine(lines[-1])) if self.wrap else 1
         if self.wrap:
-            wrapped = (
-                textwrap.wrap(line + '\n', self.size.x - 1, expand_tabs=True, tabsize=4)
-                for line in lines)
+            wrapped = (self.wrapLine(line) for line in lines)
             lines = itertools.chain(*wrapped)
 
         self.fileLines.extend(lines)
         self._limit.y = len(self.fileLines)
         if self.fileLines:
             self._limit.x = max(Text.width(line.rstrip('\n\r')) for line in self.fileLines)
+        if self.follow:
+            self.openFollowFile()
+
+    def setFollow(self, enable: bool):
+        """
+        Turn following the end of the file on or off.
+        """
+        self.follow = enable
+        if enable:
+            self.openFollowFile()
+        elif self._followFile is not None:
+            self._followFile.close()
+            self._followFile = None
+        if enable and self.followTimer is None and Program.application:
+            self.followTimer = Program.application.setTimer(self.followPollMs, self.followPollMs)
+        elif not enable and self.followTimer is not None:
+            Program.application.killTimer(self.followTimer)
+            self.followTimer = None
+
+    def openFollowFile(self):
+        """
+        Open the file to read appended text from, unless it is mapped.
+        """
+        if self._followFile is not None or isinstance(self.fileLines, MappedText) or not self.isValid:
+            return
+        try:
+            self._followFile = open(self.fileName, 'rb')
+            self._followFile.seek(self._followPos)
+        except OSError:
+            # followFile() reads the whole file again
+            self._followFile = None
+
+    def followFile(self):
+        """
+        Add whatever has been appended to the file since it was last read.
+        """
+        try:
+            stat = os.stat(self.fileName)
+        except OSError:
+            # Moved away and not recreated yet
+            return
+        mapped = isinstance(self.fileLines, MappedText)
+        # A short read means it shrank, even if it has grown back since
+        if (stat.st_ino, stat.st_size) == self._followStat and not (mapped and self.fileLines.truncated):
+            return
+        self._followStat = (stat.st_ino, stat.st_size)
+
+        pinned = self.endVisible()
+        if mapped:
+            reread = not self.fileLines.refresh()
+        else:
+            reread = self._followFile is None or not self.readAppended()
+        if reread:
+            self.readFile(self.fileName)
+        if isinstance(self.fileLines, MappedText):
+            if not self.fileLines.indexed:
+                # Lines still being indexed are picked up on the next poll
+                self._followStat = None
+            self.setLimit(self.mappedWidth(), self.mappedRows())
+        else:
+            self.setLimit(self._limit.x, len(self.fileLines))
+        if pinned and self._limit.y > self.size.y:
+            self.scrollTo(self.delta.x, self._limit.y - self.size.y)
+        self.drawView()
+
+    def endVisible(self) -> bool:
+        """
+        True if the end of the file is on screen.
+        """
+        if not isinstance(self.fileLines, MappedText) or not self.wrap:
+            return self.delta.y >= self._limit.y - self.size.y
+        # Lines indexed since the limits were last set are not on screen yet
+        count = min(self._limit.y - max(self.size.y - 1, 0), len(self.fileLines))
+        rows = 0
+        for i in range(self.delta.y, count):
+            rows += len(self.wrapLine(self.fileLines[i]))
+            if rows > self.size.y:
+                return False
+        return True
+
+    def readAppended(self) -> bool:
+        """
+        Read text appended to the file into `fileLines`.
+
+        :return: False if the file has been truncated or replaced
+        """
+        try:
+            stat = os.fstat(self._followFile.fileno())
+            if os.stat(self.fileName).st_ino != stat.st_ino:
+                return False
+        except OSError:
+            # Moved away and not recreated yet
+            return True
+        if stat.st_size < self._followPos:
+            return False
+        if stat.st_size == self._followPos:
+            return True
+
+        self._followFile.seek(self._followPos)
+        data = self._followFile.read(self.followChunk)
+        if b'\n' not in data and len(data) == self.followChunk:
+            # A line longer than a chunk is read through to its end
+            data += self._followFile.readline()
+        # Only whole lines are taken; the rest is shown but read again next time
+        self._followPos += data.rfind(b'\n') + 1
+        parts = data.decode('utf-8', errors='replace').split('\n')
+        lines = [part + '\n' for part in parts[:-1]]
+        if parts[-1]:
+            lines.append(parts[-1])
+        if self._tailRows:
+            del self.fileLines[-self._tailRows:]
+        rows = []
+        for line in lines:
+            lineRows = self.wrapLine(line) if self.wrap else [line]
+            rows.extend(lineRows)
+        self._tailRows = len(lineRows) if parts[-1] else 0
+        self.fileLines.extend(rows)
+        if self._followFile.tell() < stat.st_size:
+            # More to come on the next poll
+            self._followStat = None
+        width = max((Text.width(row.rstrip('\n\r')) for row in rows), default=0)
+        self._limit.x = max(self._limit.x, width)
+        return True
+
+    def mapFile(self, fName: str):
+        self.fileLines = MappedText(fName)
+        self._limit.x = self.mappedWidth()
+        self._limit.y = self.mappedRows()
+        if not self.fileLines.indexed and Program.application:
+            self.indexTimer = Program.application.setTimer(self.indexPollMs, self.indexPollMs)
+
+    def closeFile(self):
+        if self.indexTimer is not None:
+            Program.application.killTimer(self.indexTimer)
+            self.indexTimer = None
+        if isinstance(self.fileLines, MappedText):
+            self.fileLines.close()
+        if self._followFile is not None:
+            self._followFile.close()
+            self._followFile = None
+
+    def shutdown(self):
+        self.setFollow(False)
+        self.closeFile()
+        self.fileLines = None
+        super().shutdown()
 
     def setState(self, state: int, enable: bool):
         super().setState(state, enable)
@@ -122,7 +122,7 @@ class Frame(View):
         self.writeLine(0, self.size.y - 1, self.size.x, 1, drawable)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpFrame)
+        palette = Palette.shared(self.cpFrame)
         return palette
 
     def handleEvent(self, event: Event):
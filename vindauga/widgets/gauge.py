@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
+from vindauga.constants.command_codes import cmTaskProgress
+from vindauga.constants.event_codes import evBroadcast
 from vindauga.constants.option_flags import ofFramed
+from vindauga.events.event import Event
 from vindauga.utilities.math_utils import clamp
 from vindauga.types.rect import Rect
 
@@ -39,3 +42,12 @@ class Gauge(ParamText):
 
     def getValue(self) -> float:
         return self.currentValue
+
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        # Progress of a task run with this gauge as its `progressView`
+        if event.what == evBroadcast and event.message.command == cmTaskProgress:
+            task = event.message.infoPtr
+            if task.progressView is self:
+                self.setParams(task.done, task.total)
+                self.clearEvent(event)
@@ -139,7 +139,7 @@ class GridView(View):
         self.focusItem(column, row)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpGridView)
+        return Palette.shared(self.cpGridView)
 
     def getText(self, _column: int, _row: int, _maxChars: int) -> str:
         return ''
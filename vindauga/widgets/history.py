@@ -40,7 +40,7 @@ class History(View):
         self.writeLine(0, 0, self.size.x, self.size.y, b)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpHistory)
+        palette = Palette.shared(self.cpHistory)
         return palette
 
     def handleEvent(self, event: Event):
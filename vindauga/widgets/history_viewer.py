@@ -27,7 +27,7 @@ class HistoryViewer(ListViewer):
         self.hScrollBar.setRange(0, self.historyWidth() - self.size.x - 3)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpHistoryViewer)
+        palette = Palette.shared(self.cpHistoryViewer)
         return palette
 
     def getText(self, item: int, maxChars: int):
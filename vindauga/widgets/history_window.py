@@ -21,7 +21,7 @@ class HistoryWindow(Window):
             self.insert(self._viewer)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpHistoryWindow)
+        palette = Palette.shared(self.cpHistoryWindow)
         return palette
 
     def getSelection(self) -> str:
@@ -43,7 +43,7 @@ class Indicator(View):
         self.writeBuf(0, 0, self.size.x, 1, b)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpIndicator)
+        return Palette.shared(self.cpIndicator)
 
     def setState(self, state: int, enable: bool):
         super().setState(state, enable)
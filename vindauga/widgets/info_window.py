@@ -70,7 +70,7 @@ class InfoWindow(Window):
                     self.clearEvent(event)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpInfoWindow)
+        return Palette.shared(self.cpInfoWindow)
 
 
 @dataclass(frozen=True)
@@ -5,7 +5,7 @@ from typing import Optional
 from vindauga.constants.command_codes import cmCancel, cmValid
 from vindauga.constants.event_codes import evMouseDown, evMouseAuto, meDoubleClick, evMouseMove, evKeyDown
 from vindauga.constants.keys import (kbLeft, kbRight, kbHome, kbEnd, kbBackSpace, kbDel, kbIns, kbCtrlY,
-                                     kbEnter, kbTab, kbShiftHome, kbShiftLeft, kbShiftRight, kbShiftEnd)
+                                     kbEnter, kbTab, kbShiftHome, kbShiftLeft, kbShiftRight, kbShiftEnd, kbPaste)
 from vindauga.constants.option_flags import ofSelectable, ofFirstClick
 from vindauga.constants.state_flags import sfCursorVis, sfCursorIns, sfActive, sfSelected, sfFocused
 from vindauga.constants.validation_constants import vtGetData, vtSetData, vsOK
@@ -20,6 +20,9 @@ from vindauga.types.validation.validator import Validator
 
 logger = logging.getLogger(__name__)
 
+# Line breaks and other control characters are left out of pasted text
+_CONTROL_CHARS = dict.fromkeys([*range(0x20), 0x7F])
+
 
 class State:
     def __init__(self):
@@ -134,7 +137,7 @@ class InputLine(View):
         return ''.join(self.current.data)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpInputLine)
+        palette = Palette.shared(self.cpInputLine)
         return palette
 
     def handleEvent(self, event: Event):
@@ -210,6 +213,9 @@ class InputLine(View):
                     self.current.pos = 0
                 elif kc in (kbEnter, kbTab):
                     return
+                elif event.keyDown.controlKeyState & kbPaste and event.keyDown.textLength:
+                    if not self.insertText(event.keyDown.getText()):
+                        self.clearEvent(event)
                 else:
                     if event.keyDown.charScan.charCode >= ' ':
                         if not self.insertChar(event.keyDown.charScan.charCode):
@@ -237,6 +243,15 @@ class InputLine(View):
             self.current.pos += 1
         return True
 
+    def insertText(self, text: str) -> bool:
+        """
+        Insert pasted text at the cursor, as far as it fits
+        """
+        for value in text.translate(_CONTROL_CHARS)[:self.maxLen]:
+            if not self.insertChar(value):
+                return False
+        return True
+
     def makeVisible(self):
         if self.current.firstPos > self.current.pos:
             self.current.firstPos = self.current.pos
@@ -50,7 +50,7 @@ class Label(StaticText):
         self.writeLine(0, 0, self.size.x, 1, b)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpLabel)
+        palette = Palette.shared(self.cpLabel)
         return palette
 
     def focusLink(self, event: Event):
@@ -183,7 +183,7 @@ class ListViewer(View):
             self.drawView()
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpListViewer)
+        palette = Palette.shared(self.cpListViewer)
         return palette
 
     def getText(self, item: int, maxLen: int) -> str:
@@ -6,9 +6,9 @@ import wcwidth
 from vindauga.constants.event_codes import evKeyDown
 from vindauga.constants.keys import kbTab
 from vindauga.events.event import Event
-# BufferArray no longer needed - using strings for buffers now
 from vindauga.types.palette import Palette
 from vindauga.types.records.data_record import DataRecord
+from vindauga.utilities.text.edit_buffer import EditBuffer
 
 from .editor import Editor
 
@@ -39,20 +39,17 @@ class Memo(Editor):
 
     def getData(self) -> DataRecord:
         rec = DataRecord()
-        # self.buffer is already a string, just use it directly
-        # Remove null terminators and trailing nulls
-        bufferStr = self.buffer.rstrip('\x00') if self.buffer else ''
+        bufferStr = self.bufText(0, self.bufLen) if self.buffer else ''
         data = MemoData(bufferStr)
         rec.value = data
         return rec
 
     def setData(self, rec: MemoData):
-        # Use string directly now instead of BufferArray
-        self.buffer = rec.buffer
+        self.buffer = EditBuffer(rec.buffer)
         self.setBufLen(rec.length)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpMemo)
+        palette = Palette.shared(self.cpMemo)
         return palette
 
     def handleEvent(self, event: Event):
@@ -15,7 +15,7 @@ class MessageLine(View):
         self.text = s[:self.width]
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpMessageLine)
+        return Palette.shared(self.cpMessageLine)
 
     def setText(self, s: str):
         self.text = s[:self.width]
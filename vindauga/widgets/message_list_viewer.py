@@ -31,7 +31,7 @@ class MessageListViewer(ListViewer):
         return super().getText(item, maxLen)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpMsgList)
+        return Palette.shared(self.cpMsgList)
 
     def insert(self, message: str):
         self.items.append(message)
@@ -52,7 +52,7 @@ class MessageWindow(Window):
                 self.drawView()
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpMessageWindow)
+        return Palette.shared(self.cpMessageWindow)
 
 
 def postMessage(messageData: Any):
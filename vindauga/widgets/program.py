@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
+import asyncio
 from gettext import gettext as _
 import logging
 import threading
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from vindauga.constants.command_codes import (cmReleasedFocus, cmCancel, cmSelectWindowNum, cmQuit, cmCommandSetChanged, cmMenu, cmClose, cmZoom,
-                                              cmResize, cmValid, cmScreenChanged, cmTimerExpired)
+                                              cmResize, cmValid, cmScreenChanged, cmTimerExpired, cmTaskProgress, cmTaskDone)
 from vindauga.constants.event_codes import evNothing, evCommand, evKeyDown, evMouseDown, evBroadcast
 import vindauga.constants.keys
 from vindauga.constants.state_flags import sfVisible, sfSelected, sfFocused, sfModal, sfExposed
+from vindauga.events.async_driver import AsyncDriver
 from vindauga.events.event import Event
 from vindauga.events.event_queue import event_queue
+from vindauga.events.posted_event_queue import PostedEventQueue, PRIORITY_HIGH, PRIORITY_NORMAL
 from vindauga.menus.menu_bar import MenuBar
 from vindauga.utilities.input.character_codes import getAltChar
 from vindauga.utilities.message import message
@@ -25,6 +28,7 @@ from vindauga.types.rect import Rect
 from vindauga.types.screen import Screen
 from vindauga.types.status_def import StatusDef
 from vindauga.types.status_item import StatusItem
+from vindauga.types.task_executor import Task, TaskExecutor
 from vindauga.types.timer_queue import TimerQueue
 from vindauga.types.view import View, SHADOW_SIZE
 
@@ -88,9 +92,17 @@ class Program(Group):
     apColor = 0
     apBlackWhite = 1
     apMonochrome = 2
-    pending: Event = Event(evNothing)
+    # Events from putEvent() and postEvent(), woken up for through the console's wake up handle
+    postedEvents = PostedEventQueue(wakeUp=event_queue.wakeUp)
     timerQueue = TimerQueue()
-    eventTimeoutMs = 20
+    # Background work whose progress and results come back through `postedEvents`
+    tasks = TaskExecutor(postedEvents.post)
+    # Longest wait for input before `idle()` runs again. The default of -1
+    # sleeps until input, a timer or a held back frame: `idle()` then runs
+    # once after each burst of events, so periodic work belongs on `setTimer()`
+    eventTimeoutMs = -1
+    # An event has been handled since `idle()` last ran
+    _idleDue = True
 
     def __init__(self):
         w = systemInterface.getScreenCols()
@@ -117,6 +129,7 @@ class Program(Group):
         self.insert(self.menuBar)
 
     def shutdown(self):
+        Program.tasks.shutdown()
         self.statusLine = None
         self.menuBar = None
         Program.desktop = None
@@ -169,6 +182,9 @@ class Program(Group):
         return c, data
 
     def eventWaitTimeout(self):
+        if self._idleDue:
+            # Only look for input, so that idle() runs before sleeping
+            return 0
         timeout_ms = min(Program.timerQueue.timeUntilNextTimeout(), 2**64)
         if timeout_ms < 0:
             return self.eventTimeoutMs
@@ -183,9 +199,9 @@ class Program(Group):
         This method collects events from the system like key events, mouse
         events and timer events and returns them in the `event` instance.
 
-        `getEvent()` first checks if `Program.putEvent()` has generated a
-        pending event. If so, `getEvent()` returns that event. If there is no
-        pending event, `getEvent()` calls `screen.getEvent()`.
+        `getEvent()` first checks if `Program.putEvent()` or `postEvent()`
+        has queued an event. If so, `getEvent()` returns the first of them.
+        If there is none, `getEvent()` calls `screen.getEvent()`.
 
         If both calls return `evNothing`, indicating that no user input is
         available, `getEvent()` calls `Program.idle()` to allow "background"
@@ -197,22 +213,32 @@ class Program(Group):
 
         :param event: Event object to be modified
         """
-        if Program.pending.what != evNothing:
-            event.setFrom(Program.pending)
-            Program.pending.what = evNothing
-        else:
-            event_queue.waitForEvents(10)  # Reasonable timeout for event processing
+        if not Program.postedEvents.get(event):
+            # One paint pass per frame, before waiting flushes the screen
+            self.drawInvalidated()
+            # Sleeps until input, the next timer, a held back frame or `eventTimeoutMs`
+            if AsyncDriver.active is not None:
+                AsyncDriver.active.waitForEvents(self.eventWaitTimeout())
+            else:
+                event_queue.waitForEvents(self.eventWaitTimeout())
             event.getMouseEvent()
 
             if event.what == evNothing:
                 event.getKeyEvent()
                 if event.what == evNothing:
                     self.idle()
+                    # Commands changed by idle() itself are broadcast on another pass
+                    self._idleDue = View.commandSetChanged
+        if event.what != evNothing:
+            self._idleDue = True
 
         if self.statusLine:
             if event.what in (evKeyDown, evMouseDown) and self.firstThat(self.hasMouse, event) is self.statusLine:
                 self.statusLine.handleEvent(event)
 
+        if event.what == evBroadcast and event.message.command in (cmTaskProgress, cmTaskDone):
+            Program.tasks.dispatch(event)
+
         if event.what == evCommand and event.message.command == cmScreenChanged:
             logger.info("Program received cmScreenChanged event - calling setScreenMode(smUpdate)")
             self.setScreenMode(Display.smUpdate)
@@ -223,17 +249,36 @@ class Program(Group):
         """
         Sets a pending event.
 
-        Puts an event in the pending state, by storing a copy of the `event`
-        structure in the `pending` variable, a member of `Program`.
+        Queues a copy of `event` in `postedEvents` at high priority. The
+        next call to `getEvent()` will return the first pending event even
+        if there are other events in the system queue to be handled.
+
+        :param event: Event to place in the queue
+        """
+        Program.postedEvents.post(event, PRIORITY_HIGH)
+
+    def unputEvent(self, event: Event):
+        """
+        Puts a copy of `event` ahead of all other pending events
 
-        Only one event is allowed to be pending. The next call to
-        `getEvent()` will return this pending event even if there are
-        other events in the system queue to be handled.
         :param event: Event to place in the queue
         """
-        e = Event(evNothing)
-        e.setFrom(event)
-        Program.pending = e
+        Program.postedEvents.unget(event)
+
+    @staticmethod
+    def postEvent(event: Event, priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Queue an event for the event loop from any thread, waking the loop
+        up if it is waiting for input.
+
+        Normal and low priority events are delivered after any put with
+        `putEvent()`, in order, and are dropped once `postedEvents` is full.
+
+        :param event: Event to place in the queue
+        :param priority: `PRIORITY_HIGH`, `PRIORITY_NORMAL` or `PRIORITY_LOW`
+        :return: False if the queue was full and the event was dropped
+        """
+        return Program.postedEvents.post(event, priority)
 
     def handleEvent(self, event: Event):
         """
@@ -280,6 +325,7 @@ class Program(Group):
 
     def setPalette(self, palette: Palette):
         self.appPalette = Palette(palette)
+        self.resetColorCache()
 
     def idle(self):
         """
@@ -296,8 +342,11 @@ class Program(Group):
         generated to allow views that depend on the command set to enable or
         disable themselves.
 
-        The user may redefine this method, for example, to update a clock in
-        like the `vindauga_demo` program does.
+        `idle()` runs once the events in hand have been handled, not
+        periodically: unless `eventTimeoutMs` is set, nothing calls it again
+        until the next input or timer. Work that has to happen every so often,
+        like the clock in the `vindauga_demo` program, uses `setTimer()` and
+        `cmTimerExpired` instead.
         """
         if self.statusLine:
             self.statusLine.update()
@@ -356,6 +405,7 @@ class Program(Group):
             SHADOW_SIZE.y = 0
             self.showMarkers = True
             self.appPalette = self.palettes[self.apMonochrome]
+        self.resetColorCache()
 
     def initMenuBar(self, bounds: Rect):
         """
@@ -421,6 +471,23 @@ class Program(Group):
         """
         self.execute()
 
+    async def run_async(self) -> int:
+        """
+        Runs `Program` on the running asyncio event loop.
+
+        Like `run()`, but instead of blocking while waiting for input the
+        event loop awaits it, so other coroutines on the same thread keep
+        running: `await app.run_async()`.
+
+        Console input, posted events, timers and terminal output wake the
+        program through the asyncio loop; see `AsyncDriver`. This includes
+        modal views run by `execView()`, so other coroutines keep running
+        while a dialog is open.
+
+        :return: The end state of the program
+        """
+        return await AsyncDriver(self, asyncio.get_running_loop()).execute()
+
     def validView(self, view: View):
         """
         Checks if a view is valid.
@@ -463,6 +530,38 @@ class Program(Group):
     def setTimer(self, timeoutMs: int, periodMs: int) -> TimerId:
         return self.timerQueue.setTimer(timeoutMs, periodMs)
 
+    def runTask(self, fn: Callable, *args, receiver: Optional[View] = None,
+                progressView: Optional[View] = None) -> Task:
+        """
+        Runs `fn(task, *args)` on a worker thread.
+
+        `fn` may call `task.setProgress()`, which `progressView` (a `Gauge`
+        or `ProgressBar`, say) or else `receiver` gets as an `evBroadcast`
+        of `cmTaskProgress`, and should call `task.checkCancelled()` now and
+        then. When it returns `receiver` gets `cmTaskDone` and can call
+        `task.result()`. Both arrive on the event loop's thread, with the
+        `Task` as `infoPtr`. A cancelled task delivers nothing.
+
+        :param fn: Function to run
+        :param receiver: View to send the result to
+        :param progressView: View to send progress to, if not `receiver`
+        :return: The task
+        """
+        return self.tasks.submit(fn, *args, receiver=receiver, progressView=progressView)
+
+    def runProcessTask(self, fn: Callable, *args, receiver: Optional[View] = None) -> Task:
+        """
+        Runs `fn(*args)` in a worker process, for CPU bound work. `fn` and
+        `args` must be picklable; `receiver` gets `cmTaskDone` as for
+        `runTask()`, but there is no progress and a running task can't be
+        stopped by cancelling it.
+
+        :param fn: Function to run
+        :param receiver: View to send the result to
+        :return: The task
+        """
+        return self.tasks.submitProcess(fn, *args, receiver=receiver)
+
 
 def getDesktopSize() -> Point:
     """
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 import logging
+
+from vindauga.constants.command_codes import cmTaskProgress
+from vindauga.constants.event_codes import evBroadcast
+from vindauga.events.event import Event
 from vindauga.types.draw_buffer import DrawBuffer
 from vindauga.types.palette import Palette
 from vindauga.types.rect import Rect
@@ -46,7 +50,17 @@ class ProgressBar(View):
         self.writeLine(0, 0, self.size.x, 1, nBuf)
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpProgressBar)
+        return Palette.shared(self.cpProgressBar)
+
+    def handleEvent(self, event: Event):
+        super().handleEvent(event)
+        # Progress of a task run with this bar as its `progressView`
+        if event.what == evBroadcast and event.message.command == cmTaskProgress:
+            task = event.message.infoPtr
+            if task.progressView is self:
+                self.total = task.total
+                self.setProgress(task.done)
+                self.clearEvent(event)
 
     def calcPercent(self):
         if not self.total:
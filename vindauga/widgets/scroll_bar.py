@@ -48,7 +48,7 @@ class ScrollBar(View):
         self.drawPos(self.getPos())
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpScrollBar)
+        palette = Palette.shared(self.cpScrollBar)
         return palette
 
     def handleEvent(self, event: Event):
@@ -220,7 +220,7 @@ class ScrollBar(View):
         with the given argument values. Some adjustments are made
         if your arguments conflict.
 
-        The scroll bar is redrawn by calling `drawView()`. If value is
+        The scroll bar is redrawn through `invalidate()`. If value is
         changed, `scrollDraw()` is also called.
 
         :param value: Value (position) of scroll bar
@@ -238,7 +238,7 @@ class ScrollBar(View):
             self.value = value
             self.minVal = minVal
             self.maxVal = maxVal
-            self.drawView()
+            self.invalidate()
             if sValue != value:
                 self.scrollDraw()
 
@@ -250,7 +250,7 @@ class ScrollBar(View):
         Sets the legal range for `value` by setting `minVal` and `maxVal`
         to the given arguments `minVal` and `maxVal`.
 
-        Calls `setParams()`, so `drawView()` and `scrollDraw()` will
+        Calls `setParams()`, so `invalidate()` and `scrollDraw()` will
         be called if the changes require the scroll bar to be redrawn.
 
         :param minVal: Minimum scroll bar position
@@ -273,7 +273,7 @@ class ScrollBar(View):
         Sets `value` to `value` by calling `setParams()` with the other
         arguments set to their current values.
 
-        Note: `drawView()` and `scrollDraw()` will be called if this call changes value.
+        Note: `invalidate()` and `scrollDraw()` will be called if this call changes value.
 
         :param value: Value (position) of the scroll bar
         """
@@ -71,7 +71,7 @@ class Scroller(View):
             self.drawView()
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpScroller)
+        palette = Palette.shared(self.cpScroller)
         return palette
 
     def handleEvent(self, event: Event):
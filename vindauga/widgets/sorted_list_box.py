@@ -74,7 +74,8 @@ class SortedListBox(ListBox):
                     curString = curString[:self.__searchPos] + event.keyDown.charScan.charCode
 
                 k = self._getKey(curString)
-                value = self.getList().search(k)
+                # The first item at or after the typed prefix
+                _found, value = self.getList().lookup(k)
 
                 if value < self._range:
                     newString = self.getText(value, 255)
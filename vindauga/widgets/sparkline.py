@@ -47,7 +47,7 @@ class Sparkline(View):
             data: List of numeric values to display
         """
         self.data = list(data) if data else []
-        self.drawView()
+        self.invalidate()
 
     def addDataPoint(self, value: Union[int, float]):
         """
@@ -57,7 +57,7 @@ class Sparkline(View):
             value: Numeric value to add
         """
         self.data.append(value)
-        self.drawView()
+        self.invalidate()
 
     def setRange(self, minValue: Union[int, float, None], maxValue: Union[int, float, None]):
         """
@@ -70,12 +70,12 @@ class Sparkline(View):
         self.minValue = minValue
         self.maxValue = maxValue
         self.autoScale = (minValue is None or maxValue is None)
-        self.drawView()
+        self.invalidate()
 
     def clear(self):
         """Clear all data points."""
         self.data = []
-        self.drawView()
+        self.invalidate()
 
     def _getScaleBounds(self) -> tuple[float, float]:
         if self.autoScale:
@@ -212,4 +212,4 @@ class Sparkline(View):
 
     def getPalette(self) -> Palette:
         """Get the color palette for the sparkline."""
-        return Palette(self.cpSparkline)
\ No newline at end of file
+        return Palette.shared(self.cpSparkline)
\ No newline at end of file
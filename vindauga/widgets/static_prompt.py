@@ -7,4 +7,4 @@ class StaticPrompt(StaticText):
     cpStaticPrompt = "\x09"
 
     def getPalette(self) -> Palette:
-        return Palette(self.cpStaticPrompt)
+        return Palette.shared(self.cpStaticPrompt)
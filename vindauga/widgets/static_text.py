@@ -71,7 +71,7 @@ class StaticText(View):
             self.writeLine(0, yy, self.size.x, 1, b)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpStaticText)
+        palette = Palette.shared(self.cpStaticText)
         return palette
 
     def getText(self) -> str:
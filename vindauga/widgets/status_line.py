@@ -78,7 +78,7 @@ class StatusLine(View):
         self.__drawSelect(None)
 
     def getPalette(self) -> Palette:
-        palette = Palette(self.cpStatusLine)
+        palette = Palette.shared(self.cpStatusLine)
         return palette
 
     def handleEvent(self, event: Event):
@@ -63,14 +63,18 @@ class Window(Group):
         self.frame = None
         super().shutdown()
 
-    def getPalette(self) -> Palette:
-        blue = Palette(self.cpBlueWindow)
-        cyan = Palette(self.cpCyanWindow)
-        gray = Palette(self.cpGrayWindow)
+    @property
+    def palette(self) -> int:
+        return self._palette
 
-        palettes = (blue, cyan, gray)
+    @palette.setter
+    def palette(self, palette: int):
+        self._palette = palette
+        self.resetColorCache()
 
-        return palettes[self.palette]
+    def getPalette(self) -> Palette:
+        palettes = (self.cpBlueWindow, self.cpCyanWindow, self.cpGrayWindow)
+        return Palette.shared(palettes[self.palette])
 
     def getTitle(self, *args) -> str:
         return self.title
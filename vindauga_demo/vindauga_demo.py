@@ -9,8 +9,8 @@ import sys
 
 from vindauga.constants.buttons import bfDefault, bfNormal
 from vindauga.constants.command_codes import cmMenu, cmQuit, cmClose, hcNoContext, cmNext, cmZoom, cmHelp, cmResize, \
-    cmCancel, cmOK, cmCascade, cmTile
-from vindauga.constants.event_codes import evCommand
+    cmCancel, cmOK, cmCascade, cmTile, cmTimerExpired
+from vindauga.constants.event_codes import evBroadcast, evCommand
 from vindauga.constants.keys import kbF10, kbAltX, kbF6, kbF3, kbNoKey, kbF11, kbF5, kbCtrlF5, kbCtrlW
 from vindauga.constants.message_flags import mfError, mfOKButton
 from vindauga.constants.option_flags import ofCentered
@@ -122,6 +122,9 @@ class WallpaperDesktop(Desktop):
 
 
 class VindaugaDemo(Application):
+    clockPollMs = 500
+    terminalPollMs = 20
+
     def __init__(self):
         super().__init__()
         self.wallpaper_desktop = None
@@ -132,6 +135,9 @@ class VindaugaDemo(Application):
         r.topLeft.y = r.bottomRight.y - 1
         self.clock = ClockView(r)
         self.insert(self.clock)
+        self.clockTimer = self.setTimer(self.clockPollMs, self.clockPollMs)
+        # Only polls while a terminal window is open
+        self.terminalTimer = None
 
         for fileSpec in sys.argv[1:]:
             if os.path.isdir(fileSpec):
@@ -223,7 +229,15 @@ class VindaugaDemo(Application):
 
     def handleEvent(self, event: Event):
         super().handleEvent(event)
-        if event.what == evCommand:
+        if event.what == evBroadcast and event.message.command == cmTimerExpired:
+            if event.message.infoPtr is self.clockTimer:
+                self.clock.update()
+            elif self.terminalTimer is not None and event.message.infoPtr is self.terminalTimer:
+                TerminalView.updateTerminals()
+                if not TerminalView.ActiveTerminals:
+                    self.killTimer(self.terminalTimer)
+                    self.terminalTimer = None
+        elif event.what == evCommand:
             emc = event.message.command
             if emc == cmHelp and not self.helpInUse:
                 self.helpInUse = True
@@ -311,8 +325,6 @@ class VindaugaDemo(Application):
 
     def idle(self):
         super().idle()
-        self.clock.update()
-        TerminalView.updateTerminals()
         if self.desktop.firstThat(self.isTileable, None):
             self.enableCommand(cmTile)
             self.enableCommand(cmCascade)
@@ -325,6 +337,8 @@ class VindaugaDemo(Application):
         r.grow(-1, -1)
         t = TerminalWindow(r, 'Terminal', 0)
         self.desktop.insert(t)
+        if self.terminalTimer is None:
+            self.terminalTimer = self.setTimer(self.terminalPollMs, self.terminalPollMs)
 
     def newPuzzle(self):
         p = PuzzleWindow()